@@ -0,0 +1,6 @@
+"""Offline benchmarks measuring the template's own overhead and concurrency scaling.
+
+Run ``python -m benchmarks --help`` from the repository root. The benchmarks rely
+on the fakes in :mod:`benchmarks.fakes`, so neither FastMCP nor a language model
+backend is required.
+"""
@@ -0,0 +1,59 @@
+"""Command line entry point: ``python -m benchmarks``."""
+
+from __future__ import annotations
+
+import argparse
+import sys
+from pathlib import Path
+
+from .suite import BenchmarkSettings, compare, load_results, run, save_results
+
+DEFAULT_BASELINE = Path(__file__).with_name("baseline.json")
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Run the benchmarks, print the results and compare them with the baseline."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("--iterations", type=int, default=20_000)
+    parser.add_argument("--latency", type=float, default=0.005, help="fake LLM latency (s)")
+    parser.add_argument("--concurrency", default="1,8,32,128", help="comma separated levels")
+    parser.add_argument("--requests", type=int, default=512, help="requests per level")
+    parser.add_argument("--baseline", type=Path, default=DEFAULT_BASELINE)
+    parser.add_argument("--threshold", type=float, default=0.25, help="allowed regression")
+    parser.add_argument("--skip-startup", action="store_true", help="skip startup benchmarks")
+    parser.add_argument("--save-baseline", action="store_true")
+    args = parser.parse_args(argv)
+
+    settings = BenchmarkSettings(
+        iterations=args.iterations,
+        latency=args.latency,
+        concurrency=tuple(int(level) for level in args.concurrency.split(",")),
+        requests=args.requests,
+        startup=not args.skip_startup,
+    )
+    results = run(settings)
+    width = max(map(len, results))
+    for metric, value in results.items():
+        print(f"{metric:<{width}}  {value:12.3f}")
+
+    if args.save_baseline:
+        save_results(args.baseline, results)
+        print(f"Baseline written to {args.baseline}")
+        return 0
+    if not args.baseline.exists():
+        print(f"No baseline at {args.baseline}; run with --save-baseline to create one.")
+        return 0
+
+    regressions = compare(results, load_results(args.baseline), args.threshold)
+    if regressions:
+        print(f"Regressions beyond {args.threshold:.0%}:")
+        for regression in regressions:
+            print(f"  {regression}")
+        return 1
+    print(f"No regressions beyond {args.threshold:.0%}.")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entry point
+    sys.exit(main())
@@ -0,0 +1,175 @@
+"""In-process fakes mirroring the ones used by the unit tests."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from collections.abc import Awaitable, Callable, Sequence
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from types import SimpleNamespace
+from typing import Any
+
+
+@dataclass
+class DummyAgent:
+    """Agent echoing the query after an artificial LLM latency.
+
+    Args:
+        latency: Seconds each ``chat`` call sleeps to simulate generation.
+    """
+
+    latency: float = 0.0
+    model_id: str = "dummy"
+    temperature: float = 0.0
+    system_prompt: str = "{question}"
+
+    async def chat(self, query: str) -> dict[str, str]:
+        """Echo the query after sleeping for ``latency`` seconds."""
+
+        if self.latency:
+            await asyncio.sleep(self.latency)
+        return {"result": query}
+
+
+@dataclass
+class SampledLatencyAgent:
+    """Agent echoing the query after a latency drawn from recorded samples.
+
+    Args:
+        latencies: Observed latencies in seconds; each call sleeps for one of them
+            chosen at random, so call latency follows their distribution.
+        rng: Random generator drawing the latencies.
+    """
+
+    latencies: Sequence[float]
+    rng: random.Random = field(default_factory=random.Random)
+    model_id: str = "sampled"
+    temperature: float = 0.0
+    system_prompt: str = "{question}"
+
+    async def chat(self, query: str) -> dict[str, str]:
+        """Echo the query after sleeping for a sampled latency."""
+
+        if self.latencies:
+            await asyncio.sleep(self.rng.choice(self.latencies))
+        return {"result": query}
+
+
+class FakeTool:
+    """Tool registration record.
+
+    Args:
+        name: Tool name clients invoke.
+        description: Human readable description of the tool.
+        handler: Coroutine function answering invocations.
+    """
+
+    def __init__(self, name: str, description: str, handler: Any):
+        self.name = name
+        self.description = description
+        self.handler = handler
+
+
+class FakeApp:
+    """FastMCP application keeping its registered tools by name.
+
+    Args:
+        name: Server name.
+        instructions: Server instructions, ignored.
+        metadata: Server metadata, ignored.
+    """
+
+    def __init__(self, *, name: str, instructions: str, metadata: dict[str, str]):
+        self.name = name
+        self.tools: dict[str, FakeTool] = {}
+
+    def register_tool(self, tool: FakeTool) -> None:
+        """Expose ``tool`` under its name."""
+
+        self.tools[tool.name] = tool
+
+
+class FakeResponseMessage:
+    """Response message wrapping the answer text.
+
+    Args:
+        role: Author of the message.
+        content: Answer text.
+    """
+
+    def __init__(self, role: str, content: str):
+        self.role = role
+        self.content = content
+
+
+ProgressHandler = Callable[[float, "float | None", "str | None"], Awaitable[None]]
+
+
+class FakeContext:
+    """Request context forwarding progress notifications to the calling client.
+
+    Args:
+        progress_handler: Callback of the client that made the call, if any.
+    """
+
+    def __init__(self, progress_handler: ProgressHandler | None):
+        self.progress_handler = progress_handler
+
+    async def report_progress(
+        self, progress: float, total: float | None = None, message: str | None = None
+    ) -> None:
+        """Forward a progress notification to the calling client."""
+
+        if self.progress_handler is not None:
+            await self.progress_handler(progress, total, message)
+
+
+_context: ContextVar[FakeContext] = ContextVar("fake_mcp_context")
+
+
+def get_context() -> FakeContext:
+    """Return the context of the in-process call being served."""
+
+    try:
+        return _context.get()
+    except LookupError:
+        raise RuntimeError("No active MCP request.") from None
+
+
+def server_module() -> SimpleNamespace:
+    """Return a fake ``fastmcp`` module for building servers."""
+
+    return SimpleNamespace(
+        FastMCP=FakeApp,
+        Tool=FakeTool,
+        ResponseMessage=FakeResponseMessage,
+        get_context=get_context,
+    )
+
+
+def client_module(app: FakeApp) -> SimpleNamespace:
+    """Return a fake ``fastmcp`` module whose clients call ``app``'s handlers in-process."""
+
+    class InProcessClient:
+        def __init__(self, **_: Any) -> None:
+            pass
+
+        async def __aenter__(self) -> InProcessClient:
+            return self
+
+        async def __aexit__(self, *exc_info: object) -> None:
+            return None
+
+        async def invoke_tool(
+            self, tool_name: str, *, progress_handler: ProgressHandler | None = None, **payload: Any
+        ) -> Any:
+            """Call the tool's handler with progress routed to ``progress_handler``."""
+
+            token = _context.set(FakeContext(progress_handler))
+            try:
+                return await app.tools[tool_name].handler(**payload)
+            finally:
+                _context.reset(token)
+
+    return SimpleNamespace(Client=InProcessClient)
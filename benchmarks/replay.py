@@ -0,0 +1,172 @@
+"""Replay captured traffic against a fake agent: ``python -m benchmarks.replay LOG``."""
+
+from __future__ import annotations
+
+import argparse
+import asyncio
+import random
+import sys
+import time
+from collections.abc import Iterable, Sequence
+from contextlib import AsyncExitStack
+from dataclasses import dataclass, field, replace
+from pathlib import Path
+from typing import Any
+
+from fastmcp_template import (
+    CapturedRequest,
+    ClientSettings,
+    MCPClient,
+    MCPServerBuilder,
+    ServerSettings,
+    SessionPoolSettings,
+    read_capture,
+)
+
+from .fakes import SampledLatencyAgent, client_module, server_module
+from .suite import Results, percentile
+
+#: Payload arguments dropped on replay: the trace belongs to the original request.
+_DROPPED_ARGUMENTS = ("traceparent",)
+
+
+@dataclass(slots=True)
+class ReplaySettings:
+    """Parameters of a replay.
+
+    Args:
+        speedup: Factor dividing the recorded gaps between arrivals. ``1`` keeps
+            the original rate.
+        sessions: Persistent client sessions shared by the replayed requests.
+        server: Settings of the replayed tools, to compare admission, caching or
+            pooling configurations under the recorded load. Every recorded tool
+            is served with these settings under its own name.
+        seed: Seed of the fake agent's latency draws.
+    """
+
+    speedup: float = 1.0
+    sessions: int = 64
+    server: ServerSettings = field(default_factory=ServerSettings)
+    seed: int | None = 0
+
+
+def replay(requests: Iterable[CapturedRequest], settings: ReplaySettings | None = None) -> Results:
+    """Send ``requests`` at their recorded pace and return throughput and latency metrics.
+
+    Each request invokes the tool it was recorded for, with its recorded arguments.
+    Every tool is backed by an agent whose call latency is drawn from the agent
+    calls recorded for that tool, so caching, coalescing and queueing in the
+    replayed server add to it as they would with a real model. Logs without agent
+    call latencies fall back to the end-to-end latencies of successful requests.
+    """
+
+    return asyncio.run(_replay(sorted(requests, key=lambda request: request.arrived), settings))
+
+
+async def _replay(requests: Sequence[CapturedRequest], settings: ReplaySettings | None) -> Results:
+    settings = settings or ReplaySettings()
+    if not requests:
+        return {"replay.requests": 0.0}
+    rng = random.Random(settings.seed)
+    latencies = _agent_latencies(requests)
+    tools = list(dict.fromkeys(request.tool for request in requests))
+    agents = {tool: SampledLatencyAgent(latencies[tool], rng) for tool in tools}
+    primary, *others = tools
+    server = settings.server
+    builder = MCPServerBuilder(
+        lambda: agents[primary], replace(server, tool_name=primary), server_module()
+    )
+    for tool in others:
+        builder.add_tool(lambda tool=tool: agents[tool], replace(server, tool_name=tool))
+    app = builder.build()
+    client_settings = ClientSettings(session_pool=SessionPoolSettings(max_size=settings.sessions))
+    clients = {tool: MCPClient(client_settings, client_module(app), tool) for tool in tools}
+    observed: list[float] = []
+    errors = 0
+
+    async def one(request: CapturedRequest) -> None:
+        nonlocal errors
+        prompt, extra = _split_payload(request.payload)
+        started = time.perf_counter()
+        try:
+            await clients[request.tool].invoke(prompt, **extra)
+        except Exception:  # failures are counted, not raised
+            errors += 1
+            return
+        observed.append(time.perf_counter() - started)
+
+    first = requests[0].arrived
+    lag = 0.0
+    tasks: list[asyncio.Task[None]] = []
+    async with AsyncExitStack() as stack:
+        for client in clients.values():
+            await stack.enter_async_context(client)
+        origin = time.perf_counter()
+        for request in requests:
+            delay = (request.arrived - first) / settings.speedup - (time.perf_counter() - origin)
+            if delay > 0:
+                await asyncio.sleep(delay)
+            else:
+                lag = max(lag, -delay)
+            tasks.append(asyncio.create_task(one(request)))
+        await asyncio.gather(*tasks)
+        elapsed = time.perf_counter() - origin
+
+    recorded = (requests[-1].arrived - first) / settings.speedup
+    return {
+        "replay.requests": float(len(requests)),
+        "replay.errors": float(errors),
+        "replay.offered_rps": len(requests) / recorded if recorded else float(len(requests)),
+        "replay.throughput_rps": len(observed) / elapsed,
+        "replay.p50_ms": percentile(observed, 0.50) * 1000,
+        "replay.p95_ms": percentile(observed, 0.95) * 1000,
+        "replay.p99_ms": percentile(observed, 0.99) * 1000,
+        "replay.max_ms": max(observed, default=0.0) * 1000,
+        "replay.max_lag_ms": lag * 1000,
+    }
+
+
+def _agent_latencies(requests: Sequence[CapturedRequest]) -> dict[str, list[float]]:
+    """Return the recorded agent call latencies of each tool's successful requests."""
+
+    latencies: dict[str, list[float]] = {request.tool: [] for request in requests}
+    for request in requests:
+        if request.error is None:
+            latencies[request.tool].extend(request.agent_latencies)
+    if not any(latencies.values()):  # logs captured before agent calls were recorded
+        for request in requests:
+            if request.error is None:
+                latencies[request.tool].append(request.latency)
+    return latencies
+
+
+def _split_payload(payload: dict[str, Any]) -> tuple[str, dict[str, Any]]:
+    """Return the prompt of a recorded payload and the other arguments to resend."""
+
+    prompt = next(
+        (str(payload[key]) for key in ("question", "prompt", "query") if payload.get(key)), ""
+    )
+    extra = {key: value for key, value in payload.items() if key not in _DROPPED_ARGUMENTS}
+    return prompt, extra
+
+
+def main(argv: list[str] | None = None) -> int:
+    """Replay a capture log and print the achieved throughput and latency distribution."""
+
+    parser = argparse.ArgumentParser(description=__doc__)
+    parser.add_argument("log", type=Path, help="capture log written by TrafficRecorder")
+    parser.add_argument("--speedup", type=float, default=1.0, help="arrival rate multiplier")
+    parser.add_argument("--sessions", type=int, default=64, help="client sessions")
+    parser.add_argument("--seed", type=int, default=0, help="seed of the latency draws")
+    args = parser.parse_args(argv)
+
+    settings = ReplaySettings(speedup=args.speedup, sessions=args.sessions, seed=args.seed)
+    results = replay(read_capture(args.log), settings)
+    width = max(map(len, results))
+    for metric, value in results.items():
+        print(f"{metric:<{width}}  {value:12.3f}")
+    return 0
+
+
+if __name__ == "__main__":  # pragma: no cover - script entry point
+    sys.exit(main())
@@ -0,0 +1,81 @@
+"""Import-time and cold-start benchmarks."""
+
+from __future__ import annotations
+
+import asyncio
+import subprocess
+import sys
+import time
+from pathlib import Path
+
+from fastmcp_template import AgentPoolSettings, MCPServerBuilder, ServerSettings
+
+from .fakes import DummyAgent, server_module
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+_IMPORT_SNIPPET = (
+    "import sys, time; sys.path.insert(0, {src!r}); started = time.perf_counter(); "
+    "from fastmcp_template import {name}; print(time.perf_counter() - started)"
+)
+
+
+def measure_import(name: str, repeats: int = 5) -> float:
+    """Return the best-of-``repeats`` time in seconds to import ``name`` in a fresh interpreter."""
+
+    code = _IMPORT_SNIPPET.format(src=str(SRC), name=name)
+    samples = []
+    for _ in range(repeats):
+        process = subprocess.run(
+            [sys.executable, "-c", code], capture_output=True, check=True, text=True
+        )
+        samples.append(float(process.stdout))
+    return min(samples)
+
+
+class ColdStartAgent(DummyAgent):
+    """Agent whose construction and first call simulate LangChain and model start-up."""
+
+    construction_cost = 0.05
+    first_call_cost = 0.05
+    _warm = False
+
+    def __post_init__(self) -> None:
+        """Pay the construction cost."""
+
+        time.sleep(self.construction_cost)
+
+    async def chat(self, query: str) -> dict[str, str]:
+        """Echo the query, paying the first-call cost once per process."""
+
+        if not ColdStartAgent._warm:
+            ColdStartAgent._warm = True
+            await asyncio.sleep(self.first_call_cost)
+        return await super().chat(query)
+
+
+def measure_first_request(warmup: bool) -> float:
+    """Return the latency of the first invocation after ``build()`` in seconds."""
+
+    ColdStartAgent._warm = False
+    settings = ServerSettings(agent_pool=AgentPoolSettings(max_size=1), warmup=warmup)
+    builder = MCPServerBuilder(ColdStartAgent, settings, server_module())
+    handler = builder.build().tools[settings.tool_name].handler
+
+    async def first() -> float:
+        started = time.perf_counter()
+        await handler(question="hello")
+        return time.perf_counter() - started
+
+    return asyncio.run(first())
+
+
+def measure_startup() -> dict[str, float]:
+    """Return import and cold-start timings in milliseconds."""
+
+    return {
+        "startup.import_client_ms": measure_import("MCPClient") * 1000,
+        "startup.import_server_ms": measure_import("MCPServerBuilder") * 1000,
+        "startup.first_request_cold_ms": measure_first_request(warmup=False) * 1000,
+        "startup.first_request_warm_ms": measure_first_request(warmup=True) * 1000,
+    }
@@ -0,0 +1,174 @@
+"""Benchmark routines and baseline comparison."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import time
+import timeit
+from collections.abc import Sequence
+from dataclasses import dataclass
+from pathlib import Path
+from typing import Any
+
+from fastmcp_template import ClientSettings, MCPClient, MCPServerBuilder, SessionPoolSettings
+
+from .fakes import DummyAgent, client_module, server_module
+from .startup import measure_startup
+
+Results = dict[str, float]
+
+
+@dataclass(slots=True)
+class BenchmarkSettings:
+    """Parameters of a benchmark run.
+
+    Args:
+        iterations: Calls per micro-benchmark when measuring per-call overhead.
+        latency: Artificial LLM latency in seconds used by the concurrency sweep.
+        concurrency: Concurrency levels swept by the throughput benchmark.
+        requests: Requests issued per concurrency level.
+        startup: Include the import-time and cold-start benchmarks.
+    """
+
+    iterations: int = 20_000
+    latency: float = 0.005
+    concurrency: Sequence[int] = (1, 8, 32, 128)
+    requests: int = 512
+    startup: bool = True
+
+
+def measure_overhead(iterations: int) -> Results:
+    """Return the per-call cost in nanoseconds of the template's hot-path helpers."""
+
+    payload = {"question": "What is MCP?", "tone": "friendly"}
+    response = {"result": "MCP is a protocol."}
+    extract_query = timeit.timeit(
+        lambda: MCPServerBuilder._extract_query(payload), number=iterations
+    )
+    extract_text = timeit.timeit(
+        lambda: MCPClient._extract_response_text(response), number=iterations
+    )
+
+    agent = DummyAgent()
+    builder = MCPServerBuilder(lambda: agent, fastmcp_module=server_module())
+    app = builder.build()
+    handler = app.tools[builder.settings.tool_name].handler
+    client = MCPClient(fastmcp_module=client_module(app))
+
+    async def call_handler() -> float:
+        started = time.perf_counter()
+        for _ in range(iterations):
+            await handler(**payload)
+        return time.perf_counter() - started
+
+    async def call_client() -> float:
+        async with client:
+            started = time.perf_counter()
+            for _ in range(iterations):
+                await client.invoke("What is MCP?")
+            return time.perf_counter() - started
+
+    to_ns = 1e9 / iterations
+    return {
+        "overhead.extract_query_ns": extract_query * to_ns,
+        "overhead.extract_response_text_ns": extract_text * to_ns,
+        "overhead.handler_ns": asyncio.run(call_handler()) * to_ns,
+        "overhead.client_invoke_ns": asyncio.run(call_client()) * to_ns,
+    }
+
+
+def sweep_concurrency(settings: BenchmarkSettings) -> Results:
+    """Return throughput and latency percentiles for every concurrency level."""
+
+    results: Results = {}
+    for level in settings.concurrency:
+        results.update(asyncio.run(_run_level(settings, level)))
+    return results
+
+
+async def _run_level(settings: BenchmarkSettings, level: int) -> Results:
+    agent = DummyAgent(latency=settings.latency)
+    builder = MCPServerBuilder(lambda: agent, fastmcp_module=server_module())
+    app = builder.build()
+    client_settings = ClientSettings(session_pool=SessionPoolSettings(max_size=level))
+    client = MCPClient(client_settings, client_module(app))
+    semaphore = asyncio.Semaphore(level)
+    latencies: list[float] = []
+
+    async def one(index: int) -> None:
+        async with semaphore:
+            started = time.perf_counter()
+            await client.invoke(f"prompt {index}")
+            latencies.append(time.perf_counter() - started)
+
+    async with client:
+        started = time.perf_counter()
+        await asyncio.gather(*(one(index) for index in range(settings.requests)))
+        elapsed = time.perf_counter() - started
+
+    prefix = f"concurrency.{level}"
+    return {
+        f"{prefix}.throughput_rps": settings.requests / elapsed,
+        f"{prefix}.p50_ms": percentile(latencies, 0.50) * 1000,
+        f"{prefix}.p95_ms": percentile(latencies, 0.95) * 1000,
+        f"{prefix}.p99_ms": percentile(latencies, 0.99) * 1000,
+    }
+
+
+def percentile(values: Sequence[float], q: float) -> float:
+    """Return the ``q`` quantile of ``values`` using nearest-rank interpolation."""
+
+    if not values:
+        return 0.0
+    ordered = sorted(values)
+    rank = min(len(ordered) - 1, max(0, round(q * len(ordered)) - 1))
+    return ordered[rank]
+
+
+def run(settings: BenchmarkSettings) -> Results:
+    """Run every benchmark and return a flat mapping of metric name to value."""
+
+    results = measure_overhead(settings.iterations)
+    results.update(sweep_concurrency(settings))
+    if settings.startup:
+        results.update(measure_startup())
+    return results
+
+
+def higher_is_better(metric: str) -> bool:
+    """Return whether larger values of ``metric`` indicate better performance."""
+
+    return metric.endswith("_rps")
+
+
+def compare(current: Results, baseline: Results, threshold: float) -> list[str]:
+    """Return a description of every metric that regressed by more than ``threshold``.
+
+    Metrics missing from either side are ignored so that baselines survive the
+    addition of new benchmarks.
+    """
+
+    regressions: list[str] = []
+    for metric, reference in sorted(baseline.items()):
+        value = current.get(metric)
+        if value is None or reference <= 0:
+            continue
+        change = (value - reference) / reference
+        regressed = change < -threshold if higher_is_better(metric) else change > threshold
+        if regressed:
+            regressions.append(f"{metric}: {reference:.4g} -> {value:.4g} ({change:+.1%})")
+    return regressions
+
+
+def load_results(path: Path) -> Results:
+    """Load benchmark results stored as JSON."""
+
+    data: dict[str, Any] = json.loads(path.read_text(encoding="utf-8"))
+    return {str(key): float(value) for key, value in data.items()}
+
+
+def save_results(path: Path, results: Results) -> None:
+    """Store benchmark results as JSON."""
+
+    path.write_text(json.dumps(results, indent=2, sort_keys=True) + "\n", encoding="utf-8")
@@ -3,26 +3,49 @@
 Usage
 -----
 python examples/run_server.py
+python examples/run_server.py --workers 4 --port 8000
 
 The script returns a configured FastMCP application. To host it using the official
-FastMCP CLI run `fastmcp serve examples.run_server:build_server`.
+FastMCP CLI run `fastmcp serve examples.run_server:build_server`. With
+``--workers``, the application is served over HTTP by that many pre-forked
+processes sharing one listening socket, each with its own agent.
 """
 
 from __future__ import annotations
 
-from fastmcp_template import MCPServerBuilder, ServerSettings, create_agent
+import argparse
 
+from fastmcp_template import (
+    MCPServerBuilder,
+    PreforkServer,
+    ServerSettings,
+    WorkerSettings,
+    create_agent,
+)
 
-def build_server():
-    """Create the FastMCP server application."""
 
-    builder = MCPServerBuilder(
+def build_builder() -> MCPServerBuilder:
+    """Create the builder describing the FastMCP server application."""
+
+    return MCPServerBuilder(
         agent_factory=lambda: create_agent(model_id="qwen2.5:1.5b"),
         settings=ServerSettings(server_name="local-fastmcp"),
     )
-    return builder.build()
+
+
+def build_server():
+    """Create the FastMCP server application."""
+
+    return build_builder().build()
 
 
 if __name__ == "__main__":  # pragma: no cover - script entry point
-    app = build_server()
-    print("FastMCP application created:", app)
+    parser = argparse.ArgumentParser()
+    parser.add_argument("--workers", type=int, help="serve with pre-forked workers")
+    parser.add_argument("--port", type=int, default=8000)
+    args = parser.parse_args()
+    if args.workers:
+        PreforkServer(build_builder, WorkerSettings(workers=args.workers, port=args.port)).run()
+    else:
+        app = build_server()
+        print("FastMCP application created:", app)
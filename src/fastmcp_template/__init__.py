@@ -3,18 +3,190 @@
 This package provides ready-to-use utilities for building a Model Context Protocol
 (MCP) server and client powered by the `fastmcp` library. The template focuses on
 clarity and extensibility so that developers can adapt it to their own LLM tools.
+
+Public names are resolved lazily on first attribute access, so a client-only
+process importing :class:`MCPClient` never loads the server or agent modules.
 """
 
-from .config import ClientSettings, ServerSettings
-from .llm import Agent, create_agent
-from .server import MCPServerBuilder
-from .client import MCPClient
+from __future__ import annotations
+
+from importlib import import_module
+from typing import TYPE_CHECKING, Any
+
+if TYPE_CHECKING:
+    from .admission import AdmissionController, OverloadedError
+    from .batching import MicroBatcher
+    from .cache import ResponseCache
+    from .capture import CapturedRequest, TrafficRecorder, read_capture
+    from .client import BatchStats, Conversation, MCPClient
+    from .coalesce import SingleFlight
+    from .config import (
+        AdmissionSettings,
+        AgentPoolSettings,
+        BatchingSettings,
+        CaptureSettings,
+        ClientSettings,
+        ConversationSettings,
+        DocumentSettings,
+        FailoverSettings,
+        HedgingSettings,
+        ResponseCacheSettings,
+        RoutingSettings,
+        SchedulerSettings,
+        SemanticCacheSettings,
+        ServerSettings,
+        SessionPoolSettings,
+        TenantPolicy,
+        TracingSettings,
+        WorkerSettings,
+    )
+    from .conversations import ConversationStore
+    from .deadlines import DeadlineExceededError, DeadlineTracker
+    from .documents import DocumentProcessor
+    from .failover import CircuitBreaker, CircuitOpenError, ServerSelector
+    from .hedging import Hedger
+    from .llm import Agent, create_agent
+    from .metrics import Histogram, MetricsRegistry
+    from .pool import AgentPool
+    from .prefork import PreforkServer
+    from .routing import RoutingAgent
+    from .runner import LoopRunner, get_runner
+    from .scheduling import FairScheduler, RateLimitedError
+    from .semantic import HashingEmbedder, SemanticCache
+    from .server import MCPServerBuilder
+    from .sessions import SessionPool
+    from .streaming import StreamStats
+    from .tracing import JsonlExporter, Span, Tracer
+
+_EXPORTS: dict[str, str] = {
+    "AdmissionController": "admission",
+    "AdmissionSettings": "config",
+    "Agent": "llm",
+    "AgentPool": "pool",
+    "AgentPoolSettings": "config",
+    "BatchStats": "client",
+    "BatchingSettings": "config",
+    "CaptureSettings": "config",
+    "CapturedRequest": "capture",
+    "CircuitBreaker": "failover",
+    "CircuitOpenError": "failover",
+    "ClientSettings": "config",
+    "Conversation": "client",
+    "ConversationSettings": "config",
+    "ConversationStore": "conversations",
+    "DeadlineExceededError": "deadlines",
+    "DeadlineTracker": "deadlines",
+    "DocumentProcessor": "documents",
+    "DocumentSettings": "config",
+    "FailoverSettings": "config",
+    "FairScheduler": "scheduling",
+    "Hedger": "hedging",
+    "HedgingSettings": "config",
+    "HashingEmbedder": "semantic",
+    "Histogram": "metrics",
+    "JsonlExporter": "tracing",
+    "LoopRunner": "runner",
+    "MetricsRegistry": "metrics",
+    "ResponseCache": "cache",
+    "ResponseCacheSettings": "config",
+    "RoutingAgent": "routing",
+    "RoutingSettings": "config",
+    "SchedulerSettings": "config",
+    "SemanticCache": "semantic",
+    "SemanticCacheSettings": "config",
+    "ServerSelector": "failover",
+    "ServerSettings": "config",
+    "MCPServerBuilder": "server",
+    "MCPClient": "client",
+    "MicroBatcher": "batching",
+    "OverloadedError": "admission",
+    "PreforkServer": "prefork",
+    "RateLimitedError": "scheduling",
+    "SessionPool": "sessions",
+    "SessionPoolSettings": "config",
+    "SingleFlight": "coalesce",
+    "Span": "tracing",
+    "StreamStats": "streaming",
+    "TenantPolicy": "config",
+    "Tracer": "tracing",
+    "TracingSettings": "config",
+    "TrafficRecorder": "capture",
+    "WorkerSettings": "config",
+    "create_agent": "llm",
+    "get_runner": "runner",
+    "read_capture": "capture",
+}
 
 __all__ = [
+    "AdmissionController",
+    "AdmissionSettings",
     "Agent",
+    "AgentPool",
+    "AgentPoolSettings",
+    "BatchStats",
+    "BatchingSettings",
+    "CaptureSettings",
+    "CapturedRequest",
+    "CircuitBreaker",
+    "CircuitOpenError",
     "ClientSettings",
-    "ServerSettings",
-    "MCPServerBuilder",
+    "Conversation",
+    "ConversationSettings",
+    "ConversationStore",
+    "DeadlineExceededError",
+    "DeadlineTracker",
+    "DocumentProcessor",
+    "DocumentSettings",
+    "FailoverSettings",
+    "FairScheduler",
+    "HashingEmbedder",
+    "Hedger",
+    "HedgingSettings",
+    "Histogram",
+    "JsonlExporter",
+    "LoopRunner",
     "MCPClient",
+    "MCPServerBuilder",
+    "MetricsRegistry",
+    "MicroBatcher",
+    "OverloadedError",
+    "PreforkServer",
+    "RateLimitedError",
+    "ResponseCache",
+    "ResponseCacheSettings",
+    "RoutingAgent",
+    "RoutingSettings",
+    "SchedulerSettings",
+    "SemanticCache",
+    "SemanticCacheSettings",
+    "ServerSelector",
+    "ServerSettings",
+    "SessionPool",
+    "SessionPoolSettings",
+    "SingleFlight",
+    "Span",
+    "StreamStats",
+    "TenantPolicy",
+    "Tracer",
+    "TracingSettings",
+    "TrafficRecorder",
+    "WorkerSettings",
     "create_agent",
+    "get_runner",
+    "read_capture",
 ]
+
+
+def __getattr__(name: str) -> Any:
+    """Import the submodule defining ``name`` on first access."""
+    module_name = _EXPORTS.get(name)
+    if module_name is None:
+        raise AttributeError(f"module {__name__!r} has no attribute {name!r}")
+    value = getattr(import_module(f".{module_name}", __name__), name)
+    globals()[name] = value
+    return value
+
+
+def __dir__() -> list[str]:
+    """Include lazily exported names in ``dir()``."""
+    return sorted(set(globals()) | set(__all__))
@@ -0,0 +1,154 @@
+"""Adaptive admission control and load shedding for agent calls."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass
+
+from .config import AdmissionSettings
+
+
+class OverloadedError(RuntimeError):
+    """Raised when an invocation is shed because the server is saturated."""
+
+
+@dataclass(slots=True)
+class AdmissionStats:
+    """Counters describing admission decisions.
+
+    Args:
+        admitted: Invocations that obtained a slot.
+        rejected: Invocations shed immediately because the queue was full.
+        timed_out: Invocations shed after waiting longer than ``max_queue_time``.
+    """
+
+    admitted: int = 0
+    rejected: int = 0
+    timed_out: int = 0
+
+    @property
+    def shed(self) -> int:
+        """Total number of shed invocations."""
+        return self.rejected + self.timed_out
+
+
+class AdmissionController:
+    """Concurrency limiter with a bounded wait queue and an AIMD-adapted limit.
+
+    Args:
+        settings: Limit bounds, queue size and adaptation parameters.
+        clock: Monotonic clock used to measure call latency. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: AdmissionSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or AdmissionSettings()
+        self.stats = AdmissionStats()
+        self.in_flight = 0
+        self._clock = clock
+        self._limit = float(self.settings.initial_limit)
+        self._waiters: deque[asyncio.Future[None]] = deque()
+
+    @property
+    def limit(self) -> int:
+        """Current number of concurrent calls allowed."""
+
+        return int(self._limit)
+
+    @property
+    def queued(self) -> int:
+        """Number of invocations waiting for a slot."""
+
+        return len(self._waiters)
+
+    @asynccontextmanager
+    async def admit(self) -> AsyncIterator[None]:
+        """Hold a slot for the duration of the block.
+
+        Raises:
+            OverloadedError: When the wait queue is full or the invocation waited
+                longer than ``max_queue_time``.
+        """
+
+        await self._acquire()
+        started = self._clock()
+        overloaded = False
+        try:
+            yield
+        except (TimeoutError, OverloadedError):
+            overloaded = True
+            raise
+        finally:
+            self._release(self._clock() - started, overloaded)
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the current limit, occupancy and shedding counters."""
+
+        return {
+            "limit": self.limit,
+            "in_flight": self.in_flight,
+            "queued": len(self._waiters),
+            "admitted": self.stats.admitted,
+            "rejected": self.stats.rejected,
+            "timed_out": self.stats.timed_out,
+            "shed": self.stats.shed,
+        }
+
+    async def _acquire(self) -> None:
+        if self.in_flight < self.limit and not self._waiters:
+            self.in_flight += 1
+            self.stats.admitted += 1
+            return
+        if len(self._waiters) >= self.settings.max_queue:
+            self.stats.rejected += 1
+            raise OverloadedError(
+                f"Server overloaded: {self.in_flight} calls in flight and "
+                f"{len(self._waiters)} queued. Retry later."
+            )
+
+        waiter: asyncio.Future[None] = asyncio.get_running_loop().create_future()
+        self._waiters.append(waiter)
+        try:
+            await asyncio.wait_for(waiter, self.settings.max_queue_time)
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            with suppress(ValueError):
+                self._waiters.remove(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # The slot was handed over right before the timeout or cancellation.
+                self._release(None, overloaded=False)
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            self.stats.timed_out += 1
+            raise OverloadedError(
+                f"Server overloaded: no slot became free within "
+                f"{self.settings.max_queue_time:g}s. Retry later."
+            ) from None
+        self.stats.admitted += 1
+
+    def _release(self, latency: float | None, overloaded: bool) -> None:
+        self.in_flight -= 1
+        if latency is not None:
+            self._adapt(latency, overloaded)
+        while self._waiters and self.in_flight < self.limit:
+            waiter = self._waiters.popleft()
+            if not waiter.done():
+                self.in_flight += 1
+                waiter.set_result(None)
+
+    def _adapt(self, latency: float, overloaded: bool) -> None:
+        settings = self.settings
+        if settings.target_latency is None:
+            return
+        if overloaded or latency > settings.target_latency:
+            self._limit = max(float(settings.min_limit), self._limit * settings.decrease_factor)
+        else:
+            increase = settings.increase_step / max(self._limit, 1.0)
+            self._limit = min(float(settings.max_limit), self._limit + increase)
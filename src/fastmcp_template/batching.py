@@ -0,0 +1,105 @@
+"""Micro-batching of concurrent prompts into a single agent call."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import Awaitable, Callable, Sequence
+from dataclasses import dataclass
+
+from .config import BatchingSettings
+from .metrics import SIZE_BUCKETS, Histogram
+
+BatchRunner = Callable[[list[str]], Awaitable[Sequence[str | BaseException]]]
+
+
+@dataclass(slots=True)
+class _Pending:
+    """A queued prompt waiting for its batch to be sent."""
+
+    query: str
+    future: asyncio.Future[str]
+    enqueued: float
+
+
+class MicroBatcher:
+    """Collect concurrent prompts and hand them to ``run_batch`` together.
+
+    A batch is sent once ``max_batch_size`` prompts are queued or ``window``
+    seconds after the first prompt arrived, whichever comes first. ``run_batch``
+    returns one outcome per prompt; exceptions are delivered only to the caller
+    that submitted the failing prompt.
+
+    Args:
+        run_batch: Coroutine function answering a list of prompts.
+        settings: Window and batch size limits.
+    """
+
+    def __init__(self, run_batch: BatchRunner, settings: BatchingSettings | None = None) -> None:
+        self.run_batch = run_batch
+        self.settings = settings or BatchingSettings()
+        self.batch_sizes = Histogram(SIZE_BUCKETS)
+        self.queue_wait = Histogram()
+        self._queue: list[_Pending] = []
+        self._timer: asyncio.TimerHandle | None = None
+        self._running: set[asyncio.Task[None]] = set()
+
+    async def submit(self, query: str) -> str:
+        """Queue ``query`` and return its answer once its batch has completed."""
+
+        loop = asyncio.get_running_loop()
+        future: asyncio.Future[str] = loop.create_future()
+        self._queue.append(_Pending(query, future, time.perf_counter()))
+        if len(self._queue) >= self.settings.max_batch_size:
+            self._flush()
+        elif self._timer is None:
+            self._timer = loop.call_later(self.settings.window, self._flush)
+        return await future
+
+    def snapshot(self) -> dict[str, object]:
+        """Return the batch-size and queue-wait histograms."""
+
+        return {
+            "queued": len(self._queue),
+            "running_batches": len(self._running),
+            "batch_size": self.batch_sizes.snapshot(),
+            "queue_wait_seconds": self.queue_wait.snapshot(),
+        }
+
+    def _flush(self) -> None:
+        if self._timer is not None:
+            self._timer.cancel()
+            self._timer = None
+        size = self.settings.max_batch_size
+        while self._queue:
+            batch, self._queue = self._queue[:size], self._queue[size:]
+            batch = [pending for pending in batch if not pending.future.done()]
+            if batch:
+                task = asyncio.ensure_future(self._run(batch))
+                self._running.add(task)
+                task.add_done_callback(self._running.discard)
+
+    async def _run(self, batch: list[_Pending]) -> None:
+        now = time.perf_counter()
+        self.batch_sizes.observe(len(batch))
+        for pending in batch:
+            self.queue_wait.observe(now - pending.enqueued)
+
+        outcomes: Sequence[str | BaseException]
+        try:
+            outcomes = await self.run_batch([pending.query for pending in batch])
+        except Exception as exc:
+            outcomes = [exc] * len(batch)
+        if len(outcomes) != len(batch):
+            error = RuntimeError(
+                f"Batch runner returned {len(outcomes)} results for {len(batch)} prompts."
+            )
+            outcomes = [error] * len(batch)
+
+        for pending, outcome in zip(batch, outcomes):
+            if pending.future.done():
+                continue
+            if isinstance(outcome, BaseException):
+                pending.future.set_exception(outcome)
+            else:
+                pending.future.set_result(outcome)
@@ -0,0 +1,128 @@
+"""In-memory LRU and TTL cache for agent responses."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict
+from collections.abc import Callable
+from dataclasses import dataclass
+from typing import Any
+
+from .config import ResponseCacheSettings
+from .pool import AGENT_CONFIG_FIELDS
+
+CacheKey = tuple[Any, ...]
+
+
+def normalize_query(query: str) -> str:
+    """Collapse whitespace so trivially different prompts share a cache entry."""
+
+    return " ".join(query.split())
+
+
+def agent_signature(agent: Any) -> tuple[Any, ...]:
+    """Return the ``(model_id, temperature, system_prompt)`` triple describing ``agent``.
+
+    Attributes missing on custom agents are reported as ``None``.
+    """
+
+    return tuple(getattr(agent, name, None) for name in AGENT_CONFIG_FIELDS)
+
+
+@dataclass(slots=True)
+class CacheStats:
+    """Counters describing cache effectiveness.
+
+    Args:
+        hits: Lookups answered from the cache.
+        misses: Lookups that had to call the agent.
+        evictions: Entries dropped because the cache was full.
+        expirations: Entries dropped because their TTL elapsed.
+    """
+
+    hits: int = 0
+    misses: int = 0
+    evictions: int = 0
+    expirations: int = 0
+
+
+class ResponseCache:
+    """Least-recently-used response cache with per-entry expiry.
+
+    Args:
+        settings: Size, TTL and temperature limits.
+        clock: Monotonic clock used for expiry. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: ResponseCacheSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or ResponseCacheSettings()
+        self.stats = CacheStats()
+        self._clock = clock
+        self._entries: OrderedDict[CacheKey, tuple[str, float]] = OrderedDict()
+
+    @staticmethod
+    def key(query: str, signature: tuple[Any, ...]) -> CacheKey:
+        """Build the cache key for ``query`` answered by an agent with ``signature``."""
+
+        return (normalize_query(query), *signature)
+
+    def accepts(self, signature: tuple[Any, ...]) -> bool:
+        """Return whether responses of an agent with ``signature`` may be cached."""
+
+        limit = self.settings.max_temperature
+        temperature = signature[AGENT_CONFIG_FIELDS.index("temperature")]
+        return limit is None or temperature is None or temperature <= limit
+
+    def get(self, key: CacheKey) -> str | None:
+        """Return the cached response for ``key`` or ``None`` on a miss."""
+
+        entry = self._entries.get(key)
+        if entry is None:
+            self.stats.misses += 1
+            return None
+        value, expires_at = entry
+        if expires_at < self._clock():
+            del self._entries[key]
+            self.stats.expirations += 1
+            self.stats.misses += 1
+            return None
+        self._entries.move_to_end(key)
+        self.stats.hits += 1
+        return value
+
+    def put(self, key: CacheKey, value: str) -> None:
+        """Store ``value`` under ``key``, evicting the least recently used entry if needed."""
+
+        ttl = self.settings.ttl
+        expires_at = float("inf") if ttl is None else self._clock() + ttl
+        self._entries[key] = (value, expires_at)
+        self._entries.move_to_end(key)
+        while len(self._entries) > self.settings.max_entries:
+            self._entries.popitem(last=False)
+            self.stats.evictions += 1
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+
+        self._entries.clear()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses, including expired ones not yet purged."""
+
+        return len(self._entries)
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the cache counters together with the current size."""
+
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+            "size": len(self._entries),
+        }
@@ -0,0 +1,271 @@
+"""Sampled, rotating capture of served invocations for offline replay."""
+
+from __future__ import annotations
+
+import atexit
+import json
+import os
+import queue
+import random
+import threading
+import time
+from collections.abc import Callable, Iterator, Mapping, Sequence
+from contextlib import contextmanager
+from contextvars import ContextVar
+from dataclasses import dataclass
+from pathlib import Path
+from typing import IO, Any
+
+from .config import CaptureSettings
+
+#: Latencies of the agent calls made by the invocation being captured.
+_AGENT_CALLS: ContextVar[list[float] | None] = ContextVar("captured_agent_calls", default=None)
+
+
+@dataclass(slots=True, frozen=True)
+class CapturedRequest:
+    """One invocation read back from a capture log.
+
+    Args:
+        arrived: Wall-clock arrival time in seconds since the epoch.
+        tool: Name of the invoked tool.
+        payload: Arguments the tool was invoked with.
+        latency: Seconds the server took to answer.
+        size: Characters in the answer, ``None`` when it holds no text.
+        error: Exception type name when the invocation failed.
+        agent_latencies: Seconds taken by each agent call the invocation made.
+            Empty when it was answered without calling the agent, for instance
+            from a cache.
+    """
+
+    arrived: float
+    tool: str
+    payload: dict[str, Any]
+    latency: float
+    size: int | None
+    error: str | None = None
+    agent_latencies: tuple[float, ...] = ()
+
+
+def read_capture(path: str | Path) -> Iterator[CapturedRequest]:
+    """Yield the invocations of the log at ``path`` and its rotated backups, oldest first."""
+
+    path = Path(path)
+    backups = [
+        backup for backup in path.parent.glob(f"{path.name}.*") if backup.suffix[1:].isdigit()
+    ]
+    backups.sort(key=lambda backup: int(backup.suffix[1:]), reverse=True)
+    for file in [*backups, path]:
+        if not file.exists():
+            continue
+        with file.open(encoding="utf-8") as handle:
+            for line in handle:
+                record = json.loads(line)
+                yield CapturedRequest(
+                    record["t"],
+                    record["tool"],
+                    record["p"],
+                    record["l"],
+                    record.get("s"),
+                    record.get("e"),
+                    tuple(record.get("a", ())),
+                )
+
+
+@contextmanager
+def collect_agent_calls() -> Iterator[list[float]]:
+    """Collect the latency of every agent call made inside the ``with`` block."""
+
+    calls: list[float] = []
+    token = _AGENT_CALLS.set(calls)
+    try:
+        yield calls
+    finally:
+        _AGENT_CALLS.reset(token)
+
+
+def record_agent_call(started: float) -> None:
+    """Record an agent call that began at ``started`` for the invocation being captured.
+
+    ``started`` is a :func:`time.perf_counter` timestamp. Outside
+    :func:`collect_agent_calls` nothing is recorded.
+    """
+
+    calls = _AGENT_CALLS.get()
+    if calls is not None:
+        calls.append(time.perf_counter() - started)
+
+
+class TrafficRecorder:
+    """Append a sampled share of invocations to a size-rotated JSON Lines log.
+
+    Every line holds the arrival time, tool name, payload, latency, answer size and
+    agent call latencies of one invocation under one-letter keys. Once the log
+    exceeds ``max_bytes`` it is renamed to ``<path>.1``, older backups shift up and
+    the oldest beyond ``backups`` is deleted.
+
+    :meth:`record` only queues the invocation, so serving never waits on disk: a
+    writer thread serialises, rotates and writes the log, flushing it whenever the
+    queue runs empty, like :class:`~fastmcp_template.tracing.JsonlExporter`. Call
+    :meth:`flush` to wait for queued invocations to reach the log and
+    :meth:`close` to stop the writer; it restarts on the next record.
+
+    Args:
+        settings: Log path, sampling rate and rotation limits.
+        rng: Random generator drawing sampling decisions. Overridable in tests.
+        clock: Wall-clock time recorded as arrival time. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: CaptureSettings | None = None,
+        *,
+        rng: random.Random | None = None,
+        clock: Callable[[], float] = time.time,
+    ) -> None:
+        self.settings = settings or CaptureSettings()
+        self.path = Path(self.settings.path)
+        self.recorded = 0
+        self.skipped = 0
+        self.rotations = 0
+        self._rng = rng or random.Random()
+        self._clock = clock
+        self._queue: queue.SimpleQueue[dict[str, Any] | threading.Event | None]
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+        self._handle: IO[str] | None = None
+        self._size = 0
+
+    def sample(self) -> bool:
+        """Decide whether the next invocation is recorded."""
+
+        if self._rng.random() < self.settings.sample_rate:
+            return True
+        self.skipped += 1
+        return False
+
+    def now(self) -> float:
+        """Return the wall-clock time recorded as an invocation's arrival."""
+
+        return self._clock()
+
+    def record(
+        self,
+        tool: str,
+        payload: Mapping[str, Any],
+        arrived: float,
+        latency: float,
+        size: int | None,
+        error: BaseException | None = None,
+        agent_latencies: Sequence[float] = (),
+    ) -> None:
+        """Queue one invocation to be appended to the log."""
+
+        record: dict[str, Any] = {
+            "t": round(arrived, 6),
+            "tool": tool,
+            "p": dict(payload),
+            "l": round(latency, 6),
+            "s": size,
+        }
+        if error is not None:
+            record["e"] = type(error).__name__
+        if agent_latencies:
+            record["a"] = [round(latency, 6) for latency in agent_latencies]
+        self._start()
+        self._queue.put(record)
+        self.recorded += 1
+
+    def flush(self) -> None:
+        """Wait until every queued invocation has been written to the log."""
+
+        thread = self._thread
+        if thread is None:
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        while not written.wait(0.1) and thread.is_alive():
+            pass
+
+    def close(self) -> None:
+        """Write the queued invocations, close the log and stop the writer thread."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            atexit.unregister(self.close)
+            thread.join()
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the recorded, skipped and rotation counters and the current log size."""
+
+        return {
+            "recorded": self.recorded,
+            "skipped": self.skipped,
+            "rotations": self.rotations,
+            "bytes": self._size,
+        }
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._write, name="fastmcp-capture-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _write(self) -> None:
+        try:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                if isinstance(item, threading.Event):
+                    if self._handle is not None:
+                        self._handle.flush()
+                    item.set()
+                    continue
+                self._append(json.dumps(item, separators=(",", ":"), default=str) + "\n")
+                if self._queue.empty() and self._handle is not None:
+                    self._handle.flush()
+        finally:
+            if self._handle is not None:
+                self._handle.close()
+                self._handle = None
+
+    def _append(self, line: str) -> None:
+        handle = self._open()
+        if self._size and self._size + len(line) > self.settings.max_bytes:
+            self._rotate()
+            handle = self._open()
+        handle.write(line)
+        self._size += len(line)
+
+    def _open(self) -> IO[str]:
+        if self._handle is None:
+            self.path.parent.mkdir(parents=True, exist_ok=True)
+            self._handle = self.path.open("a", encoding="utf-8")
+            self._size = self._handle.tell()
+        return self._handle
+
+    def _rotate(self) -> None:
+        assert self._handle is not None
+        self._handle.close()
+        self._handle = None
+        backups = self.settings.backups
+        if backups:
+            Path(f"{self.path}.{backups}").unlink(missing_ok=True)
+            for index in range(backups - 1, 0, -1):
+                source = Path(f"{self.path}.{index}")
+                if source.exists():
+                    os.replace(source, f"{self.path}.{index + 1}")
+            os.replace(self.path, f"{self.path}.1")
+        else:
+            self.path.unlink(missing_ok=True)
+        self.rotations += 1
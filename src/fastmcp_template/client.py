@@ -3,40 +3,501 @@
 from __future__ import annotations
 
 import asyncio
+import time
+from collections.abc import AsyncIterator, Iterable
+from contextlib import (
+    AbstractAsyncContextManager,
+    AbstractContextManager,
+    asynccontextmanager,
+    nullcontext,
+)
 from dataclasses import dataclass, field
 from importlib import import_module
 from types import ModuleType
 from typing import Any
+from uuid import uuid4
 
 from .config import ClientSettings
+from .conversations import SESSION_ARGUMENT
+from .deadlines import TIMEOUT_ARGUMENT
+from .failover import ServerSelector
+from .hedging import Hedger
+from .metrics import CLIENT_STAGES, MetricsRegistry
+from .runner import get_runner
+from .sessions import SessionPool
+from .streaming import StreamStats, measure_stream
+from .tracing import SpanExporter, Tracer, record_span
+
+
+@dataclass(slots=True)
+class BatchStats:
+    """Throughput summary of a bulk invocation.
+
+    Args:
+        total: Number of prompts that completed, successfully or not.
+        succeeded: Prompts that returned a response.
+        failed: Prompts whose invocation raised an exception.
+        elapsed: Wall-clock duration of the batch in seconds.
+        concurrency: Maximum number of invocations that were in flight at once.
+    """
+
+    total: int = 0
+    succeeded: int = 0
+    failed: int = 0
+    elapsed: float = 0.0
+    concurrency: int = 0
+
+    @property
+    def throughput(self) -> float:
+        """Completed prompts per second."""
+        return self.total / self.elapsed if self.elapsed > 0 else 0.0
+
+
+@dataclass(slots=True)
+class Conversation:
+    """Multi-turn conversation whose history is kept by the server.
+
+    Every question is sent alone, tagged with :attr:`session_id`; servers built
+    with ``ServerSettings(conversations=...)`` add the previous turns themselves.
+    """
+
+    client: MCPClient
+    session_id: str = field(default_factory=lambda: uuid4().hex)
+
+    async def ask(self, prompt: str, **extra_payload: Any) -> str:
+        """Send the next turn of the conversation and return the answer."""
+
+        return await self.client.invoke(
+            prompt, **{SESSION_ARGUMENT: self.session_id, **extra_payload}
+        )
+
+    def ask_sync(self, prompt: str, **extra_payload: Any) -> str:
+        """Run :meth:`ask` on the shared background event loop and wait for the answer."""
+
+        return get_runner().run(self.ask(prompt, **extra_payload))
 
 
 @dataclass(slots=True)
 class MCPClient:
-    """High-level async client for interacting with the template FastMCP server."""
+    """High-level async client for interacting with the template FastMCP server.
+
+    By default every invocation opens and closes its own FastMCP session. Call
+    :meth:`connect` (or use the client as an async context manager) to keep a pool
+    of persistent sessions that subsequent invocations reuse until :meth:`aclose`.
+
+    Args:
+        settings: Connection, pooling, hedging, failover and tracing settings.
+        fastmcp_module: Optional FastMCP module, useful in tests.
+        tool_name: Server tool invoked by :meth:`invoke`.
+        span_exporter: Receives the finished traces when ``ClientSettings.tracing``
+            is set. Defaults to a :class:`JsonlExporter` writing to
+            ``TracingSettings.path``.
+    """
 
     settings: ClientSettings = field(default_factory=ClientSettings)
     fastmcp_module: ModuleType | None = None
     tool_name: str = "prompt"
+    span_exporter: SpanExporter | None = None
+    last_batch_stats: BatchStats | None = field(default=None, init=False, repr=False)
+    last_stream_stats: StreamStats | None = field(default=None, init=False, repr=False)
+    _sessions: SessionPool | None = field(default=None, init=False, repr=False)
+    _batch_sessions: SessionPool | None = field(default=None, init=False, repr=False)
+    _batches: int = field(default=0, init=False, repr=False)
+    _metrics: MetricsRegistry | None = field(default=None, init=False, repr=False)
+    _hedger: Hedger | None = field(default=None, init=False, repr=False)
+    _servers: ServerSelector | None = field(default=None, init=False, repr=False)
+    _tracer: Tracer | None = field(default=None, init=False, repr=False)
+
+    @property
+    def sessions(self) -> SessionPool | None:
+        """Return the persistent session pool, or ``None`` in one-shot mode."""
+
+        return self._sessions
+
+    @property
+    def metrics(self) -> MetricsRegistry | None:
+        """Return the metrics registry when ``ClientSettings.metrics`` is enabled."""
+
+        if self._metrics is None and self.settings.metrics:
+            self._metrics = MetricsRegistry("fastmcp_client", CLIENT_STAGES)
+        return self._metrics
+
+    @property
+    def hedger(self) -> Hedger | None:
+        """Return the hedger when ``ClientSettings.hedging`` is configured."""
+
+        if self._hedger is None and self.settings.hedging is not None:
+            self._hedger = Hedger(self.settings.hedging)
+        return self._hedger
+
+    @property
+    def servers(self) -> ServerSelector | None:
+        """Return the server selector when ``ClientSettings.server_urls`` is set."""
+
+        if self._servers is None and self.settings.server_urls:
+            self._servers = ServerSelector(self.settings.server_urls, self.settings.failover)
+        return self._servers
+
+    @property
+    def tracer(self) -> Tracer | None:
+        """Return the tracer when ``ClientSettings.tracing`` is configured."""
+
+        if self._tracer is None and self.settings.tracing is not None:
+            self._tracer = Tracer(self.settings.tracing, exporter=self.span_exporter)
+        return self._tracer
+
+    async def connect(self) -> MCPClient:
+        """Switch to persistent sessions that are reused across invocations."""
+
+        if self._sessions is None:
+            self._sessions = SessionPool(
+                self._open_session, self.settings.session_pool, metrics=self.metrics
+            )
+        # Sessions a running batch opened now stay open once the batch ends.
+        self._batch_sessions = None
+        return self
+
+    async def aclose(self) -> None:
+        """Close all persistent sessions and return to one-shot mode."""
+
+        sessions, self._sessions = self._sessions, None
+        self._batch_sessions = None
+        if sessions is not None:
+            await sessions.aclose()
+
+    async def __aenter__(self) -> MCPClient:
+        """Connect the client when entering an ``async with`` block."""
+
+        return await self.connect()
+
+    async def __aexit__(self, *exc_info: object) -> None:
+        """Close persistent sessions when leaving an ``async with`` block."""
+
+        await self.aclose()
 
     async def invoke(self, prompt: str, **extra_payload: Any) -> str:
-        """Send a prompt to the configured server tool and return the response text."""
+        """Send a prompt to the configured server tool and return the response text.
 
-        fastmcp = self.fastmcp_module or import_module("fastmcp")
-        client_cls = getattr(fastmcp, "Client")
-        async with client_cls(  # type: ignore[call-arg]
-            server_url=self.settings.server_url,
-            request_timeout=self.settings.request_timeout,
-            extra_headers=dict(self.settings.extra_headers),
-        ) as client:
-            payload = {"question": prompt, **extra_payload}
+        With ``ClientSettings(send_deadline=True)``, the request timeout travels with
+        the payload as ``timeout`` unless the caller passes its own. With
+        ``ClientSettings.tracing``, the invocation starts a trace whose context is
+        sent as ``traceparent`` so the server continues it.
+        """
+
+        payload = {"question": prompt, **extra_payload}
+        if self.settings.send_deadline:
+            payload.setdefault(TIMEOUT_ARGUMENT, self.settings.request_timeout)
+        tracer = self.tracer
+        if tracer is None:
+            return await self._invoke(payload)
+        with tracer.trace(f"client.{self.tool_name}", tool=self.tool_name):
+            tracer.inject(payload)
+            return await self._invoke(payload)
+
+    async def _invoke(self, payload: dict[str, Any]) -> str:
+        """Invoke the tool with ``payload`` and extract the text, recording metrics."""
+
+        metrics = self.metrics
+        if metrics is None:
+            return self._extract_response_text(await self._call_tool(payload))
+        started = time.perf_counter()
+        try:
+            response = await self._call_tool(payload)
+            mark = time.perf_counter()
+            text = self._extract_response_text(response)
+            metrics.lap("extract", mark)
+        except Exception as exc:
+            metrics.record_error(exc)
+            raise
+        finally:
+            metrics.lap("total", started)
+        metrics.record_request(len(text))
+        return text
+
+    async def _call_tool(self, payload: dict[str, Any]) -> Any:
+        """Invoke the server tool, hedging slow calls when configured.
+
+        Conversation turns are never hedged, since a duplicate would be recorded
+        twice in the server-side history. With several servers, the duplicate goes
+        to a server the slow call has not tried.
+        """
+
+        hedger = self.hedger
+        if hedger is None or SESSION_ARGUMENT in payload:
+            return await self._call_once(payload)
+        servers = self.servers
+        if servers is None or len(servers.urls) < 2:
+            return await hedger.run(lambda: self._call_once(payload))
+        tried: list[str] = []
+
+        async def primary(server_url: str) -> Any:
+            tried.append(server_url)
+            return await self._call_server(server_url, payload)
+
+        return await hedger.run(
+            lambda: servers.invoke(primary),
+            lambda: servers.invoke(lambda url: self._call_server(url, payload), tried),
+        )
+
+    async def _call_once(self, payload: dict[str, Any]) -> Any:
+        """Invoke the server tool, failing over to other servers when several are configured."""
+
+        servers = self.servers
+        if servers is None:
+            return await self._call_server(self.settings.server_url, payload)
+        return await servers.invoke(lambda url: self._call_server(url, payload))
+
+    async def _call_server(self, server_url: str, payload: dict[str, Any]) -> Any:
+        """Invoke the server tool on a pooled session or a one-shot one."""
+
+        if self._sessions is not None:
+            return await self._sessions.invoke(server_url, self.tool_name, payload)
+        metrics = self.metrics
+        started = time.perf_counter()
+        async with self._open_session(server_url) as client:
+            record_span("connect", started)
+            called = time.perf_counter()
             response = await client.invoke_tool(self.tool_name, **payload)
-        return self._extract_response_text(response)
+            record_span("call", called, server=server_url)
+            if metrics is not None:
+                metrics.observe("connect", called - started)
+                metrics.lap("call", called)
+            return response
+
+    async def stream(self, prompt: str, **extra_payload: Any) -> AsyncIterator[str]:
+        """Yield the response text chunk by chunk as the server generates it.
+
+        Chunks arrive as the messages of the call's progress notifications. Servers
+        that do not stream answer with a single chunk holding the tool result.
+        Time-to-first-token and throughput are recorded in :attr:`last_stream_stats`.
+        The deadline and trace context are sent as by :meth:`invoke`.
+        """
+
+        payload = {"question": prompt, **extra_payload, "stream": True}
+        if self.settings.send_deadline:
+            payload.setdefault(TIMEOUT_ARGUMENT, self.settings.request_timeout)
+        started = time.perf_counter()
+        messages: asyncio.Queue[str | None] = asyncio.Queue()
+
+        async def on_progress(progress: float, total: float | None, message: str | None) -> None:
+            if message is not None:
+                messages.put_nowait(message)
+
+        tracer = self.tracer
+        traced: AbstractContextManager[Any] = (
+            nullcontext()
+            if tracer is None
+            else tracer.trace(f"client.{self.tool_name}", tool=self.tool_name, stream=True)
+        )
+        with traced:
+            if tracer is not None:
+                tracer.inject(payload)
+            async with self._session_context() as client:
+                call = asyncio.ensure_future(
+                    client.invoke_tool(self.tool_name, progress_handler=on_progress, **payload)
+                )
+                call.add_done_callback(lambda _: messages.put_nowait(None))
+                try:
+                    chunks = self._iter_progress_text(messages, call)
+                    async for chunk in measure_stream(
+                        chunks, self._record_stream, started=started
+                    ):
+                        yield chunk
+                finally:
+                    call.cancel()
+                    await asyncio.gather(call, return_exceptions=True)
+
+    async def invoke_many(
+        self, prompts: Iterable[str], *, concurrency: int = 8, **extra_payload: Any
+    ) -> list[str | Exception]:
+        """Invoke every prompt with bounded concurrency and return results in input order.
+
+        Failed invocations do not abort the batch; their exception takes the place
+        of the response text. Throughput is recorded in :attr:`last_batch_stats`.
+        """
+
+        results: dict[int, str | Exception] = {}
+        async for index, outcome in self.iter_completed(
+            prompts, concurrency=concurrency, **extra_payload
+        ):
+            results[index] = outcome
+        return [results[index] for index in range(len(results))]
+
+    async def iter_completed(
+        self, prompts: Iterable[str], *, concurrency: int = 8, **extra_payload: Any
+    ) -> AsyncIterator[tuple[int, str | Exception]]:
+        """Yield ``(index, result_or_error)`` pairs as soon as each invocation finishes.
+
+        Prompts are consumed lazily, so arbitrarily large iterables only keep
+        ``concurrency`` invocations in memory. When the client is not connected,
+        persistent sessions are opened for the duration of the batch and shared
+        with concurrent batches; the last batch to finish closes them. An exception
+        raised by ``prompts`` itself cancels the remaining invocations and is
+        re-raised.
+        """
+
+        if concurrency < 1:
+            raise ValueError("concurrency must be at least 1.")
+
+        borrowed = await self._borrow_sessions()
+        stats = BatchStats(concurrency=concurrency)
+        pending = enumerate(prompts)
+        # Workers post results, then ``None`` once the prompts run out or the
+        # exception that stopped them.
+        completed: asyncio.Queue[tuple[int, str | Exception] | BaseException | None]
+        completed = asyncio.Queue(concurrency)
+
+        async def worker() -> None:
+            failure: BaseException | None = None
+            cancelled = False
+            try:
+                for index, prompt in pending:
+                    outcome: str | Exception
+                    try:
+                        outcome = await self.invoke(prompt, **extra_payload)
+                    except Exception as exc:  # errors are reported per item
+                        outcome = exc
+                    await completed.put((index, outcome))
+            except asyncio.CancelledError:
+                cancelled = True  # the batch is torn down and nobody reads the queue
+                raise
+            except BaseException as exc:  # e.g. raised by the prompts iterator
+                failure = exc
+            finally:
+                if not cancelled:
+                    await completed.put(failure)
+
+        started = time.perf_counter()
+        workers = [asyncio.create_task(worker()) for _ in range(concurrency)]
+        running = len(workers)
+        try:
+            while running:
+                item = await completed.get()
+                if item is None:
+                    running -= 1
+                    continue
+                if isinstance(item, BaseException):
+                    raise item
+                stats.total += 1
+                if isinstance(item[1], Exception):
+                    stats.failed += 1
+                else:
+                    stats.succeeded += 1
+                yield item
+        finally:
+            for task in workers:
+                task.cancel()
+            await asyncio.gather(*workers, return_exceptions=True)
+            stats.elapsed = time.perf_counter() - started
+            self.last_batch_stats = stats
+            await self._release_sessions(borrowed)
+
+    async def _borrow_sessions(self) -> SessionPool | None:
+        """Return the batch-opened pool a batch must release, opening one when not connected.
+
+        ``None`` means the sessions belong to the caller of :meth:`connect`.
+        """
+
+        if self._sessions is None:
+            await self.connect()
+            self._batch_sessions, self._batches = self._sessions, 0
+        if self._sessions is None or self._sessions is not self._batch_sessions:
+            return None
+        self._batches += 1
+        return self._sessions
+
+    async def _release_sessions(self, sessions: SessionPool | None) -> None:
+        """Close ``sessions`` once no batch borrowing them is still running."""
+
+        if sessions is None or sessions is not self._batch_sessions:
+            return
+        self._batches -= 1
+        if not self._batches:
+            await self.aclose()
+
+    def conversation(self, session_id: str | None = None) -> Conversation:
+        """Start (or resume, given its ``session_id``) a server-side conversation."""
+
+        if session_id is None:
+            return Conversation(self)
+        return Conversation(self, session_id)
 
     def invoke_sync(self, prompt: str, **extra_payload: Any) -> str:
-        """Synchronously invoke the client."""
+        """Run :meth:`invoke` on the shared background event loop and wait for the answer."""
+
+        return get_runner().run(self.invoke(prompt, **extra_payload))
+
+    def invoke_many_sync(
+        self, prompts: Iterable[str], *, concurrency: int = 8, **extra_payload: Any
+    ) -> list[str | Exception]:
+        """Run :meth:`invoke_many` on the shared background event loop and wait for it."""
+
+        return get_runner().run(
+            self.invoke_many(prompts, concurrency=concurrency, **extra_payload)
+        )
+
+    def connect_sync(self) -> None:
+        """Open persistent sessions on the background loop used by the ``*_sync`` methods.
+
+        Sessions stay open across synchronous calls until :meth:`close_sync`.
+        """
+
+        get_runner().run(self.connect())
+
+    def close_sync(self) -> None:
+        """Close the sessions opened by :meth:`connect_sync`."""
+
+        get_runner().run(self.aclose())
+
+    @asynccontextmanager
+    async def _session_context(self) -> AsyncIterator[Any]:
+        """Yield a session for a call that is not retried, such as a stream.
+
+        With several servers, the call's outcome feeds the chosen server's breaker.
+        """
 
-        return asyncio.run(self.invoke(prompt, **extra_payload))
+        servers = self.servers
+        if servers is None:
+            async with self._session_for(self.settings.server_url) as client:
+                yield client
+            return
+        async with servers.attempt() as server_url, self._session_for(server_url) as client:
+            yield client
+
+    def _session_for(self, server_url: str) -> AbstractAsyncContextManager[Any]:
+        """Return a context yielding a pooled session, or a one-shot one when not connected."""
+
+        if self._sessions is not None:
+            return self._sessions.lease(server_url)
+        return self._open_session(server_url)  # type: ignore[no-any-return]
+
+    def _record_stream(self, stats: StreamStats) -> None:
+        self.last_stream_stats = stats
+
+    @classmethod
+    async def _iter_progress_text(
+        cls, messages: asyncio.Queue[str | None], call: asyncio.Future[Any]
+    ) -> AsyncIterator[str]:
+        """Yield progress messages until ``call`` completes, then its result if none came."""
+
+        streamed = False
+        while (message := await messages.get()) is not None:
+            streamed = True
+            yield message
+        response = call.result()
+        if not streamed:
+            yield cls._extract_response_text(response)
+
+    def _open_session(self, server_url: str) -> Any:
+        """Return an un-entered FastMCP client context for ``server_url``."""
+
+        fastmcp = self.fastmcp_module or import_module("fastmcp")
+        client_cls = getattr(fastmcp, "Client")
+        return client_cls(
+            server_url=server_url,
+            request_timeout=self.settings.request_timeout,
+            extra_headers=dict(self.settings.extra_headers),
+        )
 
     @staticmethod
     def _extract_response_text(response: Any) -> str:
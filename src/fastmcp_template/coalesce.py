@@ -0,0 +1,89 @@
+"""Single-flight coalescing of identical concurrent requests."""
+
+from __future__ import annotations
+
+import asyncio
+from collections.abc import Callable, Coroutine, Hashable
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class _Flight:
+    """A shared in-flight call and the number of callers awaiting it."""
+
+    task: asyncio.Task[Any]
+    waiters: int = 0
+
+
+@dataclass(slots=True)
+class FlightStats:
+    """Counters describing how requests were coalesced.
+
+    Args:
+        executed: Calls that actually ran because no identical call was in flight.
+        coalesced: Calls that joined an identical in-flight call instead of running.
+        cancelled: Shared calls cancelled because every waiter went away.
+    """
+
+    executed: int = 0
+    coalesced: int = 0
+    cancelled: int = 0
+
+
+class SingleFlight:
+    """Run at most one call per key at a time and share its outcome with all callers.
+
+    Every caller awaits the shared task through :func:`asyncio.shield`, so one
+    caller being cancelled does not affect the others. Once the last caller is
+    cancelled, the shared task is cancelled as well. Exceptions raised by the shared
+    call propagate to every caller.
+    """
+
+    def __init__(self) -> None:
+        self.stats = FlightStats()
+        self._flights: dict[Hashable, _Flight] = {}
+
+    async def run(self, key: Hashable, call: Callable[[], Coroutine[Any, Any, T]]) -> T:
+        """Return the result of ``call()``, sharing it with concurrent callers of ``key``."""
+
+        flight = self._flights.get(key)
+        if flight is None:
+            flight = _Flight(task=asyncio.ensure_future(call()))
+            self._flights[key] = flight
+            flight.task.add_done_callback(lambda _: self._forget(key, flight))
+            self.stats.executed += 1
+        else:
+            self.stats.coalesced += 1
+
+        flight.waiters += 1
+        try:
+            result: T = await asyncio.shield(flight.task)
+            return result
+        finally:
+            flight.waiters -= 1
+            if flight.waiters == 0 and not flight.task.done():
+                flight.task.cancel()
+                self._forget(key, flight)
+                self.stats.cancelled += 1
+
+    def in_flight(self) -> int:
+        """Return the number of distinct calls currently running."""
+
+        return len(self._flights)
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the coalescing counters together with the in-flight count."""
+
+        return {
+            "executed": self.stats.executed,
+            "coalesced": self.stats.coalesced,
+            "cancelled": self.stats.cancelled,
+            "in_flight": len(self._flights),
+        }
+
+    def _forget(self, key: Hashable, flight: _Flight) -> None:
+        if self._flights.get(key) is flight:
+            del self._flights[key]
@@ -2,8 +2,411 @@
 
 from __future__ import annotations
 
+from collections.abc import Mapping, Sequence
 from dataclasses import dataclass, field
-from typing import Mapping
+
+
+@dataclass(slots=True)
+class AgentPoolSettings:
+    """Configuration for the pool of reusable agents kept by the server builder.
+
+    Args:
+        min_size: Number of agents kept alive per configuration, even when idle.
+        max_size: Maximum number of agents per configuration. Once reached, callers
+            wait until another invocation releases its agent.
+        idle_timeout: Seconds an idle agent above ``min_size`` is kept before being
+            evicted. ``None`` keeps idle agents forever.
+        prewarm: Create ``min_size`` agents when the server is built instead of on
+            the first tool invocation.
+    """
+
+    min_size: int = 0
+    max_size: int = 4
+    idle_timeout: float | None = 300.0
+    prewarm: bool = False
+
+    def __post_init__(self) -> None:
+        """Validate the pool bounds."""
+        if self.max_size < 1:
+            raise ValueError("AgentPoolSettings.max_size must be at least 1.")
+        if not 0 <= self.min_size <= self.max_size:
+            raise ValueError("AgentPoolSettings.min_size must be between 0 and max_size.")
+
+
+@dataclass(slots=True)
+class ResponseCacheSettings:
+    """Configuration for the server-side cache of agent responses.
+
+    Args:
+        max_entries: Maximum number of cached responses. The least recently used
+            entry is evicted once the cache is full.
+        ttl: Seconds a cached response stays valid. ``None`` disables expiry.
+        max_temperature: Responses from agents sampling above this temperature are
+            neither cached nor served from the cache. ``None`` caches every agent.
+        bypass_key: Payload argument that, when truthy, skips the cache lookup for
+            a single request. The fresh response still refreshes the cache.
+    """
+
+    max_entries: int = 1024
+    ttl: float | None = 300.0
+    max_temperature: float | None = 0.3
+    bypass_key: str = "no_cache"
+
+    def __post_init__(self) -> None:
+        """Validate the cache bounds."""
+        if self.max_entries < 1:
+            raise ValueError("ResponseCacheSettings.max_entries must be at least 1.")
+
+
+@dataclass(slots=True)
+class SemanticCacheSettings:
+    """Configuration for the cache answering prompts similar to earlier ones.
+
+    Requires NumPy, installed with the ``semantic`` extra.
+
+    Args:
+        threshold: Cosine similarity from which a cached prompt counts as the same
+            question. The default hashing embedder cannot tell a meaningful word
+            apart from a filler one, and long prompts differing by one such word
+            still score around 0.98, so the default only matches near-identical
+            prompts (casing, punctuation, spacing). Lower it only with an embedder
+            that understands meaning.
+        max_entries: Maximum number of cached responses. The least recently used
+            ``evict_fraction`` of them is evicted at once when the cache is full.
+        dimensions: Size of the vectors built by the default hashing embedder.
+        ttl: Seconds a cached response stays valid. ``None`` disables expiry.
+        max_temperature: Responses from agents sampling above this temperature are
+            neither cached nor served from the cache. ``None`` caches every agent.
+        evict_fraction: Share of the entries evicted when the cache is full.
+        bypass_key: Payload argument that, when truthy, skips the cache lookup for
+            a single request.
+        match_numbers: Only match cached prompts containing the same numbers, so
+            questions about different identifiers or amounts never share answers.
+        per_tenant: Keep the entries of every scheduler tenant apart when
+            ``ServerSettings.scheduler`` is set.
+    """
+
+    threshold: float = 0.99
+    max_entries: int = 4096
+    dimensions: int = 1024
+    ttl: float | None = 300.0
+    max_temperature: float | None = 0.3
+    evict_fraction: float = 0.1
+    bypass_key: str = "no_cache"
+    match_numbers: bool = True
+    per_tenant: bool = True
+
+    def __post_init__(self) -> None:
+        """Validate the cache bounds."""
+        if not -1 <= self.threshold <= 1:
+            raise ValueError("SemanticCacheSettings.threshold must be in [-1, 1].")
+        if self.max_entries < 1 or self.dimensions < 1:
+            raise ValueError("SemanticCacheSettings.max_entries and dimensions must be positive.")
+        if not 0 < self.evict_fraction <= 1:
+            raise ValueError("SemanticCacheSettings.evict_fraction must be in (0, 1].")
+
+
+@dataclass(slots=True)
+class BatchingSettings:
+    """Configuration for collecting concurrent prompts into batched agent calls.
+
+    Args:
+        max_batch_size: Number of queued prompts that triggers an immediate flush.
+        window: Seconds the first queued prompt waits for companions before the
+            batch is sent anyway.
+    """
+
+    max_batch_size: int = 8
+    window: float = 0.01
+
+    def __post_init__(self) -> None:
+        """Validate the batching bounds."""
+        if self.max_batch_size < 1:
+            raise ValueError("BatchingSettings.max_batch_size must be at least 1.")
+        if self.window < 0:
+            raise ValueError("BatchingSettings.window must not be negative.")
+
+
+@dataclass(slots=True)
+class AdmissionSettings:
+    """Configuration for the adaptive concurrency limit guarding the agent.
+
+    The limit follows an additive-increase/multiplicative-decrease (AIMD) rule:
+    calls finishing within ``target_latency`` grow the limit by roughly
+    ``increase_step`` per window of admitted calls, while slower calls or timeouts
+    shrink it by ``decrease_factor``.
+
+    Args:
+        initial_limit: Concurrent agent calls allowed before any latency is observed.
+        min_limit: Lower bound of the adaptive limit.
+        max_limit: Upper bound of the adaptive limit.
+        max_queue: Invocations allowed to wait for a free slot. Further invocations
+            are rejected immediately with :class:`OverloadedError`.
+        max_queue_time: Seconds an invocation may wait for a slot before it is shed.
+        target_latency: Latency in seconds above which the limit is decreased.
+            ``None`` keeps the limit fixed at ``initial_limit``.
+        increase_step: Additive increase applied per window of fast calls.
+        decrease_factor: Multiplicative decrease applied after a slow call.
+    """
+
+    initial_limit: int = 8
+    min_limit: int = 1
+    max_limit: int = 64
+    max_queue: int = 32
+    max_queue_time: float = 5.0
+    target_latency: float | None = 5.0
+    increase_step: float = 1.0
+    decrease_factor: float = 0.9
+
+    def __post_init__(self) -> None:
+        """Validate the limit bounds."""
+        if not 1 <= self.min_limit <= self.initial_limit <= self.max_limit:
+            raise ValueError(
+                "AdmissionSettings requires 1 <= min_limit <= initial_limit <= max_limit."
+            )
+        if self.max_queue < 0:
+            raise ValueError("AdmissionSettings.max_queue must not be negative.")
+        if not 0 < self.decrease_factor < 1:
+            raise ValueError("AdmissionSettings.decrease_factor must be between 0 and 1.")
+
+
+@dataclass(slots=True)
+class TenantPolicy:
+    """Scheduling policy of a single tenant.
+
+    Args:
+        weight: Share of the agent capacity the tenant receives relative to other
+            backlogged tenants of the same priority.
+        priority: Tenants with a higher priority are always served first.
+        rate: Invocations per second the tenant may start. ``None`` is unlimited.
+        burst: Invocations the tenant may start at once before ``rate`` applies.
+            Defaults to ``rate`` rounded up.
+    """
+
+    weight: float = 1.0
+    priority: int = 0
+    rate: float | None = None
+    burst: float | None = None
+
+    def __post_init__(self) -> None:
+        """Validate the policy."""
+        if self.weight <= 0:
+            raise ValueError("TenantPolicy.weight must be positive.")
+        if self.rate is not None and self.rate <= 0:
+            raise ValueError("TenantPolicy.rate must be positive.")
+
+
+@dataclass(slots=True)
+class SchedulerSettings:
+    """Configuration for weighted fair scheduling of agent calls across tenants.
+
+    The tenant is read from the ``argument`` payload value, then from the
+    ``header`` HTTP header (set by clients through ``ClientSettings.extra_headers``),
+    and falls back to ``default_tenant``.
+
+    Args:
+        concurrency: Agent calls running at once across all tenants.
+        tenants: Policies of known tenants. Others use ``default_policy``.
+        default_policy: Policy of tenants missing from ``tenants``.
+        max_queue: Invocations each tenant may have waiting. Further invocations
+            are rejected with ``OverloadedError``.
+        max_queue_time: Seconds an invocation may wait before it is shed.
+        argument: Payload argument naming the tenant.
+        header: HTTP header naming the tenant, matched case-insensitively.
+        default_tenant: Tenant of invocations that name none.
+        max_tenants: Tenants whose queue and rate limit state is kept at once.
+            Beyond it, the least recently seen idle tenant is forgotten; when no
+            tenant is idle, invocations of new tenants are scheduled as
+            ``default_tenant``, which always has an entry reserved.
+    """
+
+    concurrency: int = 8
+    tenants: Mapping[str, TenantPolicy] = field(default_factory=dict)
+    default_policy: TenantPolicy = field(default_factory=TenantPolicy)
+    max_queue: int = 64
+    max_queue_time: float = 30.0
+    argument: str = "tenant"
+    header: str = "x-tenant-id"
+    default_tenant: str = "default"
+    max_tenants: int = 1024
+
+    def __post_init__(self) -> None:
+        """Validate the scheduler bounds."""
+        if self.concurrency < 1:
+            raise ValueError("SchedulerSettings.concurrency must be at least 1.")
+        if self.max_tenants < 1:
+            raise ValueError("SchedulerSettings.max_tenants must be at least 1.")
+        if self.max_queue < 0:
+            raise ValueError("SchedulerSettings.max_queue must not be negative.")
+
+
+@dataclass(slots=True)
+class ConversationSettings:
+    """Configuration for the server-side history of multi-turn conversations.
+
+    Args:
+        max_sessions: Conversations kept at once. The least recently used one is
+            evicted when a new conversation starts beyond this limit.
+        max_turns: Question/answer pairs remembered per conversation. Older turns
+            are dropped first.
+        max_tokens: Estimated prompt tokens of history kept per conversation.
+        ttl: Seconds a conversation survives without a new turn. ``None``
+            disables expiry.
+        max_bytes: Size of the text held by all conversations together. Least
+            recently used conversations are evicted beyond it.
+    """
+
+    max_sessions: int = 1024
+    max_turns: int = 20
+    max_tokens: int = 2048
+    ttl: float | None = 1800.0
+    max_bytes: int = 64 * 1024 * 1024
+
+    def __post_init__(self) -> None:
+        """Validate the history bounds."""
+        if min(self.max_sessions, self.max_turns, self.max_tokens, self.max_bytes) < 1:
+            raise ValueError("ConversationSettings limits must be at least 1.")
+
+
+@dataclass(slots=True)
+class DocumentSettings:
+    """Configuration for answering questions about documents too large for one prompt.
+
+    Documents are split into chunks of about ``chunk_tokens`` tokens, each chunk
+    is answered separately (map) and the partial answers are combined
+    ``fan_in`` at a time until one answer remains (reduce).
+
+    Args:
+        chunk_tokens: Estimated prompt tokens per chunk, counting four
+            characters per token.
+        overlap_tokens: Estimated tokens repeated at the start of the next chunk,
+            so text cut at a chunk boundary is seen whole at least once.
+        concurrency: Agent calls in flight at once for one document.
+        fan_in: Partial answers combined by each reduce call.
+        read_size: Bytes of a file decoded at a time.
+        allowed_paths: Directories whose files may be read through the ``path``
+            argument. Empty disables file input.
+        map_prompt: Template of map prompts, with ``{question}`` and ``{chunk}``
+            fields.
+        reduce_prompt: Template of reduce prompts, with ``{question}`` and
+            ``{answers}`` fields.
+    """
+
+    chunk_tokens: int = 1024
+    overlap_tokens: int = 64
+    concurrency: int = 4
+    fan_in: int = 4
+    read_size: int = 1024 * 1024
+    allowed_paths: Sequence[str] = ()
+    map_prompt: str = (
+        "Answer the question using only this excerpt of a longer document. If the "
+        "excerpt is not relevant, say so in one sentence.\n\nQuestion: {question}\n\n"
+        "Excerpt:\n{chunk}"
+    )
+    reduce_prompt: str = (
+        "Combine these partial answers, each based on a different part of one "
+        "document, into a single answer.\n\nQuestion: {question}\n\n"
+        "Partial answers:\n{answers}"
+    )
+
+    def __post_init__(self) -> None:
+        """Validate the chunking and fan-out parameters."""
+        if self.chunk_tokens < 2:
+            raise ValueError("DocumentSettings.chunk_tokens must be at least 2.")
+        if not 0 <= self.overlap_tokens * 2 < self.chunk_tokens:
+            raise ValueError(
+                "DocumentSettings.overlap_tokens must be less than half of chunk_tokens."
+            )
+        if self.concurrency < 1 or self.read_size < 1:
+            raise ValueError("DocumentSettings.concurrency and read_size must be at least 1.")
+        if self.fan_in < 2:
+            raise ValueError("DocumentSettings.fan_in must be at least 2.")
+
+
+@dataclass(slots=True)
+class RoutingSettings:
+    """Configuration for spreading agent calls across several backends.
+
+    Args:
+        strategy: ``"least_outstanding"`` sends each call to the backend with the
+            fewest calls in flight. ``"ewma"`` prefers the backend with the lowest
+            exponentially weighted latency, scaled by its calls in flight.
+        ewma_alpha: Weight of the newest latency sample in the moving average.
+        failure_threshold: Consecutive failures after which a backend is ejected.
+        ejection_time: Seconds an ejected backend is skipped before it is given
+            another chance.
+        max_attempts: Backends tried for one call before its error is raised.
+    """
+
+    strategy: str = "least_outstanding"
+    ewma_alpha: float = 0.3
+    failure_threshold: int = 3
+    ejection_time: float = 10.0
+    max_attempts: int = 2
+
+    def __post_init__(self) -> None:
+        """Validate the routing parameters."""
+        if self.strategy not in ("least_outstanding", "ewma"):
+            raise ValueError("RoutingSettings.strategy must be 'least_outstanding' or 'ewma'.")
+        if not 0 < self.ewma_alpha <= 1:
+            raise ValueError("RoutingSettings.ewma_alpha must be in (0, 1].")
+        if self.failure_threshold < 1:
+            raise ValueError("RoutingSettings.failure_threshold must be at least 1.")
+        if self.max_attempts < 1:
+            raise ValueError("RoutingSettings.max_attempts must be at least 1.")
+
+
+@dataclass(slots=True)
+class TracingSettings:
+    """Configuration for request tracing and sampled profiling.
+
+    Args:
+        sample_rate: Share of new traces that are recorded, 1% by default. Traces
+            continued from a caller keep the caller's decision.
+        path: JSON Lines file the default exporter appends spans to.
+        profile_rate: Share of sampled requests run under a profiler. ``0``
+            disables profiling. One request is profiled at a time, but the
+            profiler sees the whole event loop thread, so the dump also holds
+            the other requests that ran while the profiled one awaited.
+        profile_dir: Directory receiving one ``.prof`` dump per profiled request,
+            readable with :mod:`pstats` or snakeviz.
+    """
+
+    sample_rate: float = 0.01
+    path: str = "traces.jsonl"
+    profile_rate: float = 0.0
+    profile_dir: str = "profiles"
+
+    def __post_init__(self) -> None:
+        """Validate the sampling rates."""
+        if not 0 <= self.sample_rate <= 1 or not 0 <= self.profile_rate <= 1:
+            raise ValueError("TracingSettings rates must be in [0, 1].")
+
+
+@dataclass(slots=True)
+class CaptureSettings:
+    """Configuration for recording served invocations to replay them offline.
+
+    Captured payloads contain the users' prompts; store the log accordingly.
+
+    Args:
+        path: JSON Lines file invocations are appended to.
+        sample_rate: Share of invocations recorded.
+        max_bytes: Size after which the log is rotated to ``<path>.1``.
+        backups: Rotated logs kept. ``0`` discards the log on rotation.
+    """
+
+    path: str = "traffic.jsonl"
+    sample_rate: float = 1.0
+    max_bytes: int = 64 * 1024 * 1024
+    backups: int = 5
+
+    def __post_init__(self) -> None:
+        """Validate the sampling rate and rotation limits."""
+        if not 0 <= self.sample_rate <= 1:
+            raise ValueError("CaptureSettings.sample_rate must be in [0, 1].")
+        if self.max_bytes < 1 or self.backups < 0:
+            raise ValueError("CaptureSettings.max_bytes must be positive and backups not negative.")
 
 
 @dataclass(slots=True)
@@ -16,6 +419,44 @@ class ServerSettings:
         tool_name: Identifier of the primary tool exposed by the MCP server.
         tool_description: Summary of what the tool does.
         metadata: Additional metadata attached to the server registration payload.
+        agent_pool: Optional :class:`AgentPoolSettings`. When provided, agents are
+            reused across tool invocations instead of being built for every call.
+        response_cache: Optional :class:`ResponseCacheSettings`. When provided,
+            repeated prompts are answered from memory without calling the agent.
+        semantic_cache: Optional :class:`SemanticCacheSettings`. When provided,
+            prompts worded like a recently answered one are answered from memory.
+        coalesce_requests: Share a single agent call between concurrent
+            invocations carrying the same normalised prompt.
+        batching: Optional :class:`BatchingSettings`. When provided, concurrent
+            prompts are sent to the agent together through ``chat_batch``.
+        admission: Optional :class:`AdmissionSettings`. When provided, concurrent
+            agent calls are limited and excess invocations are queued or shed.
+        metrics: Record per-stage latency histograms, request, error and output
+            size counters. Disabled by default.
+        warmup: Build an agent and send ``warmup_prompt`` while the server is
+            built, so the first real invocation does not pay for imports and model
+            client setup.
+        warmup_prompt: Probe prompt sent during warm-up. An empty string only
+            builds the agent.
+        enforce_deadlines: Honour the ``timeout`` argument sent by clients: refuse
+            invocations whose deadline already passed and cancel the agent call
+            once it does.
+        tool_timeout: Seconds an invocation of the tool may run, including time
+            queued for admission, before it fails with ``DeadlineExceededError``.
+            Shorter caller deadlines still apply when enforced.
+        conversations: Optional :class:`ConversationSettings`. When provided,
+            invocations carrying a ``session_id`` are answered with the history of
+            that conversation, so clients only send the new turn.
+        scheduler: Optional :class:`SchedulerSettings`. When provided, agent calls
+            are queued per tenant and started in weighted fair order.
+        documents: Optional :class:`DocumentSettings`. When provided, invocations
+            carrying a ``document`` text or a file ``path`` are answered by
+            map-reduce over chunks of the document.
+        tracing: Optional :class:`TracingSettings`. When provided, invocations are
+            traced, continuing the trace sent by the client, with a child span
+            per stage.
+        capture: Optional :class:`CaptureSettings`. When provided, a sampled share
+            of invocations is appended to a rotating log for offline replay.
     """
 
     server_name: str = "fastmcp-template-server"
@@ -25,6 +466,155 @@ class ServerSettings:
         "Send natural language prompts to the backing language model and receive a response."
     )
     metadata: Mapping[str, str] = field(default_factory=dict)
+    agent_pool: AgentPoolSettings | None = None
+    response_cache: ResponseCacheSettings | None = None
+    semantic_cache: SemanticCacheSettings | None = None
+    coalesce_requests: bool = False
+    batching: BatchingSettings | None = None
+    admission: AdmissionSettings | None = None
+    metrics: bool = False
+    warmup: bool = False
+    warmup_prompt: str = "ping"
+    enforce_deadlines: bool = False
+    tool_timeout: float | None = None
+    conversations: ConversationSettings | None = None
+    scheduler: SchedulerSettings | None = None
+    documents: DocumentSettings | None = None
+    tracing: TracingSettings | None = None
+    capture: CaptureSettings | None = None
+
+
+@dataclass(slots=True)
+class WorkerSettings:
+    """Configuration for serving one application from several pre-forked processes.
+
+    Args:
+        workers: Number of worker processes. ``None`` uses one per CPU core.
+        host: Interface the shared listening socket binds to.
+        port: Port of the shared listening socket. ``0`` picks a free port.
+        backlog: Pending connections queued by the kernel on the shared socket.
+        graceful_timeout: Seconds a stopping worker may finish in-flight requests
+            before it is killed.
+        restart_delay: Seconds to wait before replacing a worker that exited
+            unexpectedly, so a crashing worker does not spin.
+        metrics_interval: Seconds between two metric snapshots published by each
+            worker.
+    """
+
+    workers: int | None = None
+    host: str = "127.0.0.1"
+    port: int = 8000
+    backlog: int = 2048
+    graceful_timeout: float = 30.0
+    restart_delay: float = 1.0
+    metrics_interval: float = 5.0
+
+    def __post_init__(self) -> None:
+        """Validate the worker count."""
+        if self.workers is not None and self.workers < 1:
+            raise ValueError("WorkerSettings.workers must be at least 1.")
+
+
+@dataclass(slots=True)
+class SessionPoolSettings:
+    """Configuration for the persistent sessions kept by a connected client.
+
+    Args:
+        max_size: Maximum number of open sessions per server URL. Additional
+            concurrent invocations wait for a session to be released.
+        idle_timeout: Seconds an unused session stays open before it is closed.
+            ``None`` keeps idle sessions open until the client is closed.
+        health_check_interval: Sessions idle for longer than this many seconds are
+            pinged before reuse, provided the FastMCP client exposes ``ping``.
+            ``None`` disables health checks.
+        max_reconnects: Number of times an invocation is retried on a fresh
+            session after the connection failed.
+    """
+
+    max_size: int = 4
+    idle_timeout: float | None = 60.0
+    health_check_interval: float | None = 15.0
+    max_reconnects: int = 1
+
+    def __post_init__(self) -> None:
+        """Validate the pool bounds."""
+        if self.max_size < 1:
+            raise ValueError("SessionPoolSettings.max_size must be at least 1.")
+        if self.max_reconnects < 0:
+            raise ValueError("SessionPoolSettings.max_reconnects must not be negative.")
+
+
+@dataclass(slots=True)
+class HedgingSettings:
+    """Configuration for hedged client invocations.
+
+    An invocation still running after the ``percentile`` latency of recent
+    invocations is duplicated and the first response wins. Hedges spend a budget
+    refilled by ``budget_ratio`` for every invocation, so they add at most that
+    fraction of extra load, plus ``budget_burst`` after quiet periods.
+
+    Args:
+        percentile: Latency quantile, between 0 and 1, after which a hedge is sent.
+        window: Number of recent latencies the quantile is computed from.
+        min_samples: Latencies required before hedging starts.
+        budget_ratio: Hedges allowed per invocation on average.
+        budget_burst: Maximum number of hedges that can be saved up.
+    """
+
+    percentile: float = 0.95
+    window: int = 256
+    min_samples: int = 20
+    budget_ratio: float = 0.1
+    budget_burst: float = 10.0
+
+    def __post_init__(self) -> None:
+        """Validate the hedging parameters."""
+        if not 0 < self.percentile < 1:
+            raise ValueError("HedgingSettings.percentile must be between 0 and 1.")
+        if not 1 <= self.min_samples <= self.window:
+            raise ValueError("HedgingSettings requires 1 <= min_samples <= window.")
+        if self.budget_ratio < 0 or self.budget_burst < 1:
+            raise ValueError(
+                "HedgingSettings requires budget_ratio >= 0 and budget_burst >= 1."
+            )
+
+
+@dataclass(slots=True)
+class FailoverSettings:
+    """Configuration for spreading client invocations across several servers.
+
+    Args:
+        policy: ``"round_robin"`` rotates through the servers, ``"lowest_latency"``
+            prefers the server with the lowest moving average latency.
+        failure_threshold: Consecutive failures that open a server's circuit.
+        reset_timeout: Seconds an open circuit fails fast before it lets probe
+            invocations through (half-open).
+        half_open_probes: Probe invocations allowed at once on a half-open circuit.
+        max_attempts: Servers tried for one invocation before its error is raised.
+        backoff: Base delay in seconds before a retry. The delay doubles with each
+            attempt and is drawn uniformly below that value (full jitter).
+        max_backoff: Upper bound of the retry delay in seconds.
+        ewma_alpha: Weight of the newest sample in the latency moving average.
+    """
+
+    policy: str = "round_robin"
+    failure_threshold: int = 5
+    reset_timeout: float = 10.0
+    half_open_probes: int = 1
+    max_attempts: int = 3
+    backoff: float = 0.05
+    max_backoff: float = 1.0
+    ewma_alpha: float = 0.3
+
+    def __post_init__(self) -> None:
+        """Validate the failover parameters."""
+        if self.policy not in ("round_robin", "lowest_latency"):
+            raise ValueError("FailoverSettings.policy must be 'round_robin' or 'lowest_latency'.")
+        if min(self.failure_threshold, self.half_open_probes, self.max_attempts) < 1:
+            raise ValueError(
+                "FailoverSettings failure_threshold, half_open_probes and max_attempts "
+                "must be at least 1."
+            )
 
 
 @dataclass(slots=True)
@@ -35,8 +625,31 @@ class ClientSettings:
         server_url: Base URL for connecting to the MCP server.
         request_timeout: Timeout in seconds for client requests.
         extra_headers: Optional HTTP headers to send with each request.
+        session_pool: Settings applied to persistent sessions once the client is
+            connected via ``MCPClient.connect`` or ``async with``.
+        metrics: Record per-stage latency histograms, request, error and output
+            size counters. Disabled by default.
+        send_deadline: Send ``request_timeout`` as the ``timeout`` argument of every
+            invocation, so servers enforcing deadlines stop working on requests
+            the client has given up on.
+        hedging: Optional :class:`HedgingSettings`. When provided, slow
+            invocations are duplicated and the first response is used.
+        server_urls: Several equivalent servers used instead of ``server_url``.
+            Each gets a circuit breaker and failed invocations are retried on
+            another server, as configured by ``failover``.
+        failover: Server selection, circuit breaker and retry settings applied
+            when ``server_urls`` is set.
+        tracing: Optional :class:`TracingSettings`. When provided, invocations are
+            traced and the trace context is sent as the ``traceparent`` argument.
     """
 
     server_url: str = "http://localhost:8000"
     request_timeout: float = 30.0
     extra_headers: Mapping[str, str] = field(default_factory=dict)
+    session_pool: SessionPoolSettings = field(default_factory=SessionPoolSettings)
+    metrics: bool = False
+    send_deadline: bool = False
+    hedging: HedgingSettings | None = None
+    server_urls: Sequence[str] = ()
+    failover: FailoverSettings = field(default_factory=FailoverSettings)
+    tracing: TracingSettings | None = None
@@ -0,0 +1,187 @@
+"""Bounded server-side history of multi-turn conversations."""
+
+from __future__ import annotations
+
+import time
+from collections import OrderedDict, deque
+from collections.abc import Callable, Sequence
+from dataclasses import dataclass, field
+
+from .config import ConversationSettings
+
+#: Payload argument identifying the conversation an invocation belongs to.
+SESSION_ARGUMENT = "session_id"
+
+
+def estimate_tokens(text: str) -> int:
+    """Return a cheap estimate of the prompt tokens in ``text`` (about four characters each)."""
+
+    return len(text) // 4 + 1
+
+
+def format_history(history: Sequence[Turn], query: str) -> str:
+    """Render previous turns and the new question as a single prompt."""
+
+    if not history:
+        return query
+    lines = ["Conversation so far:"]
+    for turn in history:
+        lines.append(f"User: {turn.question}")
+        lines.append(f"Assistant: {turn.answer}")
+    lines.append("")
+    lines.append(f"Current question: {query}")
+    return "\n".join(lines)
+
+
+@dataclass(slots=True, frozen=True)
+class Turn:
+    """One question and the answer it received.
+
+    Args:
+        question: Text sent by the user.
+        answer: Text returned by the agent.
+        tokens: Estimated prompt tokens the turn adds to later prompts.
+        size: Bytes of text held for the turn.
+    """
+
+    question: str
+    answer: str
+    tokens: int
+    size: int
+
+
+@dataclass(slots=True)
+class ConversationStats:
+    """Counters describing how conversations are bounded.
+
+    Args:
+        evictions: Conversations dropped to respect ``max_sessions`` or ``max_bytes``.
+        expirations: Conversations dropped after ``ttl`` seconds without being used.
+        trimmed_turns: Old turns dropped to respect ``max_turns`` or ``max_tokens``.
+    """
+
+    evictions: int = 0
+    expirations: int = 0
+    trimmed_turns: int = 0
+
+
+@dataclass(slots=True)
+class _Session:
+    expires_at: float
+    turns: deque[Turn] = field(default_factory=deque)
+    tokens: int = 0
+    size: int = 0
+
+
+class ConversationStore:
+    """History of each conversation, bounded per conversation and in total.
+
+    Conversations are kept in least-recently-used order. Every use extends a
+    conversation's lifetime, so expired conversations are always at the front and
+    are removed as new turns arrive.
+
+    Args:
+        settings: Per-conversation and global limits.
+        clock: Monotonic clock used for expiry. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: ConversationSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or ConversationSettings()
+        self.stats = ConversationStats()
+        self.memory_bytes = 0
+        self._clock = clock
+        self._sessions: OrderedDict[str, _Session] = OrderedDict()
+
+    def history(self, session_id: str) -> list[Turn]:
+        """Return the remembered turns of ``session_id``, oldest first."""
+
+        session = self._sessions.get(session_id)
+        if session is None:
+            return []
+        now = self._clock()
+        if session.expires_at < now:
+            self._remove(session_id)
+            self.stats.expirations += 1
+            return []
+        self._touch(session_id, session, now)
+        return list(session.turns)
+
+    def append(self, session_id: str, question: str, answer: str) -> None:
+        """Remember a new turn of ``session_id`` and enforce every limit."""
+
+        now = self._clock()
+        self._expire(now)
+        session = self._sessions.get(session_id)
+        if session is None:
+            session = self._sessions[session_id] = _Session(now)
+        self._touch(session_id, session, now)
+        size = len(question.encode()) + len(answer.encode())
+        turn = Turn(question, answer, estimate_tokens(question) + estimate_tokens(answer), size)
+        session.turns.append(turn)
+        session.tokens += turn.tokens
+        session.size += size
+        self.memory_bytes += size
+        self._trim(session)
+        while len(self._sessions) > self.settings.max_sessions or (
+            self.memory_bytes > self.settings.max_bytes and len(self._sessions) > 1
+        ):
+            self._remove(next(iter(self._sessions)))
+            self.stats.evictions += 1
+
+    def drop(self, session_id: str) -> bool:
+        """Forget ``session_id``, returning whether it existed."""
+
+        if session_id not in self._sessions:
+            return False
+        self._remove(session_id)
+        return True
+
+    def __len__(self) -> int:
+        """Return the number of stored conversations."""
+
+        return len(self._sessions)
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the number of conversations, remembered turns, memory and eviction counters."""
+
+        return {
+            "sessions": len(self._sessions),
+            "turns": sum(len(session.turns) for session in self._sessions.values()),
+            "memory_bytes": self.memory_bytes,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+            "trimmed_turns": self.stats.trimmed_turns,
+        }
+
+    def _touch(self, session_id: str, session: _Session, now: float) -> None:
+        ttl = self.settings.ttl
+        session.expires_at = float("inf") if ttl is None else now + ttl
+        self._sessions.move_to_end(session_id)
+
+    def _trim(self, session: _Session) -> None:
+        settings = self.settings
+        while session.turns and (
+            len(session.turns) > settings.max_turns or session.tokens > settings.max_tokens
+        ):
+            turn = session.turns.popleft()
+            session.tokens -= turn.tokens
+            session.size -= turn.size
+            self.memory_bytes -= turn.size
+            self.stats.trimmed_turns += 1
+
+    def _expire(self, now: float) -> None:
+        while self._sessions:
+            session_id, session = next(iter(self._sessions.items()))
+            if session.expires_at >= now:
+                return
+            self._remove(session_id)
+            self.stats.expirations += 1
+
+    def _remove(self, session_id: str) -> None:
+        session = self._sessions.pop(session_id)
+        self.memory_bytes -= session.size
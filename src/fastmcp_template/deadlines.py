@@ -0,0 +1,126 @@
+"""Caller deadlines and accounting of abandoned agent calls."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections.abc import AsyncIterator, Callable, Mapping
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any
+
+#: Payload argument carrying the seconds the caller is still willing to wait.
+TIMEOUT_ARGUMENT = "timeout"
+
+
+class DeadlineExceededError(TimeoutError):
+    """Raised when an invocation cannot be answered before the caller's deadline."""
+
+
+@dataclass(slots=True)
+class DeadlineStats:
+    """Counters describing deadline enforcement.
+
+    Args:
+        rejected: Invocations refused because they arrived without time left.
+        expired: Invocations aborted because their deadline passed while running.
+        cancelled: Agent calls abandoned before finishing, because the deadline
+            passed or the caller went away.
+        saved_seconds: Estimated agent time not spent on abandoned calls, based on
+            the moving average latency of completed calls.
+    """
+
+    rejected: int = 0
+    expired: int = 0
+    cancelled: int = 0
+    saved_seconds: float = 0.0
+
+
+class DeadlineTracker:
+    """Enforce per-invocation deadlines and account for the agent calls they cut short.
+
+    Args:
+        alpha: Weight of the newest sample in the agent latency moving average.
+        clock: Monotonic clock used to time agent calls. Overridable in tests.
+    """
+
+    def __init__(
+        self, *, alpha: float = 0.2, clock: Callable[[], float] = time.monotonic
+    ) -> None:
+        self.stats = DeadlineStats()
+        self._alpha = alpha
+        self._clock = clock
+        self._latency: float | None = None
+
+    def budget(self, payload: Mapping[str, Any]) -> float | None:
+        """Return the seconds left to answer ``payload``, or ``None`` without a deadline.
+
+        Raises:
+            DeadlineExceededError: When the caller has no time left.
+            ValueError: When the ``timeout`` argument is not a number of seconds.
+        """
+
+        value = payload.get(TIMEOUT_ARGUMENT)
+        if value is None:
+            return None
+        try:
+            budget = float(value)
+        except (TypeError, ValueError):
+            budget = math.nan
+        if math.isnan(budget):
+            raise ValueError(
+                f"The {TIMEOUT_ARGUMENT!r} argument must be a number of seconds, not {value!r}."
+            )
+        if budget <= 0:
+            self.stats.rejected += 1
+            raise DeadlineExceededError("The caller's deadline passed before work started.")
+        return budget
+
+    @asynccontextmanager
+    async def enforce(self, budget: float) -> AsyncIterator[None]:
+        """Cancel the block once ``budget`` seconds have elapsed.
+
+        Raises:
+            DeadlineExceededError: When the block was cancelled by the deadline.
+        """
+
+        scope = asyncio.timeout(budget)
+        try:
+            async with scope:
+                yield
+        except TimeoutError:
+            if not scope.expired():
+                raise
+            self.stats.expired += 1
+            raise DeadlineExceededError(
+                f"The invocation did not finish within its {budget:g}s deadline."
+            ) from None
+
+    @asynccontextmanager
+    async def track_call(self) -> AsyncIterator[None]:
+        """Time an agent call, counting it as abandoned when it is cancelled."""
+
+        started = self._clock()
+        try:
+            yield
+        except asyncio.CancelledError:
+            self.stats.cancelled += 1
+            if self._latency is not None:
+                self.stats.saved_seconds += max(0.0, self._latency - (self._clock() - started))
+            raise
+        latency = self._clock() - started
+        if self._latency is None:
+            self._latency = latency
+        else:
+            self._latency += self._alpha * (latency - self._latency)
+
+    def snapshot(self) -> dict[str, float]:
+        """Return the enforcement counters."""
+
+        return {
+            "rejected": self.stats.rejected,
+            "expired": self.stats.expired,
+            "cancelled": self.stats.cancelled,
+            "saved_seconds": self.stats.saved_seconds,
+        }
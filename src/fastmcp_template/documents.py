@@ -0,0 +1,295 @@
+"""Map-reduce answering of documents too large for a single prompt."""
+
+from __future__ import annotations
+
+import asyncio
+import codecs
+import math
+import mmap
+import os
+from collections.abc import Awaitable, Callable, Iterable, Iterator
+from dataclasses import dataclass
+from pathlib import Path
+
+from .config import DocumentSettings
+
+#: Payload argument carrying the text of a document.
+DOCUMENT_ARGUMENT = "document"
+
+#: Payload argument naming a local file holding the document.
+PATH_ARGUMENT = "path"
+
+#: Characters counted per estimated token, as in :func:`conversations.estimate_tokens`.
+CHARS_PER_TOKEN = 4
+
+_SEPARATORS = ("\n\n", "\n", ". ", " ")
+
+
+def iter_file(path: str | os.PathLike[str], block_size: int = 1024 * 1024) -> Iterator[str]:
+    """Yield the UTF-8 text of ``path`` in blocks of about ``block_size`` bytes.
+
+    The file is memory-mapped, so only the pages being decoded are resident.
+    Characters split across blocks are decoded whole and invalid bytes are
+    replaced.
+    """
+
+    with open(path, "rb") as handle:
+        size = os.fstat(handle.fileno()).st_size
+        if not size:
+            return
+        with mmap.mmap(handle.fileno(), 0, access=mmap.ACCESS_READ) as mapped:
+            if hasattr(mmap, "MADV_SEQUENTIAL"):
+                mapped.madvise(mmap.MADV_SEQUENTIAL)
+            decoder = codecs.getincrementaldecoder("utf-8")(errors="replace")
+            for offset in range(0, size, block_size):
+                yield decoder.decode(mapped[offset : offset + block_size])
+            tail = decoder.decode(b"", final=True)
+            if tail:
+                yield tail
+
+
+def split_chunks(blocks: Iterable[str], chunk_chars: int, overlap_chars: int) -> Iterator[str]:
+    """Split streamed text into chunks of at most ``chunk_chars`` characters.
+
+    Chunks end after a paragraph, line, sentence or word when one falls in their
+    second half, and each chunk repeats the last ``overlap_chars`` characters of
+    the previous one. Only the unfinished chunk and the current block are held.
+    """
+
+    buffer = ""
+    emitted = 0  # leading characters of ``buffer`` already part of a chunk
+    for block in blocks:
+        buffer += block
+        start = 0
+        while len(buffer) - start > chunk_chars:
+            end = _boundary(buffer, start + chunk_chars // 2, start + chunk_chars)
+            yield buffer[start:end]
+            start = end - overlap_chars
+            emitted = overlap_chars
+        buffer = buffer[start:]
+    if len(buffer) > emitted:
+        yield buffer
+
+
+def _boundary(text: str, lowest: int, highest: int) -> int:
+    for separator in _SEPARATORS:
+        index = text.rfind(separator, lowest, highest)
+        if index != -1:
+            return index + len(separator)
+    return highest
+
+
+@dataclass(slots=True)
+class DocumentProgress:
+    """Progress of one document.
+
+    Args:
+        chunks: Chunks read so far.
+        total: Chunks in the document, ``None`` until it has been read entirely.
+        mapped: Chunks answered.
+        reduced: Reduce calls finished.
+    """
+
+    chunks: int = 0
+    total: int | None = None
+    mapped: int = 0
+    reduced: int = 0
+
+
+#: Sends one prompt to the agent and returns its answer.
+Ask = Callable[[str], Awaitable[str]]
+
+#: Receives the progress of a document after every finished agent call.
+ProgressCallback = Callable[[DocumentProgress], Awaitable[None]]
+
+
+class DocumentProcessor:
+    """Answer questions about large documents with a concurrent map and a tree reduce.
+
+    Chunks are read lazily in a worker thread and only ``concurrency`` agent
+    calls run at once, so memory depends on the settings, not on the document
+    size: a new chunk is only read when a call slot is free, and partial answers
+    are reduced as soon as ``fan_in`` consecutive ones are available.
+
+    Args:
+        settings: Chunk size, concurrency, fan-in and prompt templates.
+    """
+
+    def __init__(self, settings: DocumentSettings | None = None) -> None:
+        self.settings = settings or DocumentSettings()
+        self.documents = 0
+        self.active = 0
+        self.chunks = 0
+        self.map_calls = 0
+        self.reduce_calls = 0
+        self._roots = [Path(root).resolve() for root in self.settings.allowed_paths]
+
+    def chunks_of(self, text: str | None = None, path: str | None = None) -> Iterator[str]:
+        """Return the chunks of ``text`` or of the file at ``path``.
+
+        Raises:
+            PermissionError: When ``path`` is outside ``allowed_paths``.
+            ValueError: When neither ``text`` nor ``path`` is given.
+        """
+
+        settings = self.settings
+        if path is not None:
+            blocks: Iterable[str] = iter_file(self._check_path(path), settings.read_size)
+        elif text is not None:
+            blocks = (text,)
+        else:
+            raise ValueError("Provide the document text or a file path.")
+        chunk_chars = settings.chunk_tokens * CHARS_PER_TOKEN
+        return split_chunks(blocks, chunk_chars, settings.overlap_tokens * CHARS_PER_TOKEN)
+
+    async def run(
+        self,
+        question: str,
+        chunks: Iterable[str],
+        ask: Ask,
+        progress: ProgressCallback | None = None,
+    ) -> str:
+        """Answer ``question`` about the document made of ``chunks``."""
+
+        self.documents += 1
+        self.active += 1
+        try:
+            return await _MapReduce(self, question, ask, progress).run(iter(chunks))
+        finally:
+            self.active -= 1
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the documents processed or running and the agent calls they made."""
+
+        return {
+            "documents": self.documents,
+            "active": self.active,
+            "chunks": self.chunks,
+            "map_calls": self.map_calls,
+            "reduce_calls": self.reduce_calls,
+        }
+
+    def _check_path(self, path: str) -> Path:
+        resolved = Path(path).resolve()
+        if not any(resolved.is_relative_to(root) for root in self._roots):
+            raise PermissionError(f"Reading {path!r} is not allowed by DocumentSettings.")
+        return resolved
+
+
+class _MapReduce:
+    """State of one document: pending calls and partial answers per tree level."""
+
+    def __init__(
+        self,
+        processor: DocumentProcessor,
+        question: str,
+        ask: Ask,
+        progress: ProgressCallback | None,
+    ) -> None:
+        self.processor = processor
+        self.settings = processor.settings
+        self.question = question
+        self.ask = ask
+        self.on_progress = progress
+        self.progress = DocumentProgress()
+        self.levels: list[dict[int, str]] = [{}]
+        self.counts: dict[int, int] = {}
+        self.tasks: set[asyncio.Task[tuple[int, int, str]]] = set()
+        self.limit = asyncio.Semaphore(self.settings.concurrency)
+        self.result: str | None = None
+
+    async def run(self, chunks: Iterator[str]) -> str:
+        settings = self.settings
+        window = settings.concurrency * settings.fan_in
+        exhausted = False
+        try:
+            while self.result is None:
+                while (
+                    not exhausted
+                    and len(self.tasks) < settings.concurrency
+                    and len(self.levels[0]) < window
+                ):
+                    # Chunks of a file are decoded from the mapping, off the event loop.
+                    chunk = await asyncio.to_thread(next, chunks, None)
+                    if chunk is None:
+                        exhausted = True
+                        self._finish_reading(self.progress.chunks)
+                        break
+                    prompt = settings.map_prompt.format(question=self.question, chunk=chunk)
+                    self._spawn(0, self.progress.chunks, prompt)
+                    self.progress.chunks += 1
+                    self.processor.chunks += 1
+                if self.result is not None:
+                    break
+                done, self.tasks = await asyncio.wait(
+                    self.tasks, return_when=asyncio.FIRST_COMPLETED
+                )
+                for task in done:
+                    level, index, text = task.result()
+                    if level:
+                        self.progress.reduced += 1
+                    else:
+                        self.progress.mapped += 1
+                    self._place(level, index, text)
+                if self.on_progress is not None:
+                    await self.on_progress(self.progress)
+        finally:
+            for task in self.tasks:
+                task.cancel()
+            await asyncio.gather(*self.tasks, return_exceptions=True)
+        return self.result
+
+    def _spawn(self, level: int, index: int, prompt: str) -> None:
+        if level:
+            self.processor.reduce_calls += 1
+        else:
+            self.processor.map_calls += 1
+        self.tasks.add(asyncio.ensure_future(self._call(level, index, prompt)))
+
+    async def _call(self, level: int, index: int, prompt: str) -> tuple[int, int, str]:
+        async with self.limit:
+            return level, index, await self.ask(prompt)
+
+    def _place(self, level: int, index: int, text: str) -> None:
+        while len(self.levels) <= level:
+            self.levels.append({})
+        self.levels[level][index] = text
+        self._settle(level, index // self.settings.fan_in)
+
+    def _settle(self, level: int, group: int) -> None:
+        """Reduce ``group`` of ``level`` once all of its partial answers are known."""
+
+        store = self.levels[level] if level < len(self.levels) else {}
+        count = self.counts.get(level)
+        if count == 1:
+            if 0 in store:
+                self.result = store.pop(0)
+            return
+        fan_in = self.settings.fan_in
+        first = group * fan_in
+        last = first + fan_in if count is None else min(first + fan_in, count)
+        if first >= last or any(index not in store for index in range(first, last)):
+            return
+        answers = [store.pop(index) for index in range(first, last)]
+        if len(answers) == 1:
+            self._place(level + 1, group, answers[0])
+            return
+        joined = "\n\n".join(f"[{number}] {answer}" for number, answer in enumerate(answers, 1))
+        prompt = self.settings.reduce_prompt.format(question=self.question, answers=joined)
+        self._spawn(level + 1, group, prompt)
+
+    def _finish_reading(self, total: int) -> None:
+        """Record the chunk count and settle the last, possibly partial, group of each level."""
+
+        self.progress.total = total
+        if not total:
+            self.result = ""
+            return
+        level, count = 0, total
+        while True:
+            self.counts[level] = count
+            if count == 1:
+                break
+            level, count = level + 1, math.ceil(count / self.settings.fan_in)
+        for level, count in sorted(self.counts.items()):
+            self._settle(level, (count - 1) // self.settings.fan_in)
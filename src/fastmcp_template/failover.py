@@ -0,0 +1,302 @@
+"""Server selection, circuit breaking and retries across several MCP servers."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Sequence
+from contextlib import asynccontextmanager
+from dataclasses import dataclass
+from typing import Any, TypeVar
+
+from .config import FailoverSettings
+
+T = TypeVar("T")
+
+#: Errors that mark a server as failing and are retried on another server.
+RETRYABLE_ERRORS: tuple[type[BaseException], ...] = (OSError, EOFError, TimeoutError)
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+
+class CircuitOpenError(ConnectionError):
+    """Raised when every candidate server has an open circuit."""
+
+
+@dataclass(slots=True)
+class CircuitStats:
+    """Counters describing a server's circuit breaker.
+
+    Args:
+        requests: Invocations sent to the server.
+        failures: Invocations that failed with a retryable error.
+        opened: Times the circuit opened.
+        rejected: Invocations refused without contacting the server.
+        probes: Invocations let through while half-open.
+    """
+
+    requests: int = 0
+    failures: int = 0
+    opened: int = 0
+    rejected: int = 0
+    probes: int = 0
+
+
+@dataclass(slots=True, frozen=True)
+class Reservation:
+    """Right to send one invocation, handed out by :meth:`CircuitBreaker.acquire`.
+
+    Args:
+        probe: Half-open period the reservation probes, numbered by the times the
+            circuit opened. ``None`` for invocations sent while closed.
+    """
+
+    probe: int | None = None
+
+
+_UNPROBED = Reservation()
+
+
+class CircuitBreaker:
+    """Closed/open/half-open circuit breaker guarding a single server.
+
+    The circuit opens after ``failure_threshold`` consecutive failures. While open
+    it refuses every invocation; after ``reset_timeout`` seconds it lets up to
+    ``half_open_probes`` invocations through, closing again on the first probe
+    that succeeds and reopening on the first failure. Pass the :class:`Reservation` returned by
+    :meth:`acquire` back with the outcome, so only probes of the current half-open
+    period free a probe slot.
+
+    Args:
+        settings: Thresholds of the breaker.
+        clock: Monotonic clock. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: FailoverSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or FailoverSettings()
+        self.stats = CircuitStats()
+        self._clock = clock
+        self._state = CLOSED
+        self._failures = 0
+        self._opened_at = 0.0
+        self._probes = 0
+
+    @property
+    def state(self) -> str:
+        """Current state: ``"closed"``, ``"open"`` or ``"half_open"``."""
+
+        if self._state == OPEN and self._clock() >= self._opened_at + self.settings.reset_timeout:
+            self._state = HALF_OPEN
+        return self._state
+
+    def available(self) -> bool:
+        """Return whether an invocation would currently be let through."""
+
+        state = self.state
+        return state == CLOSED or (
+            state == HALF_OPEN and self._probes < self.settings.half_open_probes
+        )
+
+    def acquire(self) -> Reservation | None:
+        """Reserve the right to send one invocation, returning ``None`` to fail fast."""
+
+        if not self.available():
+            self.stats.rejected += 1
+            return None
+        self.stats.requests += 1
+        if self._state != HALF_OPEN:
+            return _UNPROBED
+        self._probes += 1
+        self.stats.probes += 1
+        return Reservation(self.stats.opened)
+
+    def release(self, reservation: Reservation | None = None) -> None:
+        """Give back a reservation whose invocation ended without an outcome."""
+
+        if reservation is not None and reservation.probe == self.stats.opened and self._probes:
+            self._probes -= 1
+
+    def record_success(self, reservation: Reservation | None = None) -> None:
+        """Count a successful invocation, closing the circuit when it was a probe.
+
+        Only a probe of the current half-open period closes the circuit; a call
+        reserved before the circuit opened just gives its reservation back.
+        """
+
+        probed = reservation is not None and reservation.probe == self.stats.opened
+        self.release(reservation)
+        state = self.state
+        if state == CLOSED:
+            self._failures = 0
+        elif probed and state == HALF_OPEN:
+            self._state = CLOSED
+            self._failures = 0
+            self._probes = 0
+
+    def record_failure(self, reservation: Reservation | None = None) -> None:
+        """Count a failed invocation, opening the circuit when the threshold is hit."""
+
+        self.release(reservation)
+        self.stats.failures += 1
+        self._failures += 1
+        if self._state == HALF_OPEN or self._failures >= self.settings.failure_threshold:
+            if self._state != OPEN:
+                self.stats.opened += 1
+            self._state = OPEN
+            self._opened_at = self._clock()
+            self._probes = 0
+
+
+class ServerSelector:
+    """Pick a server for every invocation and retry failures on other servers.
+
+    Args:
+        urls: Equivalent server URLs.
+        settings: Selection policy, breaker thresholds and retry backoff.
+        clock: Monotonic clock used for latency and breakers. Overridable in tests.
+        rng: Random generator drawing the retry jitter. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        urls: Sequence[str],
+        settings: FailoverSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+        rng: random.Random | None = None,
+    ) -> None:
+        if not urls:
+            raise ValueError("ServerSelector requires at least one server URL.")
+        self.settings = settings or FailoverSettings()
+        self.urls = list(dict.fromkeys(urls))
+        self.breakers = {url: CircuitBreaker(self.settings, clock=clock) for url in self.urls}
+        self.latency: dict[str, float | None] = dict.fromkeys(self.urls)
+        self.retries = 0
+        self.rejected = 0
+        self._clock = clock
+        self._rng = rng or random.Random()
+        self._next = 0
+
+    def select(self, exclude: Sequence[str] = ()) -> str | None:
+        """Return the server for the next invocation, or ``None`` when all circuits are open.
+
+        Servers in ``exclude`` are only chosen when no other server is available.
+        """
+
+        count = len(self.urls)
+        start = self._next
+        self._next = (start + 1) % count
+        rotated = [self.urls[(start + offset) % count] for offset in range(count)]
+        available = [url for url in rotated if self.breakers[url].available()]
+        candidates = [url for url in available if url not in exclude] or available
+        if not candidates:
+            return None
+        if self.settings.policy == "lowest_latency":
+            return min(candidates, key=lambda url: self.latency[url] or 0.0)
+        return candidates[0]
+
+    async def invoke(
+        self, call: Callable[[str], Awaitable[T]], exclude: Sequence[str] = ()
+    ) -> T:
+        """Run ``call`` against a selected server, retrying retryable errors elsewhere.
+
+        Servers in ``exclude``, such as the one a hedged call already waits on, are
+        only chosen when no other server is available.
+
+        Raises:
+            CircuitOpenError: When every server's circuit is open.
+        """
+
+        settings = self.settings
+        tried: list[str] = []
+        while True:
+            url, breaker, reservation = self._reserve([*exclude, *tried])
+            tried.append(url)
+            started = self._clock()
+            try:
+                result = await call(url)
+            except RETRYABLE_ERRORS:
+                breaker.record_failure(reservation)
+                if len(tried) >= settings.max_attempts:
+                    raise
+            except Exception:
+                breaker.record_success(reservation)  # the server answered, with an error
+                raise
+            except BaseException:
+                breaker.release(reservation)
+                raise
+            else:
+                breaker.record_success(reservation)
+                self._observe(url, self._clock() - started)
+                return result
+            self.retries += 1
+            ceiling = min(settings.max_backoff, settings.backoff * 2 ** (len(tried) - 1))
+            await asyncio.sleep(self._rng.uniform(0, ceiling))
+
+    @asynccontextmanager
+    async def attempt(self) -> AsyncIterator[str]:
+        """Reserve a selected server for one call that is not retried, such as a stream.
+
+        The outcome of the ``async with`` block feeds the server's circuit breaker
+        like an :meth:`invoke` attempt. Its duration is not folded into the server
+        latency, since it includes the time the caller spends consuming the result.
+
+        Raises:
+            CircuitOpenError: When every server's circuit is open.
+        """
+
+        url, breaker, reservation = self._reserve(())
+        try:
+            yield url
+        except RETRYABLE_ERRORS:
+            breaker.record_failure(reservation)
+            raise
+        except Exception:
+            breaker.record_success(reservation)
+            raise
+        except BaseException:
+            breaker.release(reservation)
+            raise
+        breaker.record_success(reservation)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return per-server breaker state, counters and latency, plus retry counters."""
+
+        servers = {
+            url: {
+                "state": breaker.state,
+                "requests": breaker.stats.requests,
+                "failures": breaker.stats.failures,
+                "opened": breaker.stats.opened,
+                "rejected": breaker.stats.rejected,
+                "probes": breaker.stats.probes,
+                "latency": self.latency[url],
+            }
+            for url, breaker in self.breakers.items()
+        }
+        return {"retries": self.retries, "rejected": self.rejected, "servers": servers}
+
+    def _reserve(self, exclude: Sequence[str]) -> tuple[str, CircuitBreaker, Reservation]:
+        """Select a server outside ``exclude`` when possible and reserve a call to it."""
+
+        url = self.select(exclude)
+        if url is not None:
+            breaker = self.breakers[url]
+            reservation = breaker.acquire()
+            if reservation is not None:
+                return url, breaker, reservation
+        self.rejected += 1
+        raise CircuitOpenError("Every server's circuit breaker is open.")
+
+    def _observe(self, url: str, latency: float) -> None:
+        previous = self.latency[url]
+        alpha = self.settings.ewma_alpha
+        self.latency[url] = latency if previous is None else previous + alpha * (latency - previous)
@@ -0,0 +1,135 @@
+"""Hedged invocations that duplicate slow calls to cut tail latency."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import Awaitable, Callable
+from dataclasses import dataclass
+from typing import TypeVar
+
+from .config import HedgingSettings
+
+T = TypeVar("T")
+
+
+@dataclass(slots=True)
+class HedgeStats:
+    """Counters describing hedging decisions.
+
+    Args:
+        requests: Invocations run through the hedger.
+        hedged: Invocations that sent a duplicate call.
+        won: Hedged invocations answered by the duplicate first.
+        throttled: Invocations that would have hedged but had no budget left.
+    """
+
+    requests: int = 0
+    hedged: int = 0
+    won: int = 0
+    throttled: int = 0
+
+
+class Hedger:
+    """Run calls, sending a duplicate when the first one is slower than usual.
+
+    Args:
+        settings: Latency quantile, window size and hedge budget.
+        clock: Monotonic clock used to measure latency. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: HedgingSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or HedgingSettings()
+        self.stats = HedgeStats()
+        self._clock = clock
+        self._latencies: deque[float] = deque(maxlen=self.settings.window)
+        self._delay: float | None = None
+        self._stale = False
+        self._budget = self.settings.budget_burst
+
+    def delay(self) -> float | None:
+        """Return the latency after which calls are hedged, ``None`` while warming up."""
+
+        if self._stale:
+            self._stale = False
+            if len(self._latencies) >= self.settings.min_samples:
+                ordered = sorted(self._latencies)
+                rank = min(len(ordered) - 1, int(self.settings.percentile * len(ordered)))
+                self._delay = ordered[rank]
+        return self._delay
+
+    def observe(self, latency: float) -> None:
+        """Record the latency of a completed call."""
+
+        self._latencies.append(latency)
+        self._stale = True
+
+    async def run(
+        self,
+        call: Callable[[], Awaitable[T]],
+        hedge: Callable[[], Awaitable[T]] | None = None,
+    ) -> T:
+        """Return the result of ``call``, hedged with a second call when it is slow.
+
+        The slower call is cancelled, and awaited, as soon as one succeeds. When
+        both fail, the error of the last one to finish is raised.
+
+        Args:
+            call: Coroutine function sending the primary call.
+            hedge: Coroutine function sending the duplicate, for instance to
+                another server. Defaults to ``call``.
+        """
+
+        settings = self.settings
+        self.stats.requests += 1
+        self._budget = min(settings.budget_burst, self._budget + settings.budget_ratio)
+        delay = self.delay()
+        started = self._clock()
+        if delay is None:
+            result = await call()
+            self.observe(self._clock() - started)
+            return result
+
+        primary = asyncio.ensure_future(call())
+        pending: set[asyncio.Future[T]] = {primary}
+        try:
+            done, pending = await asyncio.wait(pending, timeout=delay)
+            if not done:
+                if self._budget >= 1:
+                    self._budget -= 1
+                    self.stats.hedged += 1
+                    pending.add(asyncio.ensure_future((hedge or call)()))
+                else:
+                    self.stats.throttled += 1
+            while True:
+                for task in done:
+                    if task.exception() is None:
+                        if task is not primary:
+                            self.stats.won += 1
+                        self.observe(self._clock() - started)
+                        return task.result()
+                if not pending:
+                    return next(iter(done)).result()
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+        finally:
+            for task in pending:
+                task.cancel()
+            await asyncio.gather(*pending, return_exceptions=True)
+
+    def snapshot(self) -> dict[str, float | int | None]:
+        """Return the hedging counters, the current hedge delay and the budget left."""
+
+        return {
+            "requests": self.stats.requests,
+            "hedged": self.stats.hedged,
+            "won": self.stats.won,
+            "throttled": self.stats.throttled,
+            "delay": self.delay(),
+            "budget": self._budget,
+        }
@@ -2,15 +2,21 @@
 
 from __future__ import annotations
 
-import asyncio
+from collections.abc import AsyncIterator, Sequence
 from dataclasses import dataclass, field
 from importlib import import_module
 from typing import Any
 
+from .conversations import Turn, format_history
+from .runner import get_runner
+
 
 @dataclass(slots=True)
 class Agent:
-    """Thin wrapper around an Ollama language model."""
+    """Thin wrapper around an Ollama language model.
+
+    ``base_url`` selects the Ollama endpoint; ``None`` uses the library default.
+    """
 
     model_id: str = "qwen2.5:1.5b"
     temperature: float = 0.1
@@ -18,6 +24,7 @@ class Agent:
         "You are an AI assistant. Answer the user question precisely and politely.\n"
         "USER QUESTION: {question}"
     )
+    base_url: str | None = None
     _model: Any = field(init=False, repr=False)
     _prompt: Any = field(init=False, repr=False)
     _chain: Any = field(init=False, repr=False)
@@ -28,7 +35,10 @@ class Agent:
         ollama_module = import_module("langchain_ollama.llms")
         chat_prompt_template = getattr(prompts_module, "ChatPromptTemplate")
         ollama_llm = getattr(ollama_module, "OllamaLLM")
-        self._model = ollama_llm(model=self.model_id, temperature=self.temperature)
+        options: dict[str, Any] = {"model": self.model_id, "temperature": self.temperature}
+        if self.base_url is not None:
+            options["base_url"] = self.base_url
+        self._model = ollama_llm(**options)
         self._prompt = chat_prompt_template.from_template(self.system_prompt)
         self._chain = self._prompt | self._model
 
@@ -37,9 +47,26 @@ class Agent:
         result: str = await self._chain.ainvoke({"question": query})
         return {"result": result}
 
+    async def chat_with_history(self, query: str, history: Sequence[Turn]) -> dict[str, str]:
+        """Answer ``query`` as the next turn of a conversation with ``history``."""
+        return await self.chat(format_history(history, query))
+
+    async def chat_batch(self, queries: Sequence[str]) -> list[dict[str, str] | Exception]:
+        """Evaluate several prompts in one batched call, returning failures per item."""
+        inputs = [{"question": query} for query in queries]
+        results = await self._chain.abatch(inputs, return_exceptions=True)
+        return [
+            result if isinstance(result, Exception) else {"result": result} for result in results
+        ]
+
+    async def astream(self, query: str) -> AsyncIterator[str]:
+        """Yield the model answer chunk by chunk as soon as tokens are generated."""
+        async for chunk in self._chain.astream({"question": query}):
+            yield str(chunk)
+
     def chat_sync(self, query: str) -> dict[str, str]:
-        """Synchronously evaluate a prompt."""  # noqa: D401
-        return asyncio.run(self.chat(query))
+        """Synchronously evaluate a prompt on the shared background event loop."""  # noqa: D401
+        return get_runner().run(self.chat(query))
 
     def test(self) -> None:
         """Print the result of a simple sanity-check query."""
@@ -0,0 +1,245 @@
+"""Lightweight metric primitives used to observe the template at runtime."""
+
+from __future__ import annotations
+
+from bisect import bisect_left
+from collections.abc import Iterable, Mapping, Sequence
+from time import perf_counter
+from typing import Any
+
+#: Default latency buckets in seconds, spanning cache hits to long generations.
+LATENCY_BUCKETS: tuple[float, ...] = (
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+    0.05,
+    0.1,
+    0.25,
+    0.5,
+    1.0,
+    2.5,
+    5.0,
+    10.0,
+    30.0,
+    60.0,
+)
+
+#: Default buckets for counts such as batch sizes.
+SIZE_BUCKETS: tuple[float, ...] = (1, 2, 4, 8, 16, 32, 64, 128)
+
+#: Default buckets for response sizes in characters.
+OUTPUT_SIZE_BUCKETS: tuple[float, ...] = (16, 64, 256, 1024, 4096, 16384, 65536, 262144)
+
+#: Stages recorded by the server handler.
+SERVER_STAGES: tuple[str, ...] = ("extract", "acquire", "llm", "first_token", "wrap", "total")
+
+#: Stages recorded by the client.
+CLIENT_STAGES: tuple[str, ...] = ("connect", "call", "extract", "total")
+
+
+class Histogram:
+    """Fixed-bucket histogram whose storage is allocated once at construction.
+
+    Args:
+        bounds: Inclusive upper bounds of the buckets. Observations above the
+            largest bound land in an implicit ``+Inf`` bucket.
+    """
+
+    __slots__ = ("bounds", "counts", "count", "total")
+
+    def __init__(self, bounds: Sequence[float] = LATENCY_BUCKETS) -> None:
+        self.bounds = tuple(sorted(bounds))
+        self.counts = [0] * (len(self.bounds) + 1)
+        self.count = 0
+        self.total = 0.0
+
+    def observe(self, value: float) -> None:
+        """Record a single observation."""
+
+        self.counts[bisect_left(self.bounds, value)] += 1
+        self.count += 1
+        self.total += value
+
+    def quantile(self, q: float) -> float:
+        """Return the upper bound of the bucket containing the ``q`` quantile."""
+
+        if not self.count:
+            return 0.0
+        rank = q * self.count
+        seen = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            seen += bucket
+            if seen >= rank:
+                return bound
+        return float("inf")
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return cumulative bucket counts keyed by their upper bound."""
+
+        buckets: dict[str, int] = {}
+        cumulative = 0
+        for bound, bucket in zip(self.bounds, self.counts):
+            cumulative += bucket
+            buckets[f"{bound:g}"] = cumulative
+        buckets["+Inf"] = self.count
+        return {"buckets": buckets, "count": self.count, "sum": self.total}
+
+
+class MetricsRegistry:
+    """Per-stage latency histograms plus request, error and output-size counters.
+
+    Every histogram is created up front, so recording an observation only updates
+    preallocated counters. Callers measure stages with :meth:`lap`, which records
+    the time elapsed since ``since`` and returns the current timestamp for the
+    next stage.
+
+    Args:
+        prefix: Prefix of every exported Prometheus metric name.
+        stages: Names of the stages that can be observed.
+    """
+
+    def __init__(self, prefix: str, stages: Sequence[str]) -> None:
+        self.prefix = prefix
+        self.stages = {stage: Histogram() for stage in stages}
+        self.output_size = Histogram(OUTPUT_SIZE_BUCKETS)
+        self.requests = 0
+        self.errors: dict[str, int] = {}
+
+    def lap(self, stage: str, since: float) -> float:
+        """Record the time spent in ``stage`` since ``since`` and return the current time."""
+
+        now = perf_counter()
+        self.stages[stage].observe(now - since)
+        return now
+
+    def observe(self, stage: str, seconds: float) -> None:
+        """Record an externally measured stage duration."""
+
+        self.stages[stage].observe(seconds)
+
+    def record_request(self, output_size: int | None = None) -> None:
+        """Count a completed request and, when known, the size of its output."""
+
+        self.requests += 1
+        if output_size is not None:
+            self.output_size.observe(output_size)
+
+    def record_error(self, error: BaseException) -> None:
+        """Count a failed request under the name of its exception type."""
+
+        self.requests += 1
+        name = type(error).__name__
+        self.errors[name] = self.errors.get(name, 0) + 1
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return every metric as plain Python data."""
+
+        return {
+            "requests": self.requests,
+            "errors": dict(self.errors),
+            "output_size": self.output_size.snapshot(),
+            "stages": {stage: hist.snapshot() for stage, hist in self.stages.items()},
+        }
+
+    def render_prometheus(self) -> str:
+        """Render the metrics in the Prometheus text exposition format."""
+
+        prefix = self.prefix
+        lines = [
+            f"# HELP {prefix}_requests_total Requests handled, including failed ones.",
+            f"# TYPE {prefix}_requests_total counter",
+            f"{prefix}_requests_total {self.requests}",
+            f"# HELP {prefix}_errors_total Failed requests by exception type.",
+            f"# TYPE {prefix}_errors_total counter",
+        ]
+        lines += [
+            f'{prefix}_errors_total{{type="{name}"}} {count}'
+            for name, count in sorted(self.errors.items())
+        ]
+        lines += [
+            f"# HELP {prefix}_stage_seconds Latency of each request stage.",
+            f"# TYPE {prefix}_stage_seconds histogram",
+        ]
+        for stage, hist in self.stages.items():
+            lines += _render_histogram(f"{prefix}_stage_seconds", hist, f'stage="{stage}",')
+        lines += [
+            f"# HELP {prefix}_output_chars Size of the returned text in characters.",
+            f"# TYPE {prefix}_output_chars histogram",
+        ]
+        lines += _render_histogram(f"{prefix}_output_chars", self.output_size, "")
+        return "\n".join(lines) + "\n"
+
+
+#: Snapshot keys holding a level, such as an occupancy or a limit, rather than a
+#: count. Merging keeps the highest value, the one of the busiest worker.
+GAUGES = frozenset(
+    {
+        "active",
+        "budget",
+        "bytes",
+        "concurrency",
+        "delay",
+        "idle",
+        "in_flight",
+        "in_use",
+        "keys",
+        "latency",
+        "limit",
+        "memory_bytes",
+        "outstanding",
+        "queued",
+        "running_batches",
+        "sessions",
+        "size",
+        "turns",
+        "waiting",
+    }
+)
+
+#: Ratios recomputed after merging, as ``part / (part + rest)`` of two counters.
+RATIOS: Mapping[str, tuple[str, str]] = {"hit_rate": ("hits", "misses")}
+
+
+def merge_snapshots(snapshots: Iterable[Mapping[str, Any]]) -> dict[str, Any]:
+    """Combine snapshots taken in different processes into one.
+
+    Counters and histogram buckets are summed and nested mappings are merged
+    recursively. :data:`GAUGES` keep their maximum, and :data:`RATIOS` such as
+    ``hit_rate`` are recomputed from the merged counters. Other values are taken
+    from the last snapshot providing them.
+    """
+
+    merged: dict[str, Any] = {}
+    for snapshot in snapshots:
+        for key, value in snapshot.items():
+            current = merged.get(key)
+            if isinstance(value, Mapping):
+                merged[key] = merge_snapshots([current or {}, value])
+            elif _is_number(value) and _is_number(current):
+                merged[key] = max(current, value) if key in GAUGES else current + value
+            elif value is not None or key not in merged:
+                merged[key] = value
+    for key, (part, rest) in RATIOS.items():
+        if key in merged and _is_number(merged.get(part)) and _is_number(merged.get(rest)):
+            total = merged[part] + merged[rest]
+            merged[key] = merged[part] / total if total else 0.0
+    return merged
+
+
+def _is_number(value: Any) -> bool:
+    return isinstance(value, int | float) and not isinstance(value, bool)
+
+
+def _render_histogram(name: str, hist: Histogram, labels: str) -> list[str]:
+    snapshot = hist.snapshot()
+    lines = [
+        f'{name}_bucket{{{labels}le="{bound}"}} {count}'
+        for bound, count in snapshot["buckets"].items()
+    ]
+    selector = f"{{{labels.rstrip(',')}}}" if labels else ""
+    lines.append(f"{name}_sum{selector} {snapshot['sum']:.9g}")
+    lines.append(f"{name}_count{selector} {snapshot['count']}")
+    return lines
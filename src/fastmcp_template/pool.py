@@ -0,0 +1,190 @@
+"""Bounded pool of reusable agents shared by concurrent tool invocations."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import TYPE_CHECKING, Any
+
+from .config import AgentPoolSettings
+
+if TYPE_CHECKING:
+    from .llm import Agent
+
+AgentKey = tuple[Any, ...]
+
+AGENT_CONFIG_FIELDS = ("model_id", "temperature", "system_prompt")
+
+
+def agent_key(**overrides: Any) -> AgentKey:
+    """Return the pool key identifying an agent configuration.
+
+    Fields that are not overridden are ``None`` and resolve to the factory defaults.
+    """
+
+    unknown = set(overrides) - set(AGENT_CONFIG_FIELDS)
+    if unknown:
+        raise ValueError(
+            f"Unsupported agent overrides {sorted(unknown)}. Pooled agents can only be "
+            f"keyed by {', '.join(AGENT_CONFIG_FIELDS)}."
+        )
+    return tuple(overrides.get(name) for name in AGENT_CONFIG_FIELDS)
+
+
+@dataclass(slots=True)
+class _Slot:
+    """Agents and waiters belonging to a single configuration key."""
+
+    idle: deque[tuple[Agent, float]] = field(default_factory=deque)
+    waiters: deque[asyncio.Future[Agent]] = field(default_factory=deque)
+    size: int = 0
+
+
+@dataclass(slots=True)
+class PoolStats:
+    """Counters describing how the pool served agent requests.
+
+    Args:
+        hits: Requests served by an idle agent.
+        creations: Agents built by the factory.
+        waits: Requests that had to wait because the pool was exhausted.
+        evictions: Idle agents dropped after exceeding the idle timeout.
+    """
+
+    hits: int = 0
+    creations: int = 0
+    waits: int = 0
+    evictions: int = 0
+
+
+class AgentPool:
+    """Keyed pool that hands out agents built by ``factory``.
+
+    Each distinct ``(model_id, temperature, system_prompt)`` override combination
+    gets its own bounded set of agents. The pool is meant to be used from a single
+    event loop; no ``await`` happens between checking and taking an agent, so
+    concurrent coroutines never receive the same instance.
+
+    Args:
+        factory: Callable building an agent. Overrides are passed as keyword
+            arguments, so the factory only needs to accept them when keyed
+            acquisition is used.
+        settings: Pool bounds and eviction behaviour.
+        clock: Monotonic clock used for idle bookkeeping. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        factory: Callable[..., Agent],
+        settings: AgentPoolSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.factory = factory
+        self.settings = settings or AgentPoolSettings()
+        self.stats = PoolStats()
+        self._clock = clock
+        self._slots: dict[AgentKey, _Slot] = {}
+
+    @asynccontextmanager
+    async def lease(self, **overrides: Any) -> AsyncIterator[Agent]:
+        """Borrow an agent for the duration of the ``async with`` block."""
+
+        key = agent_key(**overrides)
+        agent = await self._acquire(key, overrides)
+        try:
+            yield agent
+        finally:
+            self._release(key, agent)
+
+    def prewarm(self, size: int | None = None, **overrides: Any) -> int:
+        """Create idle agents until ``size`` exist and return how many were built.
+
+        Args:
+            size: Agents the key should hold, capped at ``max_size``. Defaults to
+                ``min_size``.
+            **overrides: Agent configuration selecting the key.
+        """
+
+        target = min(self.settings.min_size if size is None else size, self.settings.max_size)
+        key = agent_key(**overrides)
+        slot = self._slot(key)
+        created = 0
+        while slot.size < target:
+            slot.idle.append((self._create(slot, overrides), self._clock()))
+            created += 1
+        return created
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the pool counters together with the current occupancy."""
+
+        idle = sum(len(slot.idle) for slot in self._slots.values())
+        size = sum(slot.size for slot in self._slots.values())
+        return {
+            "hits": self.stats.hits,
+            "creations": self.stats.creations,
+            "waits": self.stats.waits,
+            "evictions": self.stats.evictions,
+            "idle": idle,
+            "in_use": size - idle,
+            "waiting": sum(len(slot.waiters) for slot in self._slots.values()),
+            "keys": len(self._slots),
+        }
+
+    async def _acquire(self, key: AgentKey, overrides: dict[str, Any]) -> Agent:
+        slot = self._slot(key)
+        self._evict_idle(slot)
+        if slot.idle:
+            agent, _ = slot.idle.pop()
+            self.stats.hits += 1
+            return agent
+        if slot.size < self.settings.max_size:
+            return self._create(slot, overrides)
+
+        self.stats.waits += 1
+        waiter: asyncio.Future[Agent] = asyncio.get_running_loop().create_future()
+        slot.waiters.append(waiter)
+        try:
+            return await waiter
+        except asyncio.CancelledError:
+            with suppress(ValueError):
+                slot.waiters.remove(waiter)
+            if waiter.done() and not waiter.cancelled():
+                # The agent was handed over right before the cancellation landed.
+                self._release(key, waiter.result())
+            raise
+
+    def _release(self, key: AgentKey, agent: Agent) -> None:
+        slot = self._slot(key)
+        while slot.waiters:
+            waiter = slot.waiters.popleft()
+            if not waiter.done():
+                waiter.set_result(agent)
+                return
+        slot.idle.append((agent, self._clock()))
+
+    def _create(self, slot: _Slot, overrides: dict[str, Any]) -> Agent:
+        agent = self.factory(**overrides)
+        slot.size += 1
+        self.stats.creations += 1
+        return agent
+
+    def _evict_idle(self, slot: _Slot) -> None:
+        timeout = self.settings.idle_timeout
+        if timeout is None:
+            return
+        cutoff = self._clock() - timeout
+        while slot.idle and slot.size > self.settings.min_size and slot.idle[0][1] < cutoff:
+            slot.idle.popleft()
+            slot.size -= 1
+            self.stats.evictions += 1
+
+    def _slot(self, key: AgentKey) -> _Slot:
+        slot = self._slots.get(key)
+        if slot is None:
+            slot = self._slots[key] = _Slot()
+        return slot
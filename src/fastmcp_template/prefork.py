@@ -0,0 +1,258 @@
+"""Pre-fork launcher serving one application from several worker processes."""
+
+from __future__ import annotations
+
+import json
+import multiprocessing
+import os
+import shutil
+import signal
+import socket
+import tempfile
+import threading
+import time
+from collections.abc import Callable
+from importlib import import_module
+from multiprocessing.connection import wait
+from multiprocessing.process import BaseProcess
+from pathlib import Path
+from types import FrameType
+from typing import TYPE_CHECKING, Any
+
+from .config import WorkerSettings
+from .metrics import merge_snapshots
+
+if TYPE_CHECKING:
+    from .server import MCPServerBuilder
+
+#: Runs a built application on the shared listening socket until the worker stops.
+Serve = Callable[[Any, socket.socket], None]
+
+
+def serve_http(app: Any, sock: socket.socket) -> None:
+    """Serve the FastMCP application's HTTP transport on ``sock`` with uvicorn."""
+
+    http_app = getattr(app, "http_app", None)
+    if http_app is None:
+        raise RuntimeError(
+            "The FastMCP application does not expose http_app(); pass a serve callable "
+            "to PreforkServer instead."
+        )
+    uvicorn = import_module("uvicorn")
+    uvicorn.Server(uvicorn.Config(http_app())).run(sockets=[sock])
+
+
+class PreforkServer:
+    """Supervisor running several worker processes that accept on one shared socket.
+
+    The listening socket is bound once by the supervisor and inherited by every
+    forked worker, so the kernel spreads incoming connections across them. Each
+    worker calls ``builder_factory`` after the fork and builds its own application,
+    agents, caches and metrics; workers share nothing but the socket. Workers that
+    exit unexpectedly are replaced, :meth:`reload` replaces all of them without
+    closing the socket, and :meth:`metrics` merges the ``MCPServerBuilder.stats()``
+    snapshots that workers publish every ``metrics_interval`` seconds. A worker's
+    snapshot is taken on its serving loop and written to disk by a background
+    thread.
+
+    Workers are started with ``fork``, which is available on Linux and macOS.
+
+    Args:
+        builder_factory: Returns a fresh :class:`MCPServerBuilder`. Called once in
+            every worker.
+        settings: Worker count, listening address and restart parameters.
+        serve: Runs the built application on the shared socket. Defaults to
+            :func:`serve_http`.
+        metrics_dir: Directory where workers publish their snapshots. Defaults to
+            a temporary directory removed by :meth:`stop`.
+    """
+
+    def __init__(
+        self,
+        builder_factory: Callable[[], MCPServerBuilder],
+        settings: WorkerSettings | None = None,
+        *,
+        serve: Serve = serve_http,
+        metrics_dir: Path | None = None,
+    ) -> None:
+        self.builder_factory = builder_factory
+        self.settings = settings or WorkerSettings()
+        self.socket: socket.socket | None = None
+        self.restarts = 0
+        self._serve = serve
+        self._metrics_dir = metrics_dir
+        self._owns_metrics_dir = metrics_dir is None
+        self._context = multiprocessing.get_context("fork")
+        self._workers: dict[int, BaseProcess] = {}
+        self._stopping = False
+        self._reload_requested = False
+
+    @property
+    def worker_count(self) -> int:
+        """Number of workers kept running."""
+
+        return self.settings.workers or os.cpu_count() or 1
+
+    @property
+    def pids(self) -> list[int]:
+        """Process identifiers of the current workers."""
+
+        return list(self._workers)
+
+    @property
+    def address(self) -> tuple[str, int]:
+        """Host and port the shared socket is bound to."""
+
+        if self.socket is None:
+            raise RuntimeError("PreforkServer has not been started.")
+        host, port = self.socket.getsockname()[:2]
+        return host, port
+
+    def start(self) -> None:
+        """Bind the shared socket and start the workers."""
+
+        if self.socket is None:
+            self.socket = socket.create_server(
+                (self.settings.host, self.settings.port), backlog=self.settings.backlog
+            )
+        if self._metrics_dir is None:
+            self._metrics_dir = Path(tempfile.mkdtemp(prefix="fastmcp-workers-"))
+        self._stopping = False
+        while len(self._workers) < self.worker_count:
+            self._spawn()
+
+    def poll(self) -> None:
+        """Reap workers that exited and replace them unless the server is stopping."""
+
+        for pid, process in list(self._workers.items()):
+            if process.is_alive():
+                continue
+            process.join()
+            del self._workers[pid]
+            self._snapshot_path(pid).unlink(missing_ok=True)
+            if not self._stopping:
+                self.restarts += 1
+                time.sleep(self.settings.restart_delay)
+                self._spawn()
+
+    def reload(self) -> None:
+        """Replace every worker, starting the new ones before stopping the old ones."""
+
+        old = self._workers
+        self._workers = {}
+        while len(self._workers) < self.worker_count:
+            self._spawn()
+        self._terminate(old)
+
+    def stop(self) -> None:
+        """Stop every worker gracefully and close the shared socket."""
+
+        self._stopping = True
+        self._terminate(self._workers)
+        self._workers = {}
+        if self.socket is not None:
+            self.socket.close()
+            self.socket = None
+        if self._owns_metrics_dir and self._metrics_dir is not None:
+            shutil.rmtree(self._metrics_dir, ignore_errors=True)
+            self._metrics_dir = None
+
+    def run(self) -> None:
+        """Serve until SIGINT or SIGTERM; SIGHUP gracefully reloads the workers."""
+
+        signal.signal(signal.SIGINT, self._request_stop)
+        signal.signal(signal.SIGTERM, self._request_stop)
+        signal.signal(signal.SIGHUP, self._request_reload)
+        self.start()
+        try:
+            while not self._stopping:
+                if self._reload_requested:
+                    self._reload_requested = False
+                    self.reload()
+                self.poll()
+                wait([process.sentinel for process in self._workers.values()], timeout=1.0)
+        finally:
+            self.stop()
+
+    def metrics(self) -> dict[str, Any]:
+        """Return the stats of every live worker merged into one snapshot."""
+
+        snapshots: list[dict[str, Any]] = []
+        for pid in self._workers:
+            try:
+                snapshots.append(json.loads(self._snapshot_path(pid).read_text("utf-8")))
+            except (FileNotFoundError, json.JSONDecodeError):
+                continue
+        merged = merge_snapshots(snapshots)
+        merged["workers"] = len(snapshots)
+        return merged
+
+    def _spawn(self) -> None:
+        process = self._context.Process(target=self._work, name="fastmcp-worker")
+        process.start()
+        assert process.pid is not None
+        self._workers[process.pid] = process
+
+    def _terminate(self, workers: dict[int, BaseProcess]) -> None:
+        for process in workers.values():
+            process.terminate()
+        deadline = time.monotonic() + self.settings.graceful_timeout
+        for pid, process in workers.items():
+            process.join(max(0.0, deadline - time.monotonic()))
+            if process.is_alive():
+                process.kill()
+                process.join()
+            self._snapshot_path(pid).unlink(missing_ok=True)
+
+    def _work(self) -> None:
+        """Worker entry point, running in the forked process."""
+
+        signal.signal(signal.SIGTERM, _exit_worker)
+        signal.signal(signal.SIGINT, signal.SIG_IGN)
+        signal.signal(signal.SIGHUP, signal.SIG_IGN)
+        builder = self.builder_factory()
+        app = builder.build()
+        path = self._snapshot_path(os.getpid())
+        stopped = threading.Event()
+
+        def publish() -> None:
+            interval = self.settings.metrics_interval
+            while not stopped.wait(interval):
+                try:
+                    stats = builder.stats_threadsafe(timeout=max(interval, 1.0))
+                except TimeoutError:  # the loop is busy or stopping; retry next time
+                    continue
+                _write_snapshot(path, stats)
+
+        publisher = threading.Thread(target=publish, name="fastmcp-metrics", daemon=True)
+        publisher.start()
+        assert self.socket is not None
+        try:
+            self._serve(app, self.socket)
+        finally:
+            stopped.set()
+            # Both write the same temporary file, so the publisher must be done first.
+            publisher.join()
+            _write_snapshot(path, builder.stats())
+
+    def _snapshot_path(self, pid: int) -> Path:
+        assert self._metrics_dir is not None
+        return self._metrics_dir / f"worker-{pid}.json"
+
+    def _request_stop(self, signum: int, frame: FrameType | None) -> None:
+        self._stopping = True
+
+    def _request_reload(self, signum: int, frame: FrameType | None) -> None:
+        self._reload_requested = True
+
+
+def _exit_worker(signum: int, frame: FrameType | None) -> None:
+    raise SystemExit(0)
+
+
+def _write_snapshot(path: Path, stats: dict[str, Any]) -> None:
+    """Atomically replace ``path`` with a worker's stats."""
+
+    temporary = path.with_suffix(".tmp")
+    temporary.write_text(json.dumps(stats), encoding="utf-8")
+    os.replace(temporary, path)
@@ -0,0 +1,227 @@
+"""Agent that spreads calls across several backend agents or endpoints."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping, Sequence
+from contextlib import suppress
+from dataclasses import dataclass
+from typing import Any
+
+from .config import RoutingSettings
+from .llm import Agent
+from .runner import get_runner
+
+
+@dataclass(slots=True)
+class BackendStats:
+    """Counters and health state of a single backend.
+
+    Args:
+        requests: Calls routed to the backend, including failed ones.
+        failures: Calls that raised an exception.
+        consecutive_failures: Failures since the last successful call.
+        ejections: Times the backend was taken out of rotation.
+        outstanding: Calls currently in flight.
+        latency: Exponentially weighted moving average of successful call
+            latency in seconds, ``None`` until the first success.
+        ejected_until: Clock value until which the backend is skipped.
+    """
+
+    requests: int = 0
+    failures: int = 0
+    consecutive_failures: int = 0
+    ejections: int = 0
+    outstanding: int = 0
+    latency: float | None = None
+    ejected_until: float = 0.0
+
+
+class RoutingAgent:
+    """Agent-compatible facade routing every call to one of several backends.
+
+    Backends are any objects exposing the agent ``chat`` coroutine, such as
+    :class:`~fastmcp_template.llm.Agent` instances pointing at different Ollama
+    endpoints or models. Each call goes to the healthy backend with the fewest
+    calls in flight, or with the lowest latency when ``strategy="ewma"``; ties are
+    broken round-robin. Health checks are passive: a backend failing
+    ``failure_threshold`` calls in a row is skipped for ``ejection_time`` seconds,
+    after which one successful call restores it and one more failure ejects it
+    again. When every backend is ejected, the one due back soonest is still tried.
+
+    Args:
+        backends: Backend agents, optionally keyed by a name used in the stats.
+        settings: Balancing strategy and health-check parameters.
+        clock: Monotonic clock used for latency and ejection. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        backends: Mapping[str, Any] | Sequence[Any],
+        settings: RoutingSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        if isinstance(backends, Mapping):
+            named = dict(backends)
+        else:
+            named = {f"backend-{index}": backend for index, backend in enumerate(backends)}
+        if not named:
+            raise ValueError("RoutingAgent requires at least one backend.")
+        self.settings = settings or RoutingSettings()
+        self.backends = named
+        self.stats = {name: BackendStats() for name in named}
+        self._clock = clock
+        self._names = list(named)
+        self._next = 0
+
+    @classmethod
+    def from_endpoints(
+        cls,
+        endpoints: Sequence[str],
+        settings: RoutingSettings | None = None,
+        **agent_options: Any,
+    ) -> RoutingAgent:
+        """Build one :class:`Agent` per Ollama endpoint URL, sharing ``agent_options``."""
+
+        return cls(
+            {url: Agent(base_url=url, **agent_options) for url in endpoints}, settings
+        )
+
+    @property
+    def model_id(self) -> Any:
+        """Model of the first backend, used to key caches and pools."""
+        return getattr(self._first, "model_id", None)
+
+    @property
+    def temperature(self) -> Any:
+        """Temperature of the first backend."""
+        return getattr(self._first, "temperature", None)
+
+    @property
+    def system_prompt(self) -> Any:
+        """System prompt of the first backend."""
+        return getattr(self._first, "system_prompt", None)
+
+    @property
+    def _first(self) -> Any:
+        return self.backends[self._names[0]]
+
+    async def chat(self, query: str) -> dict[str, str]:
+        """Answer ``query`` on the selected backend, failing over on errors."""
+
+        tried: set[str] = set()
+        attempts = min(self.settings.max_attempts, len(self._names))
+        for _ in range(attempts - 1):
+            name = self._select(tried)
+            tried.add(name)
+            with suppress(Exception):
+                return await self._timed(name, self.backends[name].chat(query))
+        name = self._select(tried)
+        return await self._timed(name, self.backends[name].chat(query))
+
+    async def chat_batch(self, queries: Sequence[str]) -> list[dict[str, str] | Exception]:
+        """Route every prompt independently, returning failures per item."""
+
+        return await asyncio.gather(  # type: ignore[return-value]
+            *(self.chat(query) for query in queries), return_exceptions=True
+        )
+
+    async def astream(self, query: str) -> AsyncIterator[str]:
+        """Stream the answer from the selected backend.
+
+        Streams are not failed over once started, but failures still count towards
+        the backend's health.
+        """
+
+        name = self._select(set())
+        backend = self.backends[name]
+        astream = getattr(backend, "astream", None)
+        if astream is None:
+            response = await self._timed(name, backend.chat(query))
+            yield response["result"]
+            return
+        stats = self.stats[name]
+        stats.requests += 1
+        stats.outstanding += 1
+        started = self._clock()
+        try:
+            async for chunk in astream(query):
+                yield chunk
+        except Exception:
+            self._record_failure(stats)
+            raise
+        else:
+            self._record_success(stats, self._clock() - started)
+        finally:
+            stats.outstanding -= 1
+
+    def chat_sync(self, query: str) -> dict[str, str]:
+        """Evaluate a prompt on the shared background event loop and wait for the answer."""
+        return get_runner().run(self.chat(query))
+
+    def snapshot(self) -> dict[str, dict[str, Any]]:
+        """Return the counters and health of every backend keyed by name."""
+
+        now = self._clock()
+        return {
+            name: {
+                "healthy": stats.ejected_until <= now,
+                "outstanding": stats.outstanding,
+                "requests": stats.requests,
+                "failures": stats.failures,
+                "ejections": stats.ejections,
+                "latency": stats.latency,
+            }
+            for name, stats in self.stats.items()
+        }
+
+    def _select(self, exclude: set[str]) -> str:
+        """Return the name of the backend that should serve the next call."""
+
+        count = len(self._names)
+        start = self._next
+        self._next = (start + 1) % count
+        rotated = [self._names[(start + offset) % count] for offset in range(count)]
+        candidates = [name for name in rotated if name not in exclude] or rotated
+        now = self._clock()
+        healthy = [name for name in candidates if self.stats[name].ejected_until <= now]
+        if not healthy:
+            return min(candidates, key=lambda name: self.stats[name].ejected_until)
+        if self.settings.strategy == "ewma":
+            return min(healthy, key=self._expected_latency)
+        return min(healthy, key=lambda name: self.stats[name].outstanding)
+
+    def _expected_latency(self, name: str) -> float:
+        stats = self.stats[name]
+        return (stats.latency or 0.0) * (stats.outstanding + 1)
+
+    async def _timed(self, name: str, call: Awaitable[dict[str, str]]) -> dict[str, str]:
+        stats = self.stats[name]
+        stats.requests += 1
+        stats.outstanding += 1
+        started = self._clock()
+        try:
+            response = await call
+        except Exception:
+            self._record_failure(stats)
+            raise
+        finally:
+            stats.outstanding -= 1
+        self._record_success(stats, self._clock() - started)
+        return response
+
+    def _record_success(self, stats: BackendStats, latency: float) -> None:
+        alpha = self.settings.ewma_alpha
+        stats.consecutive_failures = 0
+        stats.latency = (
+            latency if stats.latency is None else alpha * latency + (1 - alpha) * stats.latency
+        )
+
+    def _record_failure(self, stats: BackendStats) -> None:
+        stats.failures += 1
+        stats.consecutive_failures += 1
+        if stats.consecutive_failures >= self.settings.failure_threshold:
+            stats.ejected_until = self._clock() + self.settings.ejection_time
+            stats.ejections += 1
@@ -0,0 +1,138 @@
+"""Persistent background event loop backing the synchronous convenience APIs."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import threading
+from collections.abc import Coroutine, Iterable
+from typing import Any, TypeVar
+
+T = TypeVar("T")
+
+
+class LoopRunner:
+    """Event loop running in a daemon thread that synchronous code submits work to.
+
+    Unlike :func:`asyncio.run`, the loop survives between calls, so loop-bound state
+    such as persistent client sessions, pools and locks keeps working across
+    synchronous invocations. Submitting is thread-safe and works even when the
+    calling thread already runs its own event loop.
+
+    Args:
+        name: Name of the background thread.
+    """
+
+    def __init__(self, name: str = "fastmcp-template-loop") -> None:
+        self.name = name
+        self._loop: asyncio.AbstractEventLoop | None = None
+        self._thread: threading.Thread | None = None
+        self._lock = threading.Lock()
+
+    @property
+    def running(self) -> bool:
+        """Return whether the background loop is currently running."""
+
+        return self._thread is not None and self._thread.is_alive()
+
+    def run(self, coro: Coroutine[Any, Any, T], timeout: float | None = None) -> T:
+        """Run ``coro`` on the background loop and block until it finishes.
+
+        Raises:
+            RuntimeError: When called from the background loop itself, which would
+                deadlock.
+            TimeoutError: When ``timeout`` elapses first. The coroutine is cancelled.
+        """
+
+        loop = self._ensure_loop()
+        if threading.current_thread() is self._thread:
+            coro.close()
+            raise RuntimeError(
+                "LoopRunner.run() cannot be called from the runner's own event loop; "
+                "await the coroutine instead."
+            )
+        future = asyncio.run_coroutine_threadsafe(coro, loop)
+        try:
+            return future.result(timeout)
+        except TimeoutError:
+            future.cancel()
+            raise
+
+    def run_all(
+        self, coros: Iterable[Coroutine[Any, Any, T]], timeout: float | None = None
+    ) -> list[T | BaseException]:
+        """Run ``coros`` concurrently on the background loop and return their outcomes in order.
+
+        Exceptions are returned in place of results instead of being raised.
+        """
+
+        async def gather() -> list[T | BaseException]:
+            return await asyncio.gather(*coros, return_exceptions=True)
+
+        return self.run(gather(), timeout)
+
+    def stop(self, timeout: float | None = 5.0) -> None:
+        """Cancel outstanding tasks, stop the loop and join the background thread."""
+
+        with self._lock:
+            loop, thread = self._loop, self._thread
+            self._loop = self._thread = None
+        if loop is None or thread is None or not thread.is_alive():
+            return
+        if threading.current_thread() is thread:
+            loop.call_soon(loop.stop)
+            return
+        try:
+            asyncio.run_coroutine_threadsafe(_cancel_pending(), loop).result(timeout)
+        finally:
+            loop.call_soon_threadsafe(loop.stop)
+            thread.join(timeout)
+
+    def _ensure_loop(self) -> asyncio.AbstractEventLoop:
+        with self._lock:
+            if self._loop is None or not self.running:
+                loop = asyncio.new_event_loop()
+                started = threading.Event()
+                thread = threading.Thread(
+                    target=_serve, args=(loop, started), name=self.name, daemon=True
+                )
+                thread.start()
+                started.wait()
+                self._loop, self._thread = loop, thread
+            return self._loop
+
+
+def _serve(loop: asyncio.AbstractEventLoop, started: threading.Event) -> None:
+    asyncio.set_event_loop(loop)
+    loop.call_soon(started.set)
+    try:
+        loop.run_forever()
+    finally:
+        loop.run_until_complete(loop.shutdown_asyncgens())
+        loop.close()
+
+
+async def _cancel_pending() -> None:
+    current = asyncio.current_task()
+    tasks = [task for task in asyncio.all_tasks() if task is not current]
+    for task in tasks:
+        task.cancel()
+    await asyncio.gather(*tasks, return_exceptions=True)
+
+
+_default_runner: LoopRunner | None = None
+_default_lock = threading.Lock()
+
+
+def get_runner() -> LoopRunner:
+    """Return the process-wide runner used by ``invoke_sync`` and ``chat_sync``.
+
+    The runner is created on first use and stopped automatically at interpreter exit.
+    """
+
+    global _default_runner
+    with _default_lock:
+        if _default_runner is None:
+            _default_runner = LoopRunner()
+            atexit.register(_default_runner.stop)
+        return _default_runner
@@ -0,0 +1,271 @@
+"""Weighted fair scheduling of agent calls across tenants."""
+
+from __future__ import annotations
+
+import asyncio
+import math
+import time
+from collections import OrderedDict, deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from .admission import OverloadedError
+from .config import SchedulerSettings, TenantPolicy
+from .metrics import Histogram
+
+
+class RateLimitedError(OverloadedError):
+    """Raised when a tenant starts invocations faster than its rate limit allows."""
+
+
+@dataclass(slots=True)
+class TenantStats:
+    """Counters describing the scheduling of one tenant.
+
+    Args:
+        admitted: Invocations that obtained a slot.
+        rejected: Invocations shed immediately because the tenant's queue was full.
+        rate_limited: Invocations refused by the tenant's rate limit.
+        timed_out: Invocations shed after waiting longer than ``max_queue_time``.
+        wait: Seconds admitted invocations waited for their slot.
+    """
+
+    admitted: int = 0
+    rejected: int = 0
+    rate_limited: int = 0
+    timed_out: int = 0
+    wait: Histogram = field(default_factory=Histogram)
+
+
+@dataclass(slots=True)
+class _Waiter:
+    future: asyncio.Future[None]
+    start: float
+    finish: float
+    enqueued_at: float
+
+
+@dataclass(slots=True)
+class _Tenant:
+    policy: TenantPolicy
+    tokens: float
+    refilled_at: float
+    stats: TenantStats = field(default_factory=TenantStats)
+    waiters: deque[_Waiter] = field(default_factory=deque)
+    finish: float = 0.0
+
+
+class FairScheduler:
+    """Concurrency limiter serving per-tenant queues in weighted fair order.
+
+    Every invocation is tagged with a virtual finish time, ``1 / weight`` after
+    the later of the scheduler's virtual time and the tenant's previous tag. When a
+    slot frees up it goes to the waiting invocation with the smallest tag among
+    the tenants of the highest priority, so backlogged tenants share the slots in
+    proportion to their weights and an idle tenant cannot bank credit.
+
+    Tenant names come from clients, so at most ``max_tenants`` of them are tracked:
+    the least recently seen tenant with no queued call and a full rate limit
+    bucket is forgotten to make room, and new tenants share the default tenant's
+    state while none can be. One of the ``max_tenants`` entries is kept for the
+    default tenant, so the fallback never grows the map past the bound.
+
+    Args:
+        settings: Concurrency, tenant policies and queue bounds.
+        clock: Monotonic clock used for rate limits and wait times. Overridable in
+            tests.
+    """
+
+    def __init__(
+        self,
+        settings: SchedulerSettings | None = None,
+        *,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or SchedulerSettings()
+        self.in_flight = 0
+        self._clock = clock
+        self.evictions = 0
+        self._tenants: OrderedDict[str, _Tenant] = OrderedDict()
+        self._queued = 0
+        self._virtual_time = 0.0
+
+    @property
+    def queued(self) -> int:
+        """Number of invocations waiting for a slot across all tenants."""
+
+        return self._queued
+
+    def stats(self, tenant: str) -> TenantStats:
+        """Return the counters of ``tenant``."""
+
+        return self._tenant(tenant).stats
+
+    @asynccontextmanager
+    async def slot(self, tenant: str) -> AsyncIterator[None]:
+        """Hold a slot on behalf of ``tenant`` for the duration of the block.
+
+        Raises:
+            RateLimitedError: When the tenant exceeded its rate limit.
+            OverloadedError: When the tenant's queue is full or the invocation
+                waited longer than ``max_queue_time``.
+        """
+
+        await self._acquire(self._tenant(tenant))
+        try:
+            yield
+        finally:
+            self._release()
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the occupancy and, per tenant, the queue depth, counters and wait times."""
+
+        return {
+            "concurrency": self.settings.concurrency,
+            "in_flight": self.in_flight,
+            "queued": self._queued,
+            "evictions": self.evictions,
+            "tenants": {
+                name: {
+                    "queued": len(state.waiters),
+                    "admitted": state.stats.admitted,
+                    "rejected": state.stats.rejected,
+                    "rate_limited": state.stats.rate_limited,
+                    "timed_out": state.stats.timed_out,
+                    "wait": state.stats.wait.snapshot(),
+                }
+                for name, state in self._tenants.items()
+            },
+        }
+
+    def _tenant(self, name: str) -> _Tenant:
+        tenants = self._tenants
+        state = tenants.get(name)
+        if state is not None:
+            tenants.move_to_end(name)
+            return state
+        default = self.settings.default_tenant
+        # One entry is kept free for the default tenant, where new tenants go
+        # while no tenant can be forgotten.
+        room = self.settings.max_tenants - (name != default and default not in tenants)
+        if len(tenants) >= room and not self._evict_idle_tenant():
+            name = default
+            state = tenants.get(name)
+            if state is not None:
+                tenants.move_to_end(name)
+                return state
+        policy = self.settings.tenants.get(name, self.settings.default_policy)
+        state = _Tenant(policy, _burst(policy), self._clock())
+        tenants[name] = state
+        return state
+
+    def _evict_idle_tenant(self) -> bool:
+        """Forget the least recently seen idle tenant, returning whether one was found.
+
+        A tenant is idle when none of its calls is queued and its rate limit bucket
+        is full, so forgetting it neither drops waiters nor grants extra calls.
+        """
+
+        now = self._clock()
+        for name, state in self._tenants.items():
+            if not state.waiters and _refilled(state, now):
+                del self._tenants[name]
+                self.evictions += 1
+                return True
+        return False
+
+    async def _acquire(self, state: _Tenant) -> None:
+        now = self._clock()
+        if not self._take_token(state, now):
+            state.stats.rate_limited += 1
+            raise RateLimitedError(
+                f"Tenant rate limit of {state.policy.rate:g} calls per second exceeded. "
+                "Retry later."
+            )
+        if self.in_flight < self.settings.concurrency and not self._queued:
+            start, _ = self._tag(state)
+            self._virtual_time = max(self._virtual_time, start)
+            self.in_flight += 1
+            state.stats.admitted += 1
+            state.stats.wait.observe(0.0)
+            return
+        if len(state.waiters) >= self.settings.max_queue:
+            state.stats.rejected += 1
+            raise OverloadedError(
+                f"Server overloaded: {len(state.waiters)} calls of this tenant are "
+                "already queued. Retry later."
+            )
+
+        start, finish = self._tag(state)
+        waiter = _Waiter(asyncio.get_running_loop().create_future(), start, finish, now)
+        state.waiters.append(waiter)
+        self._queued += 1
+        try:
+            await asyncio.wait_for(waiter.future, self.settings.max_queue_time)
+        except (TimeoutError, asyncio.CancelledError) as exc:
+            with suppress(ValueError):
+                state.waiters.remove(waiter)
+                self._queued -= 1
+            if waiter.future.done() and not waiter.future.cancelled():
+                # The slot was handed over right before the timeout or cancellation.
+                self._release()
+            if isinstance(exc, asyncio.CancelledError):
+                raise
+            state.stats.timed_out += 1
+            raise OverloadedError(
+                f"Server overloaded: no slot became free within "
+                f"{self.settings.max_queue_time:g}s. Retry later."
+            ) from None
+        state.stats.admitted += 1
+        state.stats.wait.observe(self._clock() - waiter.enqueued_at)
+
+    def _release(self) -> None:
+        self.in_flight -= 1
+        while self._queued and self.in_flight < self.settings.concurrency:
+            state = min(
+                (state for state in self._tenants.values() if state.waiters),
+                key=lambda state: (-state.policy.priority, state.waiters[0].finish),
+            )
+            waiter = state.waiters.popleft()
+            self._queued -= 1
+            if not waiter.future.done():
+                self._virtual_time = max(self._virtual_time, waiter.start)
+                self.in_flight += 1
+                waiter.future.set_result(None)
+
+    def _tag(self, state: _Tenant) -> tuple[float, float]:
+        """Assign the next virtual start and finish times of ``state``."""
+
+        start = max(self._virtual_time, state.finish)
+        state.finish = start + 1.0 / state.policy.weight
+        return start, state.finish
+
+    @staticmethod
+    def _take_token(state: _Tenant, now: float) -> bool:
+        rate = state.policy.rate
+        if rate is None:
+            return True
+        elapsed = now - state.refilled_at
+        state.tokens = min(_burst(state.policy), state.tokens + elapsed * rate)
+        state.refilled_at = now
+        if state.tokens < 1:
+            return False
+        state.tokens -= 1
+        return True
+
+
+def _refilled(state: _Tenant, now: float) -> bool:
+    """Return whether the rate limit bucket of ``state`` is full at ``now``."""
+
+    rate = state.policy.rate
+    if rate is None:
+        return True
+    return state.tokens + (now - state.refilled_at) * rate >= _burst(state.policy)
+
+
+def _burst(policy: TenantPolicy) -> float:
+    if policy.burst is not None:
+        return policy.burst
+    return float(math.ceil(policy.rate)) if policy.rate is not None else 0.0
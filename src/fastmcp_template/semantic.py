@@ -0,0 +1,355 @@
+"""Response cache matching prompts by the similarity of their embeddings."""
+
+from __future__ import annotations
+
+import re
+import time
+import zlib
+from collections.abc import Callable, Sequence
+from importlib import import_module
+from typing import Any, Protocol
+
+from .cache import CacheStats, normalize_query
+from .config import SemanticCacheSettings
+from .metrics import Histogram
+from .pool import AGENT_CONFIG_FIELDS
+
+#: Lookup latency buckets in seconds, well below the latency of an agent call.
+LOOKUP_BUCKETS: tuple[float, ...] = (
+    0.00001,
+    0.000025,
+    0.00005,
+    0.0001,
+    0.00025,
+    0.0005,
+    0.001,
+    0.0025,
+    0.005,
+    0.01,
+    0.025,
+)
+
+_WORD = re.compile(r"\w+")
+_NUMBER = re.compile(r"\d+")
+
+
+def _numpy() -> Any:
+    try:
+        return import_module("numpy")
+    except ImportError as exc:
+        raise ImportError(
+            "The semantic cache requires NumPy. Install it with "
+            "`pip install fastmcp-template[semantic]`."
+        ) from exc
+
+
+class Embedder(Protocol):
+    """Turns texts into vectors whose dot products measure their similarity."""
+
+    def __call__(self, texts: Sequence[str]) -> Any:  # pragma: no cover - protocol definition
+        """Return a 2-D array holding one L2-normalised row per text."""
+
+
+class HashingEmbedder:
+    """Embed texts by hashing their words, word pairs and character trigrams.
+
+    Needs no model or vocabulary: features are hashed into ``dimensions`` signed
+    buckets, so prompts sharing most of their words land close together while
+    rewording, casing and whitespace changes cost little similarity.
+
+    Args:
+        dimensions: Length of the produced vectors.
+    """
+
+    def __init__(self, dimensions: int = 1024) -> None:
+        self.dimensions = dimensions
+        self._np = _numpy()
+
+    def __call__(self, texts: Sequence[str]) -> Any:
+        """Return the normalised ``float32`` embeddings of ``texts``, one row each."""
+
+        np = self._np
+        rows: list[int] = []
+        columns: list[int] = []
+        signs: list[float] = []
+        for row, text in enumerate(texts):
+            for feature in _features(text):
+                digest = zlib.crc32(feature.encode())
+                rows.append(row)
+                columns.append(digest % self.dimensions)
+                signs.append(1.0 if digest & 0x80000000 else -1.0)
+        matrix = np.zeros((len(texts), self.dimensions), dtype=np.float32)
+        np.add.at(matrix, (rows, columns), signs)
+        norms = np.linalg.norm(matrix, axis=1, keepdims=True)
+        return matrix / np.maximum(norms, 1e-12)
+
+
+def _features(text: str) -> list[str]:
+    words = _WORD.findall(text.lower())
+    features = list(words)
+    features += [f"{first} {second}" for first, second in zip(words, words[1:])]
+    for word in words:
+        padded = f"#{word}#"
+        features += [padded[index : index + 3] for index in range(len(padded) - 2)]
+    return features
+
+
+def _numbers_of(text: str) -> int:
+    """Return a hash of the numbers in ``text``, equal for prompts with the same numbers."""
+
+    return hash(tuple(_NUMBER.findall(text)))
+
+
+class SemanticCache:
+    """Cache answering a prompt with the response to the most similar cached prompt.
+
+    Embeddings of cached prompts are rows of one preallocated matrix, so a lookup
+    is a single matrix product against every entry. Expired and evicted entries
+    leave holes that are compacted away when the matrix is full or mostly holes.
+
+    Entries are partitioned by agent signature and by an optional ``scope``, such
+    as the tenant, and with ``match_numbers`` a prompt only matches cached prompts
+    containing the same numbers.
+
+    Args:
+        settings: Similarity threshold, size, TTL and temperature limits.
+        embedder: Embeds prompts. Defaults to :class:`HashingEmbedder`.
+        clock: Monotonic clock used for expiry. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: SemanticCacheSettings | None = None,
+        *,
+        embedder: Embedder | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.settings = settings or SemanticCacheSettings()
+        self.stats = CacheStats()
+        self.compactions = 0
+        self.lookup_latency = Histogram(LOOKUP_BUCKETS)
+        self._np = np = _numpy()
+        self._embedder = embedder or HashingEmbedder(self.settings.dimensions)
+        self._clock = clock
+        capacity = self.settings.max_entries
+        self._vectors: Any = None  # allocated once the embedding size is known
+        self._keys: list[tuple[str, int] | None] = [None] * capacity
+        self._values: list[str | None] = [None] * capacity
+        self._signatures = np.full(capacity, -1, dtype=np.int64)
+        self._numbers = np.zeros(capacity, dtype=np.int64)
+        self._expires = np.zeros(capacity, dtype=np.float64)
+        self._used = np.zeros(capacity, dtype=np.int64)
+        self._rows: dict[tuple[str, int], int] = {}
+        self._signature_ids: dict[tuple[tuple[Any, ...], str | None], int] = {}
+        self._partitions: dict[int, tuple[tuple[Any, ...], str | None]] = {}
+        self._partition_sizes: dict[int, int] = {}
+        self._next_signature_id = 0
+        self._size = 0  # rows holding an entry or a hole
+        self._tick = 0
+
+    def accepts(self, signature: tuple[Any, ...]) -> bool:
+        """Return whether responses of an agent with ``signature`` may be cached."""
+
+        limit = self.settings.max_temperature
+        temperature = signature[AGENT_CONFIG_FIELDS.index("temperature")]
+        return limit is None or temperature is None or temperature <= limit
+
+    def embed(self, queries: Sequence[str]) -> Any:
+        """Return the embeddings of ``queries``, to be reused by :meth:`get` and :meth:`put`."""
+
+        return self._embedder(queries)
+
+    def get(
+        self,
+        query: str,
+        signature: tuple[Any, ...],
+        *,
+        scope: str | None = None,
+        vector: Any = None,
+    ) -> str | None:
+        """Return the response cached for a prompt similar to ``query``, or ``None``.
+
+        Args:
+            query: Prompt to answer.
+            signature: Signature of the answering agent.
+            scope: Partition of the cache to search, such as the tenant.
+            vector: Embedding of ``query`` from :meth:`embed`, computed when omitted.
+        """
+
+        vectors = None if vector is None else vector[None, :]
+        return self.get_many([query], signature, scope=scope, vectors=vectors)[0]
+
+    def get_many(
+        self,
+        queries: Sequence[str],
+        signature: tuple[Any, ...],
+        *,
+        scope: str | None = None,
+        vectors: Any = None,
+    ) -> list[str | None]:
+        """Look up several prompts answered by an agent with ``signature`` at once."""
+
+        started = time.perf_counter()
+        results: list[str | None] = [None] * len(queries)
+        signature_id = self._signature_ids.get((signature, scope))
+        if signature_id is not None and self._rows and queries:
+            np = self._np
+            size = self._size
+            valid = self._signatures[:size] == signature_id
+            if self.settings.ttl is not None:
+                expired = valid & (self._expires[:size] < self._clock())
+                if expired.any():
+                    self._drop(np.flatnonzero(expired).tolist())
+                    self.stats.expirations += int(expired.sum())
+                    valid &= ~expired
+            if valid.any():
+                if vectors is None:
+                    vectors = self._embedder(queries)
+                scores = vectors @ self._vectors[:size].T
+                scores[:, ~valid] = -np.inf
+                if self.settings.match_numbers:
+                    numbers = np.array([_numbers_of(query) for query in queries])
+                    scores[numbers[:, None] != self._numbers[None, :size]] = -np.inf
+                best = scores.argmax(axis=1)
+                best_scores = scores[np.arange(len(queries)), best]
+                for index, (row, score) in enumerate(zip(best.tolist(), best_scores.tolist())):
+                    if score >= self.settings.threshold:
+                        self._tick += 1
+                        self._used[row] = self._tick
+                        results[index] = self._values[row]
+            if self._size - len(self._rows) > self._size // 2:
+                self.compact()
+        hits = sum(result is not None for result in results)
+        self.stats.hits += hits
+        self.stats.misses += len(results) - hits
+        self.lookup_latency.observe(time.perf_counter() - started)
+        return results
+
+    def put(
+        self,
+        query: str,
+        signature: tuple[Any, ...],
+        value: str,
+        *,
+        scope: str | None = None,
+        vector: Any = None,
+    ) -> None:
+        """Cache ``value`` as the response to ``query``, replacing an identical prompt.
+
+        ``scope`` and ``vector`` are as in :meth:`get`.
+        """
+
+        np = self._np
+        if vector is None:
+            vector = self._embedder([query])[0]
+        normalized = normalize_query(query)
+        signature_id = self._signature_ids.get((signature, scope))
+        row = None if signature_id is None else self._rows.get((normalized, signature_id))
+        if row is None or signature_id is None:
+            if self._size == self.settings.max_entries:
+                self._make_room()
+            # Making room may have emptied and forgotten the partition.
+            signature_id = self._partition_id(signature, scope)
+            self._partition_sizes[signature_id] += 1
+            row = self._size
+            self._size += 1
+            self._rows[(normalized, signature_id)] = row
+        key = (normalized, signature_id)
+        if self._vectors is None:
+            self._vectors = np.zeros((self.settings.max_entries, len(vector)), dtype=np.float32)
+        ttl = self.settings.ttl
+        self._tick += 1
+        self._vectors[row] = vector
+        self._keys[row] = key
+        self._values[row] = value
+        self._signatures[row] = signature_id
+        self._numbers[row] = _numbers_of(query)
+        self._expires[row] = float("inf") if ttl is None else self._clock() + ttl
+        self._used[row] = self._tick
+
+    def compact(self) -> None:
+        """Move the remaining entries to the front of the matrix, removing the holes."""
+
+        np = self._np
+        size = self._size
+        keep = np.flatnonzero(self._signatures[:size] >= 0)
+        count = len(keep)
+        arrays = (self._vectors, self._signatures, self._numbers, self._expires, self._used)
+        for array in arrays:
+            if array is not None:
+                array[:count] = array[keep]
+        rows = keep.tolist()
+        self._keys[:size] = [self._keys[row] for row in rows] + [None] * (size - count)
+        self._values[:size] = [self._values[row] for row in rows] + [None] * (size - count)
+        self._signatures[count:size] = -1
+        self._rows = {key: row for row, key in enumerate(self._keys[:count]) if key is not None}
+        self._size = count
+        self.compactions += 1
+
+    def clear(self) -> None:
+        """Drop every cached response."""
+
+        self._drop([row for row in range(self._size) if self._keys[row] is not None])
+        self.compact()
+
+    def __len__(self) -> int:
+        """Return the number of cached responses, including expired ones not yet purged."""
+
+        return len(self._rows)
+
+    def snapshot(self) -> dict[str, Any]:
+        """Return the cache counters, size, hit rate and lookup latency."""
+
+        lookups = self.stats.hits + self.stats.misses
+        return {
+            "hits": self.stats.hits,
+            "misses": self.stats.misses,
+            "hit_rate": self.stats.hits / lookups if lookups else 0.0,
+            "evictions": self.stats.evictions,
+            "expirations": self.stats.expirations,
+            "compactions": self.compactions,
+            "size": len(self._rows),
+            "lookup_seconds": self.lookup_latency.snapshot(),
+        }
+
+    def _make_room(self) -> None:
+        """Compact away holes, evicting the least recently used entries if still full."""
+
+        if len(self._rows) == self._size:
+            count = max(1, int(self.settings.max_entries * self.settings.evict_fraction))
+            oldest = self._np.argsort(self._used[: self._size])[:count]
+            self._drop(oldest.tolist())
+            self.stats.evictions += len(oldest)
+        self.compact()
+
+    def _partition_id(self, signature: tuple[Any, ...], scope: str | None) -> int:
+        """Return the id of a partition, allocating one for a new partition."""
+
+        partition = (signature, scope)
+        signature_id = self._signature_ids.get(partition)
+        if signature_id is None:
+            signature_id = self._next_signature_id
+            self._next_signature_id += 1
+            self._signature_ids[partition] = signature_id
+            self._partitions[signature_id] = partition
+            self._partition_sizes[signature_id] = 0
+        return signature_id
+
+    def _drop(self, rows: list[int]) -> None:
+        """Empty ``rows``, forgetting partitions left without entries.
+
+        Scopes come from clients, so ids of empty partitions are not kept around.
+        """
+
+        for row in rows:
+            key = self._keys[row]
+            if key is not None:
+                del self._rows[key]
+                signature_id = key[1]
+                self._partition_sizes[signature_id] -= 1
+                if not self._partition_sizes[signature_id]:
+                    del self._partition_sizes[signature_id]
+                    del self._signature_ids[self._partitions.pop(signature_id)]
+            self._keys[row] = None
+            self._values[row] = None
+            self._signatures[row] = -1
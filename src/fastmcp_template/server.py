@@ -2,13 +2,39 @@
 
 from __future__ import annotations
 
+import asyncio
+import concurrent.futures
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Awaitable, Callable, Mapping, Sequence
+from contextlib import asynccontextmanager
 from dataclasses import dataclass, field
 from importlib import import_module
 from types import ModuleType
-from typing import Any, Callable, Protocol
+from typing import TYPE_CHECKING, Any, Protocol
 
+from .admission import AdmissionController
+from .batching import MicroBatcher
+from .cache import ResponseCache, agent_signature, normalize_query
+from .capture import TrafficRecorder, collect_agent_calls, record_agent_call
+from .coalesce import SingleFlight
 from .config import ServerSettings
-from .llm import Agent
+from .conversations import SESSION_ARGUMENT, ConversationStore, Turn, format_history
+from .deadlines import DeadlineTracker
+from .documents import DOCUMENT_ARGUMENT, PATH_ARGUMENT, DocumentProcessor, DocumentProgress
+from .metrics import SERVER_STAGES, MetricsRegistry
+from .pool import AgentPool
+from .runner import get_runner
+from .scheduling import FairScheduler
+from .semantic import Embedder, SemanticCache
+from .streaming import StreamStats, measure_stream
+from .tracing import TRACE_ARGUMENT, SpanExporter, Tracer, record_span, span
+
+if TYPE_CHECKING:
+    from .llm import Agent
+
+#: Payload argument requesting a streamed response.
+STREAM_ARGUMENT = "stream"
 
 
 class _AsyncToolHandler(Protocol):
@@ -30,14 +56,267 @@ class MCPServerBuilder:
             :class:`ServerSettings`.
         fastmcp_module: Optional FastMCP module. Primarily useful during testing
             where the real library may not be installed yet.
+        span_exporter: Receives the finished traces when ``ServerSettings.tracing``
+            is set, shared with tools added with :meth:`add_tool`. Defaults to a
+            :class:`JsonlExporter` writing to ``TracingSettings.path``.
+        embedder: Embeds prompts for ``ServerSettings.semantic_cache``, shared with
+            tools added with :meth:`add_tool`. Defaults to a
+            :class:`HashingEmbedder`.
+
+    Invocations passing ``stream=True`` are answered with the agent's streaming
+    API. Every generated chunk is sent to the caller as the message of an MCP
+    progress notification, and the whole answer is returned as the tool result.
+    The timing of the most recent streams is kept in :attr:`recent_stream_stats`.
+    With ``ServerSettings(enforce_deadlines=True)``, invocations passing ``timeout``
+    are refused once it is spent and the agent call is cancelled when it runs out.
+    With ``ServerSettings.scheduler``, agent calls are queued per tenant, named by
+    the ``tenant`` argument or the ``x-tenant-id`` HTTP header, and started in
+    weighted fair order. With ``ServerSettings.documents``, invocations passing a
+    ``document`` text or a file ``path`` are answered by map-reduce over chunks of
+    the document, reporting progress to MCP clients that request it. With
+    ``ServerSettings.tracing``, every invocation continues the client's trace,
+    received as the ``traceparent`` argument or header, with a span per stage.
+    With ``ServerSettings.capture``, a sampled share of invocations is logged with
+    their arrival time, latency and answer size for offline replay.
+
+    Further tools registered with :meth:`add_tool` are served by the same
+    application but keep their own agent factory, settings and components, so a
+    saturated tool cannot consume the capacity of the others.
     """
 
     agent_factory: Callable[[], Agent]
     settings: ServerSettings = field(default_factory=ServerSettings)
     fastmcp_module: ModuleType | None = None
+    span_exporter: SpanExporter | None = None
+    embedder: Embedder | None = None
+    recent_stream_stats: deque[StreamStats] = field(
+        default_factory=lambda: deque(maxlen=256), init=False, repr=False
+    )
+    warmup_timings: dict[str, float] = field(default_factory=dict, init=False, repr=False)
+    tools: dict[str, MCPServerBuilder] = field(default_factory=dict, init=False, repr=False)
+    _agent_pool: AgentPool | None = field(default=None, init=False, repr=False)
+    _response_cache: ResponseCache | None = field(default=None, init=False, repr=False)
+    _semantic_cache: SemanticCache | None = field(default=None, init=False, repr=False)
+    _agent_signature: tuple[Any, ...] | None = field(default=None, init=False, repr=False)
+    _single_flight: SingleFlight | None = field(default=None, init=False, repr=False)
+    _batcher: MicroBatcher | None = field(default=None, init=False, repr=False)
+    _admission: AdmissionController | None = field(default=None, init=False, repr=False)
+    _metrics: MetricsRegistry | None = field(default=None, init=False, repr=False)
+    _deadlines: DeadlineTracker | None = field(default=None, init=False, repr=False)
+    _conversations: ConversationStore | None = field(default=None, init=False, repr=False)
+    _scheduler: FairScheduler | None = field(default=None, init=False, repr=False)
+    _documents: DocumentProcessor | None = field(default=None, init=False, repr=False)
+    _tracer: Tracer | None = field(default=None, init=False, repr=False)
+    _recorder: TrafficRecorder | None = field(default=None, init=False, repr=False)
+    _loop: asyncio.AbstractEventLoop | None = field(default=None, init=False, repr=False)
+
+    @property
+    def agent_pool(self) -> AgentPool | None:
+        """Return the agent pool, creating it on first access when configured."""
+
+        if self._agent_pool is None and self.settings.agent_pool is not None:
+            self._agent_pool = AgentPool(self.agent_factory, self.settings.agent_pool)
+        return self._agent_pool
+
+    @property
+    def response_cache(self) -> ResponseCache | None:
+        """Return the response cache, creating it on first access when configured."""
+
+        if self._response_cache is None and self.settings.response_cache is not None:
+            self._response_cache = ResponseCache(self.settings.response_cache)
+        return self._response_cache
+
+    @property
+    def semantic_cache(self) -> SemanticCache | None:
+        """Return the semantic cache, creating it on first access when configured."""
+
+        if self._semantic_cache is None and self.settings.semantic_cache is not None:
+            self._semantic_cache = SemanticCache(
+                self.settings.semantic_cache, embedder=self.embedder
+            )
+        return self._semantic_cache
+
+    @property
+    def single_flight(self) -> SingleFlight | None:
+        """Return the request coalescer when ``coalesce_requests`` is enabled."""
+
+        if self._single_flight is None and self.settings.coalesce_requests:
+            self._single_flight = SingleFlight()
+        return self._single_flight
+
+    @property
+    def batcher(self) -> MicroBatcher | None:
+        """Return the micro-batcher, creating it on first access when configured."""
+
+        if self._batcher is None and self.settings.batching is not None:
+            self._batcher = MicroBatcher(self._run_agent_batch, self.settings.batching)
+        return self._batcher
+
+    @property
+    def admission(self) -> AdmissionController | None:
+        """Return the admission controller, creating it on first access when configured."""
+
+        if self._admission is None and self.settings.admission is not None:
+            self._admission = AdmissionController(self.settings.admission)
+        return self._admission
+
+    @property
+    def deadlines(self) -> DeadlineTracker | None:
+        """Return the deadline tracker when deadlines or a tool timeout are enabled."""
+
+        enabled = self.settings.enforce_deadlines or self.settings.tool_timeout is not None
+        if self._deadlines is None and enabled:
+            self._deadlines = DeadlineTracker()
+        return self._deadlines
+
+    @property
+    def conversations(self) -> ConversationStore | None:
+        """Return the conversation store, creating it on first access when configured."""
+
+        if self._conversations is None and self.settings.conversations is not None:
+            self._conversations = ConversationStore(self.settings.conversations)
+        return self._conversations
+
+    @property
+    def scheduler(self) -> FairScheduler | None:
+        """Return the tenant scheduler, creating it on first access when configured."""
+
+        if self._scheduler is None and self.settings.scheduler is not None:
+            self._scheduler = FairScheduler(self.settings.scheduler)
+        return self._scheduler
+
+    @property
+    def documents(self) -> DocumentProcessor | None:
+        """Return the document processor, creating it on first access when configured."""
+
+        if self._documents is None and self.settings.documents is not None:
+            self._documents = DocumentProcessor(self.settings.documents)
+        return self._documents
+
+    @property
+    def tracer(self) -> Tracer | None:
+        """Return the tracer, creating it on first access when configured."""
+
+        if self._tracer is None and self.settings.tracing is not None:
+            self._tracer = Tracer(self.settings.tracing, exporter=self.span_exporter)
+        return self._tracer
+
+    @property
+    def recorder(self) -> TrafficRecorder | None:
+        """Return the traffic recorder, creating it on first access when configured."""
+
+        if self._recorder is None and self.settings.capture is not None:
+            self._recorder = TrafficRecorder(self.settings.capture)
+        return self._recorder
+
+    @property
+    def metrics(self) -> MetricsRegistry | None:
+        """Return the metrics registry when ``ServerSettings.metrics`` is enabled."""
+
+        if self._metrics is None and self.settings.metrics:
+            self._metrics = MetricsRegistry("fastmcp_server", SERVER_STAGES)
+        return self._metrics
+
+    def add_tool(
+        self, agent_factory: Callable[[], Agent], settings: ServerSettings
+    ) -> MCPServerBuilder:
+        """Register another tool named ``settings.tool_name`` with its own agent factory.
+
+        The tool gets its own agent pool, cache, admission controller and metrics
+        as configured in ``settings``. Bound its concurrency and queue with
+        ``AdmissionSettings(initial_limit=..., max_queue=..., target_latency=None)``
+        and its running time with ``tool_timeout``. Server-wide fields such as
+        ``server_name`` are taken from this builder's settings.
+
+        Returns:
+            The builder serving the tool, useful to inspect its components.
+
+        Raises:
+            ValueError: When a tool with the same name is already registered.
+        """
+
+        name = settings.tool_name
+        if name == self.settings.tool_name or name in self.tools:
+            raise ValueError(f"A tool named {name!r} is already registered.")
+        builder = MCPServerBuilder(
+            agent_factory,
+            settings,
+            self.fastmcp_module,
+            span_exporter=self.span_exporter,
+            embedder=self.embedder,
+        )
+        self.tools[name] = builder
+        return builder
+
+    def stats(self) -> dict[str, Any]:
+        """Return a snapshot of every enabled component, keyed by component name.
+
+        Stats of tools registered with :meth:`add_tool` are nested under ``tools``,
+        keyed by tool name.
+        """
+
+        components: dict[str, Any] = {
+            "agent_pool": self._agent_pool,
+            "response_cache": self._response_cache,
+            "semantic_cache": self._semantic_cache,
+            "single_flight": self._single_flight,
+            "batcher": self._batcher,
+            "admission": self._admission,
+            "metrics": self._metrics,
+            "deadlines": self._deadlines,
+            "conversations": self._conversations,
+            "scheduler": self._scheduler,
+            "documents": self._documents,
+            "tracing": self._tracer,
+            "capture": self._recorder,
+        }
+        stats = {
+            name: component.snapshot()
+            for name, component in components.items()
+            if component is not None
+        }
+        if self.tools:
+            stats["tools"] = {name: builder.stats() for name, builder in self.tools.items()}
+        return stats
+
+    def stats_threadsafe(self, timeout: float | None = None) -> dict[str, Any]:
+        """Return :meth:`stats` taken on the event loop serving the tools.
+
+        For other threads, such as a metrics publisher: components are only read
+        on the loop that updates them. Before the first invocation, or once that
+        loop is closed, nothing updates them and they are read directly. Must not
+        be called from the serving loop itself.
+
+        Raises:
+            TimeoutError: When the loop does not run the snapshot within ``timeout``.
+        """
+
+        loop = next(
+            (
+                builder._loop
+                for builder in (self, *self.tools.values())
+                if builder._loop is not None and not builder._loop.is_closed()
+            ),
+            None,
+        )
+        if loop is None:
+            return self.stats()
+        future: concurrent.futures.Future[dict[str, Any]] = concurrent.futures.Future()
+
+        def take() -> None:
+            try:
+                future.set_result(self.stats())
+            except BaseException as exc:
+                future.set_exception(exc)
+
+        try:
+            loop.call_soon_threadsafe(take)
+        except RuntimeError:  # the loop closed in the meantime
+            return self.stats()
+        return future.result(timeout)
 
     def build(self) -> Any:
-        """Instantiate a FastMCP server configured with the provided agent."""
+        """Instantiate a FastMCP server exposing the primary tool and every added tool."""
 
         fastmcp = self.fastmcp_module or import_module("fastmcp")
         fastmcp_app = fastmcp.FastMCP(  # type: ignore[attr-defined]
@@ -45,29 +324,512 @@ class MCPServerBuilder:
             instructions=self.settings.instructions,
             metadata=dict(self.settings.metadata),
         )
-        tool = fastmcp.Tool(  # type: ignore[attr-defined]
-            name=self.settings.tool_name,
-            description=self.settings.tool_description,
-            handler=self._build_handler(fastmcp),
-        )
-        fastmcp_app.register_tool(tool)  # type: ignore[attr-defined]
+        for builder in (self, *self.tools.values()):
+            tool = fastmcp.Tool(  # type: ignore[attr-defined]
+                name=builder.settings.tool_name,
+                description=builder.settings.tool_description,
+                handler=builder._build_handler(fastmcp),
+            )
+            fastmcp_app.register_tool(tool)  # type: ignore[attr-defined]
+            builder._prepare()
         return fastmcp_app
 
+    def _prepare(self) -> None:
+        """Prewarm the agent pool and warm up the agent when configured."""
+
+        pool = self.agent_pool
+        if pool is not None and pool.settings.prewarm:
+            pool.prewarm()
+        if self.settings.warmup:
+            self.warmup()
+
+    def warmup(self) -> dict[str, float]:
+        """Run :meth:`awarmup` on the shared background loop and wait for it to finish."""
+
+        return get_runner().run(self.awarmup())
+
+    async def awarmup(self) -> dict[str, float]:
+        """Build an agent and send the probe prompt, returning the time spent per step.
+
+        The probed agent is discarded rather than pooled: its model client is bound
+        to the loop running the probe, which is not the loop serving requests when
+        warm-up runs from :meth:`warmup`. With an agent pool, fresh unused agents
+        are prewarmed instead so the first invocation does not build one. Either
+        way, the one-off import and model client initialisation costs are paid up
+        front.
+        """
+
+        timings: dict[str, float] = {}
+        started = time.perf_counter()
+        agent = self.agent_factory()
+        timings["agent"] = time.perf_counter() - started
+        self._agent_signature = agent_signature(agent)
+        if self.settings.warmup_prompt:
+            probe_started = time.perf_counter()
+            await agent.chat(self.settings.warmup_prompt)
+            timings["probe"] = time.perf_counter() - probe_started
+        pool = self.agent_pool
+        if pool is not None:
+            pool.prewarm(max(pool.settings.min_size, 1))
+        timings["total"] = time.perf_counter() - started
+        self.warmup_timings = timings
+        return timings
+
     def _build_handler(self, fastmcp: ModuleType) -> _AsyncToolHandler:
         """Create the coroutine used by FastMCP to process tool invocations."""
 
         async def _handler(**payload: Any) -> Any:
-            query = self._extract_query(payload)
-            agent = self.agent_factory()
-            response = await agent.chat(query)
-            result_text = response["result"]
-            response_message = getattr(fastmcp, "ResponseMessage", None)
-            if response_message is None:
-                return {"role": "assistant", "content": result_text}
-            return response_message(role="assistant", content=result_text)
+            loop = self._loop
+            if loop is None or loop.is_closed():
+                self._loop = asyncio.get_running_loop()
+            recorder = self.recorder
+            if recorder is None or not recorder.sample():
+                return await self._serve(fastmcp, payload)
+            return await self._capture(recorder, fastmcp, payload)
 
         return _handler
 
+    def _serve(self, fastmcp: ModuleType, payload: dict[str, Any]) -> Awaitable[Any]:
+        """Return the coroutine answering an invocation, skipping the disabled wrappers."""
+
+        if self.tracer is not None:
+            return self._trace(fastmcp, payload)
+        if self.metrics is not None:
+            return self._measure(fastmcp, payload)
+        return self._respond(fastmcp, payload)
+
+    async def _capture(
+        self, recorder: TrafficRecorder, fastmcp: ModuleType, payload: dict[str, Any]
+    ) -> Any:
+        """Answer a tool invocation and append it to the capture log."""
+
+        captured = dict(payload)
+        arrived = recorder.now()
+        started = time.perf_counter()
+        tool = self.settings.tool_name
+        with collect_agent_calls() as calls:
+            try:
+                response = await self._serve(fastmcp, payload)
+            except Exception as exc:
+                latency = time.perf_counter() - started
+                recorder.record(tool, captured, arrived, latency, None, exc, calls)
+                raise
+        latency = time.perf_counter() - started
+        recorder.record(tool, captured, arrived, latency, _response_size(response), None, calls)
+        return response
+
+    async def _trace(self, fastmcp: ModuleType, payload: dict[str, Any]) -> Any:
+        """Answer a tool invocation inside a trace."""
+
+        tracer = self.tracer
+        assert tracer is not None
+        traceparent = payload.pop(TRACE_ARGUMENT, None) or _header(fastmcp, TRACE_ARGUMENT)
+        name = f"server.{self.settings.tool_name}"
+        with tracer.trace(name, traceparent, tool=self.settings.tool_name):
+            return await self._measure(fastmcp, payload)
+
+    async def _measure(self, fastmcp: ModuleType, payload: dict[str, Any]) -> Any:
+        """Answer a tool invocation, recording its total latency and errors."""
+
+        metrics = self.metrics
+        if metrics is None:
+            return await self._respond(fastmcp, payload)
+        started = time.perf_counter()
+        try:
+            return await self._respond(fastmcp, payload)
+        except Exception as exc:
+            metrics.record_error(exc)
+            raise
+        finally:
+            metrics.lap("total", started)
+
+    async def _respond(self, fastmcp: ModuleType, payload: dict[str, Any]) -> Any:
+        """Answer a single tool invocation."""
+
+        metrics = self.metrics
+        mark = time.perf_counter()
+        query = self._extract_query(payload)
+        record_span("extract", mark)
+        if metrics is not None:
+            metrics.lap("extract", mark)
+        cache = self.response_cache
+        answer = self._stream_answer if payload.get(STREAM_ARGUMENT) else self._answer
+        deadlines = self.deadlines
+        budget = self._budget(deadlines, payload)
+        if deadlines is None or budget is None:
+            return await answer(fastmcp, query, payload, cache)
+        async with deadlines.enforce(budget):
+            return await answer(fastmcp, query, payload, cache)
+
+    def _budget(self, deadlines: DeadlineTracker | None, payload: dict[str, Any]) -> float | None:
+        """Return the seconds the invocation may run: the caller's deadline or the tool timeout."""
+
+        if deadlines is None:
+            return None
+        budget = deadlines.budget(payload) if self.settings.enforce_deadlines else None
+        limit = self.settings.tool_timeout
+        if limit is not None and (budget is None or limit < budget):
+            return limit
+        return budget
+
+    async def _answer(
+        self,
+        fastmcp: ModuleType,
+        query: str,
+        payload: dict[str, Any],
+        cache: ResponseCache | None,
+    ) -> Any:
+        """Answer from the conversation, the cache, an identical in-flight call or the agent."""
+
+        tenant = self._tenant(fastmcp, payload)
+        documents = self.documents
+        if documents is not None and (DOCUMENT_ARGUMENT in payload or PATH_ARGUMENT in payload):
+            chunks = documents.chunks_of(payload.get(DOCUMENT_ARGUMENT), payload.get(PATH_ARGUMENT))
+            result_text = await documents.run(
+                query,
+                chunks,
+                lambda prompt: self._ask_agent(prompt, None, tenant=tenant),
+                _progress_reporter(fastmcp),
+            )
+            return self._finish(fastmcp, result_text)
+        conversations = self.conversations
+        session_id = payload.get(SESSION_ARGUMENT) if conversations is not None else None
+        if conversations is not None and session_id:
+            session_id = str(session_id)
+            history = conversations.history(session_id)
+            result_text = await self._ask_agent(query, None, history, tenant)
+            conversations.append(session_id, query, result_text)
+            return self._finish(fastmcp, result_text)
+        if cache is not None:
+            cached = self._lookup_cache(cache, query, payload)
+            if cached is not None:
+                return self._finish(fastmcp, cached)
+        semantic = self.semantic_cache
+        vector = None
+        if semantic is not None:
+            cached, vector = self._lookup_semantic(semantic, query, payload, tenant)
+            if cached is not None:
+                return self._finish(fastmcp, cached)
+        flight = self.single_flight
+        if flight is None:
+            result_text = await self._ask_agent(query, cache, tenant=tenant)
+        else:
+            key = normalize_query(query)
+            result_text = await flight.run(
+                key, lambda: self._ask_agent(query, cache, tenant=tenant)
+            )
+        if semantic is not None:
+            self._store_semantic(semantic, query, result_text, tenant, vector)
+        return self._finish(fastmcp, result_text)
+
+    def _finish(self, fastmcp: ModuleType, result_text: str) -> Any:
+        """Wrap the answer and record the request in the metrics."""
+
+        metrics = self.metrics
+        started = time.perf_counter()
+        response = self._wrap_response(fastmcp, result_text)
+        record_span("wrap", started)
+        if metrics is None:
+            return response
+        metrics.lap("wrap", started)
+        metrics.record_request(len(result_text))
+        return response
+
+    async def _ask_agent(
+        self,
+        query: str,
+        cache: ResponseCache | None,
+        history: Sequence[Turn] = (),
+        tenant: str | None = None,
+    ) -> str:
+        """Send ``query`` to an agent and remember the answer in the cache."""
+
+        scheduler = self.scheduler if tenant is not None else None
+        admission = self.admission
+        if scheduler is None and admission is None:
+            result_text = await self._call_agent(query, history)
+        else:
+            async with self._schedule(tenant), self._admit():
+                result_text = await self._call_agent(query, history)
+        if cache is not None:
+            self._store_cache(cache, query, result_text)
+        return result_text
+
+    async def _call_agent(self, query: str, history: Sequence[Turn]) -> str:
+        """Answer ``query`` through the batcher, a pooled agent or a fresh one."""
+
+        batcher = self.batcher
+        if batcher is not None:
+            started = time.perf_counter()
+            with span("llm", batched=True):
+                result_text = await batcher.submit(format_history(history, query))
+            record_agent_call(started)
+            return result_text
+        if self.agent_pool is None:
+            return await self._chat_once(self._new_agent(), query, history)
+        async with self._lease_agent() as agent:
+            return await self._chat_once(agent, query, history)
+
+    async def _chat_once(self, agent: Agent, query: str, history: Sequence[Turn]) -> str:
+        """Ask ``agent`` within the call deadline, recording the LLM latency."""
+
+        self._agent_signature = agent_signature(agent)
+        metrics = self.metrics
+        started = time.perf_counter()
+        deadlines = self.deadlines
+        if deadlines is None:
+            with span("llm"):
+                response = await self._chat(agent, query, history)
+        else:
+            async with deadlines.track_call():
+                with span("llm"):
+                    response = await self._chat(agent, query, history)
+        if metrics is not None:
+            metrics.lap("llm", started)
+        record_agent_call(started)
+        return response["result"]
+
+    @staticmethod
+    async def _chat(agent: Any, query: str, history: Sequence[Turn]) -> dict[str, str]:
+        """Ask ``agent``, formatting the history itself for agents without history support."""
+
+        if not history:
+            return await agent.chat(query)  # type: ignore[no-any-return]
+        chat_with_history = getattr(agent, "chat_with_history", None)
+        if chat_with_history is None:
+            return await agent.chat(format_history(history, query))  # type: ignore[no-any-return]
+        return await chat_with_history(query, history)  # type: ignore[no-any-return]
+
+    async def _run_agent_batch(self, queries: list[str]) -> list[str | BaseException]:
+        """Answer a batch of prompts with one agent, isolating failures per prompt."""
+
+        async with self._lease_agent() as agent:
+            self._agent_signature = agent_signature(agent)
+            metrics = self.metrics
+            started = time.perf_counter() if metrics is not None else 0.0
+            chat_batch = getattr(agent, "chat_batch", None)
+            if chat_batch is not None:
+                responses = await chat_batch(queries)
+            else:
+                responses = await asyncio.gather(
+                    *(agent.chat(query) for query in queries), return_exceptions=True
+                )
+            if metrics is not None:
+                metrics.lap("llm", started)
+        return [
+            response if isinstance(response, BaseException) else response["result"]
+            for response in responses
+        ]
+
+    async def _stream_answer(
+        self,
+        fastmcp: ModuleType,
+        query: str,
+        payload: dict[str, Any],
+        cache: ResponseCache | None,
+    ) -> Any:
+        """Answer from the agent's stream, notifying the caller of every chunk.
+
+        Conversation turns are answered with the stored history, bypass the cache
+        and are recorded once the stream completes. Cached answers are returned
+        without notifications.
+        """
+
+        conversations = self.conversations
+        session_id = payload.get(SESSION_ARGUMENT) if conversations is not None else None
+        history: Sequence[Turn] = ()
+        if conversations is not None and session_id:
+            session_id = str(session_id)
+            history = conversations.history(session_id)
+            cache = None
+        elif cache is not None:
+            cached = self._lookup_cache(cache, query, payload)
+            if cached is not None:
+                return self._finish(fastmcp, cached)
+        notify = _chunk_reporter(fastmcp)
+        parts: list[str] = []
+        tenant = self._tenant(fastmcp, payload)
+        async with self._schedule(tenant), self._admit(), self._lease_agent() as agent:
+            self._agent_signature = agent_signature(agent)
+            chunks = self._agent_stream(agent, format_history(history, query))
+            started = time.perf_counter()
+            with span("llm", streamed=True):
+                async for chunk in measure_stream(chunks, self._record_stream):
+                    parts.append(chunk)
+                    if notify is not None:
+                        await notify(len(parts), chunk)
+            record_agent_call(started)
+        answer = "".join(parts)
+        if conversations is not None and session_id:
+            conversations.append(session_id, query, answer)
+        if cache is not None:
+            self._store_cache(cache, query, answer)
+        return self._finish(fastmcp, answer)
+
+    def _record_stream(self, stats: StreamStats) -> None:
+        """Keep the timing of a finished stream and feed it to the latency metrics.
+
+        The output size is recorded once the whole answer is returned.
+        """
+
+        self.recent_stream_stats.append(stats)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.observe("llm", stats.duration)
+            if stats.time_to_first_token is not None:
+                metrics.observe("first_token", stats.time_to_first_token)
+
+    @staticmethod
+    async def _agent_stream(agent: Any, query: str) -> AsyncIterator[str]:
+        """Stream from ``agent``, falling back to a single chunk for non-streaming agents."""
+
+        astream = getattr(agent, "astream", None)
+        if astream is None:
+            response = await agent.chat(query)
+            yield response["result"]
+            return
+        async for chunk in astream(query):
+            yield chunk
+
+    def _lookup_cache(
+        self, cache: ResponseCache, query: str, payload: dict[str, Any]
+    ) -> str | None:
+        """Return a cached answer for ``query`` unless the request bypasses the cache."""
+
+        signature = self._agent_signature
+        if payload.get(cache.settings.bypass_key):
+            return None
+        if signature is None:
+            # No agent has answered yet, so the cache cannot hold anything.
+            cache.stats.misses += 1
+            return None
+        if not cache.accepts(signature):
+            return None
+        return cache.get(cache.key(query, signature))
+
+    def _store_cache(self, cache: ResponseCache, query: str, result: str) -> None:
+        """Remember ``result`` when the answering agent is deterministic enough."""
+
+        signature = self._agent_signature
+        if signature is not None and cache.accepts(signature):
+            cache.put(cache.key(query, signature), result)
+
+    def _lookup_semantic(
+        self,
+        semantic: SemanticCache,
+        query: str,
+        payload: dict[str, Any],
+        tenant: str | None,
+    ) -> tuple[str | None, Any]:
+        """Return the answer to a cached prompt similar to ``query`` and its embedding.
+
+        The embedding is ``None`` when the lookup was skipped before embedding.
+        """
+
+        signature = self._agent_signature
+        if payload.get(semantic.settings.bypass_key):
+            return None, None
+        if signature is None:
+            semantic.stats.misses += 1
+            return None, None
+        if not semantic.accepts(signature):
+            return None, None
+        vector = semantic.embed([query])[0]
+        scope = self._semantic_scope(semantic, tenant)
+        return semantic.get(query, signature, scope=scope, vector=vector), vector
+
+    def _store_semantic(
+        self,
+        semantic: SemanticCache,
+        query: str,
+        result: str,
+        tenant: str | None,
+        vector: Any,
+    ) -> None:
+        """Remember ``result`` for prompts similar to ``query``."""
+
+        signature = self._agent_signature
+        if signature is not None and semantic.accepts(signature):
+            scope = self._semantic_scope(semantic, tenant)
+            semantic.put(query, signature, result, scope=scope, vector=vector)
+
+    @staticmethod
+    def _semantic_scope(semantic: SemanticCache, tenant: str | None) -> str | None:
+        """Return the cache partition of ``tenant``, ``None`` when entries are shared."""
+
+        return tenant if semantic.settings.per_tenant else None
+
+    @staticmethod
+    def _wrap_response(fastmcp: ModuleType, result_text: str) -> Any:
+        """Convert the agent answer into the response structure expected by FastMCP."""
+
+        response_message = getattr(fastmcp, "ResponseMessage", None)
+        if response_message is None:
+            return {"role": "assistant", "content": result_text}
+        return response_message(role="assistant", content=result_text)
+
+    def _tenant(self, fastmcp: ModuleType, payload: dict[str, Any]) -> str | None:
+        """Name the tenant of an invocation from its payload or HTTP headers."""
+
+        settings = self.settings.scheduler
+        if settings is None:
+            return None
+        tenant = payload.get(settings.argument) or _header(fastmcp, settings.header)
+        return str(tenant) if tenant else settings.default_tenant
+
+    @asynccontextmanager
+    async def _schedule(self, tenant: str | None) -> AsyncIterator[None]:
+        """Hold a slot of the tenant scheduler when scheduling is enabled."""
+
+        scheduler = self.scheduler
+        if scheduler is None or tenant is None:
+            yield
+            return
+        started = time.perf_counter()
+        async with scheduler.slot(tenant):
+            record_span("schedule", started, tenant=tenant)
+            yield
+
+    @asynccontextmanager
+    async def _admit(self) -> AsyncIterator[None]:
+        """Hold an admission slot when admission control is enabled."""
+
+        admission = self.admission
+        if admission is None:
+            yield
+            return
+        started = time.perf_counter()
+        async with admission.admit():
+            record_span("admission", started)
+            yield
+
+    @asynccontextmanager
+    async def _lease_agent(self) -> AsyncIterator[Agent]:
+        """Yield a pooled agent when pooling is enabled, otherwise a fresh one."""
+
+        pool = self.agent_pool
+        if pool is None:
+            yield self._new_agent()
+            return
+        metrics = self.metrics
+        started = time.perf_counter()
+        async with pool.lease() as agent:
+            record_span("acquire", started, pooled=True)
+            if metrics is not None:
+                metrics.lap("acquire", started)
+            yield agent
+
+    def _new_agent(self) -> Agent:
+        """Build an agent for a single call, recording the time it took."""
+
+        started = time.perf_counter()
+        agent = self.agent_factory()
+        record_span("acquire", started)
+        metrics = self.metrics
+        if metrics is not None:
+            metrics.lap("acquire", started)
+        return agent
+
     @staticmethod
     def _extract_query(payload: dict[str, Any]) -> str:
         """Extract a usable prompt from the incoming tool payload."""
@@ -80,3 +842,84 @@ class MCPServerBuilder:
             "Unable to extract a prompt from the incoming FastMCP payload. Provide "
             "a 'question', 'prompt', or 'query' argument when invoking the tool."
         )
+
+
+def _response_size(response: Any) -> int | None:
+    """Return the characters of a wrapped answer, ``None`` when it holds no text."""
+
+    content = response.get("content") if isinstance(response, dict) else None
+    content = getattr(response, "content", content)
+    return len(content) if isinstance(content, str) else None
+
+
+def _dependency(fastmcp: ModuleType, name: str) -> Callable[[], Any] | None:
+    """Return a FastMCP request dependency such as ``get_http_headers``, if available."""
+
+    function = getattr(fastmcp, name, None)
+    if function is None:
+        try:
+            dependencies = import_module(f"{fastmcp.__name__}.server.dependencies")
+        except (AttributeError, ImportError):
+            return None
+        function = getattr(dependencies, name, None)
+    return function
+
+
+def _header(fastmcp: ModuleType, name: str) -> str | None:
+    """Return the value of the ``name`` HTTP header of the current request, if any."""
+
+    name = name.lower()
+    headers = _request_headers(fastmcp)
+    return next((value for key, value in headers.items() if key.lower() == name), None)
+
+
+def _request_headers(fastmcp: ModuleType) -> Mapping[str, str]:
+    """Return the HTTP headers of the request being served, empty outside HTTP requests."""
+
+    get_http_headers = _dependency(fastmcp, "get_http_headers")
+    if get_http_headers is None:
+        return {}
+    try:
+        return get_http_headers() or {}
+    except RuntimeError:  # no HTTP request is active
+        return {}
+
+
+def _request_context(fastmcp: ModuleType) -> Any:
+    """Return the MCP context of the request being served, ``None`` outside requests."""
+
+    get_context = _dependency(fastmcp, "get_context")
+    if get_context is None:
+        return None
+    try:
+        return get_context()
+    except RuntimeError:  # no MCP request is active
+        return None
+
+
+def _progress_reporter(
+    fastmcp: ModuleType,
+) -> Callable[[DocumentProgress], Awaitable[None]] | None:
+    """Return a callback sending document progress to the caller through the MCP context."""
+
+    context = _request_context(fastmcp)
+    if context is None:
+        return None
+
+    async def report(progress: DocumentProgress) -> None:
+        await context.report_progress(progress.mapped + progress.reduced, None)
+
+    return report
+
+
+def _chunk_reporter(fastmcp: ModuleType) -> Callable[[int, str], Awaitable[None]] | None:
+    """Return a callback sending streamed chunks to the caller as progress messages."""
+
+    context = _request_context(fastmcp)
+    if context is None:
+        return None
+
+    async def report(count: int, chunk: str) -> None:
+        await context.report_progress(count, None, chunk)
+
+    return report
@@ -0,0 +1,217 @@
+"""Persistent FastMCP client sessions shared across invocations."""
+
+from __future__ import annotations
+
+import asyncio
+import time
+from collections import deque
+from collections.abc import AsyncIterator, Callable
+from contextlib import asynccontextmanager, suppress
+from dataclasses import dataclass, field
+from typing import Any
+
+from .config import SessionPoolSettings
+from .metrics import MetricsRegistry
+from .tracing import record_span
+
+#: Errors signalling that a session can no longer be used. The invocation is
+#: retried on a fresh session for these.
+RECONNECT_ERRORS: tuple[type[BaseException], ...] = (ConnectionError, EOFError)
+
+#: Errors after which the session state is unknown and the session is discarded.
+DISCARD_ERRORS: tuple[type[BaseException], ...] = (OSError, EOFError)
+
+
+@dataclass(slots=True)
+class _Session:
+    """An entered FastMCP client context together with its bookkeeping."""
+
+    context: Any
+    client: Any
+    last_used: float
+
+
+@dataclass(slots=True)
+class _Endpoint:
+    """Sessions and concurrency guard belonging to a single server URL."""
+
+    semaphore: asyncio.Semaphore
+    idle: deque[_Session] = field(default_factory=deque)
+    open: int = 0
+
+
+@dataclass(slots=True)
+class SessionStats:
+    """Counters describing how sessions were opened and reused.
+
+    Args:
+        opened: Sessions opened against a server.
+        reused: Invocations served by an already open session.
+        reconnects: Invocations retried on a new session after a connection error.
+        health_check_failures: Idle sessions that failed their health check.
+        expired: Sessions closed after exceeding the idle timeout.
+    """
+
+    opened: int = 0
+    reused: int = 0
+    reconnects: int = 0
+    health_check_failures: int = 0
+    expired: int = 0
+
+
+class SessionPool:
+    """Pool of open FastMCP sessions, keyed by server URL.
+
+    Args:
+        client_factory: Callable returning a not-yet-entered FastMCP client context
+            manager for the given server URL.
+        settings: Pool size, idle timeout, health check and reconnect behaviour.
+        metrics: Optional registry receiving ``connect`` and ``call`` stage timings.
+        clock: Monotonic clock used for idle bookkeeping. Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        client_factory: Callable[[str], Any],
+        settings: SessionPoolSettings | None = None,
+        *,
+        metrics: MetricsRegistry | None = None,
+        clock: Callable[[], float] = time.monotonic,
+    ) -> None:
+        self.client_factory = client_factory
+        self.settings = settings or SessionPoolSettings()
+        self.metrics = metrics
+        self.stats = SessionStats()
+        self._clock = clock
+        self._endpoints: dict[str, _Endpoint] = {}
+        self._closed = False
+
+    async def invoke(self, server_url: str, tool_name: str, payload: dict[str, Any]) -> Any:
+        """Invoke ``tool_name`` on a pooled session, reconnecting on connection errors."""
+
+        metrics = self.metrics
+        attempts = self.settings.max_reconnects + 1
+        for attempt in range(attempts):
+            try:
+                started = time.perf_counter()
+                async with self.lease(server_url) as client:
+                    record_span("connect", started, pooled=True)
+                    called = time.perf_counter()
+                    response = await client.invoke_tool(tool_name, **payload)
+                    record_span("call", called, server=server_url)
+                    if metrics is not None:
+                        metrics.observe("connect", called - started)
+                        metrics.lap("call", called)
+                    return response
+            except RECONNECT_ERRORS:
+                if attempt == attempts - 1:
+                    raise
+                self.stats.reconnects += 1
+        raise AssertionError("unreachable")  # pragma: no cover - loop always returns or raises
+
+    @asynccontextmanager
+    async def lease(self, server_url: str) -> AsyncIterator[Any]:
+        """Borrow an open session for ``server_url``.
+
+        Sessions are returned to the pool when the block exits normally or with an
+        application error, and closed when the block raises a connection error.
+        """
+
+        if self._closed:
+            raise RuntimeError("The session pool has been closed.")
+        endpoint = self._endpoint(server_url)
+        async with endpoint.semaphore:
+            session = await self._checkout(server_url, endpoint)
+            try:
+                yield session.client
+            except DISCARD_ERRORS:
+                await self._discard(endpoint, session)
+                raise
+            except BaseException:
+                await self._checkin(endpoint, session)
+                raise
+            else:
+                await self._checkin(endpoint, session)
+
+    async def aclose(self) -> None:
+        """Close every idle session and refuse further leases."""
+
+        self._closed = True
+        endpoints = list(self._endpoints.values())
+        self._endpoints.clear()
+        for endpoint in endpoints:
+            while endpoint.idle:
+                await self._discard(endpoint, endpoint.idle.popleft())
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the session counters together with the current occupancy."""
+
+        idle = sum(len(endpoint.idle) for endpoint in self._endpoints.values())
+        opened = sum(endpoint.open for endpoint in self._endpoints.values())
+        return {
+            "opened": self.stats.opened,
+            "reused": self.stats.reused,
+            "reconnects": self.stats.reconnects,
+            "health_check_failures": self.stats.health_check_failures,
+            "expired": self.stats.expired,
+            "idle": idle,
+            "in_use": opened - idle,
+        }
+
+    async def _checkout(self, server_url: str, endpoint: _Endpoint) -> _Session:
+        await self._expire_idle(endpoint)
+        while endpoint.idle:
+            session = endpoint.idle.pop()
+            if await self._is_healthy(session):
+                self.stats.reused += 1
+                return session
+            self.stats.health_check_failures += 1
+            await self._discard(endpoint, session)
+        return await self._open(server_url, endpoint)
+
+    async def _checkin(self, endpoint: _Endpoint, session: _Session) -> None:
+        if self._closed:
+            # The pool was closed while the session was leased.
+            await self._discard(endpoint, session)
+            return
+        session.last_used = self._clock()
+        endpoint.idle.append(session)
+
+    async def _open(self, server_url: str, endpoint: _Endpoint) -> _Session:
+        context = self.client_factory(server_url)
+        client = await context.__aenter__()
+        endpoint.open += 1
+        self.stats.opened += 1
+        return _Session(context=context, client=client, last_used=self._clock())
+
+    async def _discard(self, endpoint: _Endpoint, session: _Session) -> None:
+        endpoint.open -= 1
+        with suppress(Exception):
+            await session.context.__aexit__(None, None, None)
+
+    async def _is_healthy(self, session: _Session) -> bool:
+        interval = self.settings.health_check_interval
+        ping = getattr(session.client, "ping", None)
+        if interval is None or ping is None or self._clock() - session.last_used < interval:
+            return True
+        try:
+            await ping()
+        except Exception:
+            return False
+        return True
+
+    async def _expire_idle(self, endpoint: _Endpoint) -> None:
+        timeout = self.settings.idle_timeout
+        if timeout is None:
+            return
+        cutoff = self._clock() - timeout
+        while endpoint.idle and endpoint.idle[0].last_used < cutoff:
+            self.stats.expired += 1
+            await self._discard(endpoint, endpoint.idle.popleft())
+
+    def _endpoint(self, server_url: str) -> _Endpoint:
+        endpoint = self._endpoints.get(server_url)
+        if endpoint is None:
+            semaphore = asyncio.Semaphore(self.settings.max_size)
+            endpoint = self._endpoints[server_url] = _Endpoint(semaphore=semaphore)
+        return endpoint
@@ -0,0 +1,65 @@
+"""Helpers for measuring streamed language model responses."""
+
+from __future__ import annotations
+
+import time
+from collections.abc import AsyncIterable, AsyncIterator, Callable
+from dataclasses import dataclass
+
+
+@dataclass(slots=True)
+class StreamStats:
+    """Timing of a single streamed response.
+
+    Each streamed chunk is counted as one token, which matches how Ollama emits
+    tokens through LangChain's streaming interface.
+
+    Args:
+        chunks: Number of chunks received.
+        characters: Total length of the streamed text.
+        time_to_first_token: Seconds between the request and the first chunk.
+            ``None`` when the stream produced no chunk.
+        duration: Seconds between the request and the end of the stream.
+    """
+
+    chunks: int = 0
+    characters: int = 0
+    time_to_first_token: float | None = None
+    duration: float = 0.0
+
+    @property
+    def tokens_per_second(self) -> float:
+        """Chunks received per second over the whole stream."""
+        return self.chunks / self.duration if self.duration > 0 else 0.0
+
+
+async def measure_stream(
+    chunks: AsyncIterable[str],
+    on_complete: Callable[[StreamStats], None],
+    *,
+    started: float | None = None,
+) -> AsyncIterator[str]:
+    """Yield ``chunks`` unchanged and report their :class:`StreamStats` once exhausted.
+
+    ``on_complete`` is also called when the consumer stops early or the stream
+    fails, so partial streams are still accounted for.
+
+    Args:
+        chunks: Source of text chunks.
+        on_complete: Callback receiving the final statistics.
+        started: ``time.perf_counter`` value marking when the request was issued.
+            Defaults to the moment iteration starts.
+    """
+
+    stats = StreamStats()
+    start = time.perf_counter() if started is None else started
+    try:
+        async for chunk in chunks:
+            if stats.time_to_first_token is None:
+                stats.time_to_first_token = time.perf_counter() - start
+            stats.chunks += 1
+            stats.characters += len(chunk)
+            yield chunk
+    finally:
+        stats.duration = time.perf_counter() - start
+        on_complete(stats)
@@ -0,0 +1,395 @@
+"""Lightweight request tracing across the client and the server, with sampled profiling."""
+
+from __future__ import annotations
+
+import asyncio
+import atexit
+import cProfile
+import json
+import queue
+import random
+import re
+import threading
+import time
+from collections.abc import Callable, Iterator, Sequence
+from contextlib import AbstractContextManager, contextmanager, nullcontext
+from contextvars import ContextVar
+from dataclasses import dataclass, field
+from pathlib import Path
+from typing import Any, Protocol
+
+from .config import TracingSettings
+
+#: Payload argument and HTTP header carrying the W3C ``traceparent`` of the caller.
+TRACE_ARGUMENT = "traceparent"
+
+_TRACEPARENT = re.compile(r"^00-([0-9a-f]{32})-([0-9a-f]{16})-([0-9a-f]{2})$")
+
+
+@dataclass(slots=True)
+class Span:
+    """One timed operation of a trace.
+
+    Args:
+        name: Operation name, such as ``"server.llm"``.
+        trace_id: 32 hexadecimal digits shared by every span of the trace.
+        span_id: 16 hexadecimal digits identifying this span.
+        parent_id: Span this one is nested in, possibly in another process.
+        start: Wall-clock start time in seconds since the epoch.
+        end: Wall-clock end time, ``None`` while the span is running.
+        status: ``"ok"``, or the exception type name when the operation failed.
+        attributes: Extra details about the operation.
+    """
+
+    name: str
+    trace_id: str
+    span_id: str
+    parent_id: str | None
+    start: float
+    end: float | None = None
+    status: str = "ok"
+    attributes: dict[str, Any] = field(default_factory=dict)
+
+    @property
+    def traceparent(self) -> str:
+        """W3C ``traceparent`` value making a remote operation a child of this span."""
+
+        return f"00-{self.trace_id}-{self.span_id}-01"
+
+    def to_dict(self) -> dict[str, Any]:
+        """Return the span as JSON-serialisable data."""
+
+        return {
+            "name": self.name,
+            "trace_id": self.trace_id,
+            "span_id": self.span_id,
+            "parent_id": self.parent_id,
+            "start": self.start,
+            "end": self.end,
+            "duration": None if self.end is None else self.end - self.start,
+            "status": self.status,
+            "attributes": self.attributes,
+        }
+
+
+class SpanExporter(Protocol):
+    """Receives the spans of every finished, sampled trace."""
+
+    def export(self, spans: Sequence[Span]) -> None:  # pragma: no cover - protocol definition
+        """Persist or forward ``spans``."""
+
+
+class JsonlExporter:
+    """Append spans to a file, one JSON object per line, from a background thread.
+
+    :meth:`export` only queues the spans, so the event loop never waits on disk.
+    A writer thread serialises them to one buffered file handle and flushes it
+    whenever the queue runs empty. Call :meth:`flush` to wait for queued spans to
+    reach the file and :meth:`close` to stop the writer; it restarts on the next
+    export.
+
+    Args:
+        path: File the spans are appended to. Parent directories are created.
+    """
+
+    def __init__(self, path: str | Path) -> None:
+        self.path = Path(path)
+        self._queue: queue.SimpleQueue[Sequence[Span] | threading.Event | None]
+        self._queue = queue.SimpleQueue()
+        self._lock = threading.Lock()
+        self._thread: threading.Thread | None = None
+
+    def export(self, spans: Sequence[Span]) -> None:
+        """Queue ``spans`` to be appended to the file."""
+
+        self._start()
+        self._queue.put(spans)
+
+    def flush(self) -> None:
+        """Wait until every queued span has been written to the file."""
+
+        thread = self._thread
+        if thread is None:
+            return
+        written = threading.Event()
+        self._queue.put(written)
+        while not written.wait(0.1) and thread.is_alive():
+            pass
+
+    def close(self) -> None:
+        """Write the queued spans, close the file and stop the writer thread."""
+
+        with self._lock:
+            thread, self._thread = self._thread, None
+            if thread is not None:
+                self._queue.put(None)
+        if thread is not None:
+            atexit.unregister(self.close)
+            thread.join()
+
+    def _start(self) -> None:
+        if self._thread is not None:
+            return
+        with self._lock:
+            if self._thread is None:
+                self._thread = threading.Thread(
+                    target=self._write, name="fastmcp-trace-writer", daemon=True
+                )
+                self._thread.start()
+                atexit.register(self.close)
+
+    def _write(self) -> None:
+        self.path.parent.mkdir(parents=True, exist_ok=True)
+        with self.path.open("a", encoding="utf-8") as handle:
+            while True:
+                item = self._queue.get()
+                if item is None:
+                    return
+                if isinstance(item, threading.Event):
+                    handle.flush()
+                    item.set()
+                    continue
+                for span in item:
+                    handle.write(json.dumps(span.to_dict(), default=str) + "\n")
+                if self._queue.empty():
+                    handle.flush()
+
+
+def parse_traceparent(value: Any) -> tuple[str, str, bool] | None:
+    """Return ``(trace_id, parent_span_id, sampled)`` from a ``traceparent``, if valid."""
+
+    match = _TRACEPARENT.match(str(value).strip().lower()) if value else None
+    if match is None:
+        return None
+    trace_id, span_id, flags = match.groups()
+    return trace_id, span_id, bool(int(flags, 16) & 1)
+
+
+@dataclass(slots=True)
+class _Active:
+    tracer: Tracer
+    span: Span
+    spans: list[Span]
+
+
+_ACTIVE: ContextVar[_Active | None] = ContextVar("fastmcp_template_trace", default=None)
+_UNSAMPLED: ContextVar[tuple[Tracer, str] | None] = ContextVar(
+    "fastmcp_template_unsampled_trace", default=None
+)
+_NO_SPAN: AbstractContextManager[None] = nullcontext()
+
+
+def current_span() -> Span | None:
+    """Return the innermost running span of the current task, if it is sampled."""
+
+    active = _ACTIVE.get()
+    return None if active is None else active.span
+
+
+def span(name: str, **attributes: Any) -> AbstractContextManager[Span | None]:
+    """Time the block as a child of the current span; does nothing outside a trace.
+
+    Outside a sampled trace a shared no-op context is returned, so instrumented
+    code pays only a context variable lookup when tracing is off.
+    """
+
+    active = _ACTIVE.get()
+    if active is None:
+        return _NO_SPAN
+    return active.tracer._child(active, name, active.tracer.now(), attributes)
+
+
+def record_span(name: str, started: float, **attributes: Any) -> None:
+    """Record a finished child of the current span that began at ``started``.
+
+    ``started`` is a :func:`time.perf_counter` timestamp, as taken for the metrics,
+    so stages measured around ``async with`` blocks need no extra nesting.
+    """
+
+    active = _ACTIVE.get()
+    if active is None:
+        return
+    tracer = active.tracer
+    child = tracer._new_span(name, active.span, tracer.wall(started), attributes)
+    child.end = tracer.now()
+    active.spans.append(child)
+
+
+class Tracer:
+    """Create sampled traces and hand their spans to an exporter once they finish.
+
+    Spans of the running trace are tracked in a context variable, so stages deep
+    in the call stack add children with :func:`span` or :func:`record_span`
+    without a tracer reference. Unsampled requests create no spans at all, but
+    :meth:`inject` still passes their decision on so downstream services drop
+    the same trace.
+
+    A profiled request enables the profiler for the whole event loop thread, so
+    its dump also covers every coroutine that runs while the request awaits.
+    Only one request is profiled at a time, and the dump is written from an
+    executor thread so the loop never waits on disk.
+
+    Args:
+        settings: Sampling rates, export path and profile directory.
+        exporter: Receives finished traces. Defaults to a :class:`JsonlExporter`
+            writing to ``settings.path``.
+        profiler: Builds the profiler of a profiled request. It must provide
+            ``enable``, ``disable`` and ``dump_stats``. Defaults to
+            :class:`cProfile.Profile`.
+        rng: Random generator drawing identifiers and sampling decisions.
+            Overridable in tests.
+    """
+
+    def __init__(
+        self,
+        settings: TracingSettings | None = None,
+        *,
+        exporter: SpanExporter | None = None,
+        profiler: Callable[[], Any] = cProfile.Profile,
+        rng: random.Random | None = None,
+    ) -> None:
+        self.settings = settings or TracingSettings()
+        self.exporter = exporter or JsonlExporter(self.settings.path)
+        self.traces = 0
+        self.unsampled = 0
+        self.spans = 0
+        self.profiles = 0
+        self._profiler = profiler
+        self._rng = rng or random.Random()
+        self._profiling = False
+        self._offset = time.time() - time.perf_counter()
+
+    def now(self) -> float:
+        """Return the current wall-clock time from the monotonic performance counter."""
+
+        return self.wall(time.perf_counter())
+
+    def wall(self, counter: float) -> float:
+        """Convert a :func:`time.perf_counter` timestamp to seconds since the epoch."""
+
+        return self._offset + counter
+
+    def inject(self, payload: dict[str, Any]) -> None:
+        """Add the current span's ``traceparent`` to ``payload``, continuing the trace remotely.
+
+        Inside an unsampled trace the ``traceparent`` carries the ``00`` flags, so
+        the callee keeps the decision instead of sampling the trace itself.
+        """
+
+        active = _ACTIVE.get()
+        if active is not None and active.tracer is self:
+            payload.setdefault(TRACE_ARGUMENT, active.span.traceparent)
+            return
+        unsampled = _UNSAMPLED.get()
+        if unsampled is not None and unsampled[0] is self:
+            payload.setdefault(TRACE_ARGUMENT, unsampled[1])
+
+    @contextmanager
+    def trace(
+        self, name: str, traceparent: Any = None, **attributes: Any
+    ) -> Iterator[Span | None]:
+        """Start a trace, continuing the caller's trace when ``traceparent`` is given.
+
+        A caller's sampling decision is kept; otherwise the trace is sampled with
+        ``sample_rate``. A sampled trace is run under the profiler with
+        ``profile_rate`` and exported when the block exits.
+        """
+
+        parent = parse_traceparent(traceparent)
+        if parent is not None:
+            trace_id, parent_id, sampled = parent
+        else:
+            trace_id, parent_id = f"{self._rng.getrandbits(128):032x}", None
+            sampled = self._rng.random() < self.settings.sample_rate
+        if not sampled:
+            self.unsampled += 1
+            decision = _UNSAMPLED.set((self, f"00-{trace_id}-{self._span_id()}-00"))
+            hidden = _ACTIVE.set(None)
+            try:
+                yield None
+            finally:
+                _ACTIVE.reset(hidden)
+                _UNSAMPLED.reset(decision)
+            return
+        self.traces += 1
+        root = Span(name, trace_id, self._span_id(), parent_id, self.now(), attributes=attributes)
+        spans = [root]
+        token = _ACTIVE.set(_Active(self, root, spans))
+        profile = self._start_profile()
+        try:
+            yield root
+        except BaseException as exc:
+            root.status = type(exc).__name__
+            raise
+        finally:
+            root.end = self.now()
+            _ACTIVE.reset(token)
+            if profile is not None:
+                self._save_profile(profile, root)
+            self.spans += len(spans)
+            self.exporter.export(spans)
+
+    def snapshot(self) -> dict[str, int]:
+        """Return the number of sampled and unsampled traces, spans and profiles."""
+
+        return {
+            "traces": self.traces,
+            "unsampled": self.unsampled,
+            "spans": self.spans,
+            "profiles": self.profiles,
+        }
+
+    @contextmanager
+    def _child(
+        self, active: _Active, name: str, start: float, attributes: dict[str, Any]
+    ) -> Iterator[Span]:
+        child = self._new_span(name, active.span, start, attributes)
+        active.spans.append(child)
+        token = _ACTIVE.set(_Active(self, child, active.spans))
+        try:
+            yield child
+        except BaseException as exc:
+            child.status = type(exc).__name__
+            raise
+        finally:
+            child.end = self.now()
+            _ACTIVE.reset(token)
+
+    def _new_span(
+        self, name: str, parent: Span, start: float, attributes: dict[str, Any]
+    ) -> Span:
+        return Span(
+            name, parent.trace_id, self._span_id(), parent.span_id, start, attributes=attributes
+        )
+
+    def _span_id(self) -> str:
+        return f"{self._rng.getrandbits(64):016x}"
+
+    def _start_profile(self) -> Any:
+        if self._profiling or self._rng.random() >= self.settings.profile_rate:
+            return None
+        profile = self._profiler()
+        try:
+            profile.enable()
+        except ValueError:  # another profiler is already active in this thread
+            return None
+        self._profiling = True
+        return profile
+
+    def _save_profile(self, profile: Any, root: Span) -> None:
+        profile.disable()
+        self._profiling = False
+        path = Path(self.settings.profile_dir) / f"{root.trace_id}-{root.span_id}.prof"
+        root.attributes["profile"] = str(path)
+        self.profiles += 1
+        try:
+            loop = asyncio.get_running_loop()
+        except RuntimeError:
+            _dump_profile(profile, path)
+        else:
+            loop.run_in_executor(None, _dump_profile, profile, path)
+
+
+def _dump_profile(profile: Any, path: Path) -> None:
+    path.parent.mkdir(parents=True, exist_ok=True)
+    profile.dump_stats(str(path))
@@ -0,0 +1,95 @@
+"""Tests for adaptive admission control."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from fastmcp_template import AdmissionController, AdmissionSettings, OverloadedError
+
+
+def test_limit_caps_in_flight_calls_and_queues_the_rest() -> None:
+    settings = AdmissionSettings(initial_limit=2, max_queue=10, target_latency=None)
+    controller = AdmissionController(settings)
+    peak = 0
+
+    async def call() -> None:
+        nonlocal peak
+        async with controller.admit():
+            peak = max(peak, controller.in_flight)
+            await asyncio.sleep(0.001)
+
+    async def scenario() -> None:
+        await asyncio.gather(*(call() for _ in range(8)))
+
+    asyncio.run(scenario())
+    assert peak == 2
+    assert controller.snapshot()["admitted"] == 8
+    assert controller.snapshot()["in_flight"] == 0
+
+
+def test_full_queue_sheds_immediately() -> None:
+    settings = AdmissionSettings(initial_limit=1, max_queue=1, target_latency=None)
+    controller = AdmissionController(settings)
+
+    async def call() -> None:
+        async with controller.admit():
+            await asyncio.sleep(0.01)
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(*(call() for _ in range(4)), return_exceptions=True)
+
+    results = asyncio.run(scenario())
+    assert sum(isinstance(result, OverloadedError) for result in results) == 2
+    assert controller.stats.rejected == 2
+    assert controller.snapshot()["shed"] == 2
+
+
+def test_queue_time_limit_sheds_waiting_calls() -> None:
+    settings = AdmissionSettings(
+        initial_limit=1, max_queue=5, max_queue_time=0.01, target_latency=None
+    )
+    controller = AdmissionController(settings)
+
+    async def scenario() -> None:
+        async with controller.admit():
+            with pytest.raises(OverloadedError):
+                async with controller.admit():
+                    pass
+
+    asyncio.run(scenario())
+    assert controller.stats.timed_out == 1
+    assert controller.snapshot()["queued"] == 0
+
+
+def test_limit_adapts_to_latency() -> None:
+    now = [0.0]
+    settings = AdmissionSettings(
+        initial_limit=4, min_limit=1, max_limit=8, target_latency=1.0, decrease_factor=0.5
+    )
+    controller = AdmissionController(settings, clock=lambda: now[0])
+
+    async def call(latency: float) -> None:
+        async with controller.admit():
+            now[0] += latency
+
+    async def scenario() -> None:
+        for _ in range(40):
+            await call(0.1)
+
+    asyncio.run(scenario())
+    assert controller.limit == 8
+
+    asyncio.run(call(5.0))
+    assert controller.limit == 4
+    for _ in range(5):
+        asyncio.run(call(5.0))
+    assert controller.limit == 1
+
+
+def test_settings_validate_bounds() -> None:
+    with pytest.raises(ValueError):
+        AdmissionSettings(min_limit=4, initial_limit=2)
+    with pytest.raises(ValueError):
+        AdmissionSettings(decrease_factor=1.5)
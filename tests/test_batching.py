@@ -0,0 +1,80 @@
+"""Tests for server-side micro-batching."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from fastmcp_template import BatchingSettings, MicroBatcher
+
+
+class Recorder:
+    """Batch runner that records the batches it receives."""
+
+    def __init__(self) -> None:
+        self.batches: list[list[str]] = []
+
+    async def __call__(self, queries: list[str]) -> list[str | BaseException]:
+        self.batches.append(queries)
+        await asyncio.sleep(0)
+        return [ValueError(query) if query.startswith("bad") else query.upper() for query in queries]
+
+
+def test_full_batches_flush_immediately() -> None:
+    runner = Recorder()
+    batcher = MicroBatcher(runner, BatchingSettings(max_batch_size=3, window=10.0))
+
+    async def scenario() -> list[str]:
+        return await asyncio.gather(*(batcher.submit(str(i)) for i in range(6)))
+
+    assert asyncio.run(scenario()) == [str(i) for i in range(6)]
+    assert [len(batch) for batch in runner.batches] == [3, 3]
+    assert batcher.batch_sizes.count == 2
+
+
+def test_window_flushes_partial_batches() -> None:
+    runner = Recorder()
+    batcher = MicroBatcher(runner, BatchingSettings(max_batch_size=100, window=0.005))
+
+    async def scenario() -> list[str]:
+        return await asyncio.gather(batcher.submit("a"), batcher.submit("b"))
+
+    assert asyncio.run(scenario()) == ["A", "B"]
+    assert runner.batches == [["a", "b"]]
+    snapshot = batcher.snapshot()
+    assert snapshot["queue_wait_seconds"]["count"] == 2  # type: ignore[index]
+
+
+def test_failures_are_isolated_per_item() -> None:
+    batcher = MicroBatcher(Recorder(), BatchingSettings(max_batch_size=2))
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(
+            batcher.submit("good"), batcher.submit("bad"), return_exceptions=True
+        )
+
+    good, bad = asyncio.run(scenario())
+    assert good == "GOOD"
+    assert isinstance(bad, ValueError)
+
+
+def test_runner_failure_reaches_every_caller() -> None:
+    async def broken(queries: list[str]) -> list[str | BaseException]:
+        raise ConnectionError("backend down")
+
+    batcher = MicroBatcher(broken, BatchingSettings(max_batch_size=2))
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(
+            batcher.submit("a"), batcher.submit("b"), return_exceptions=True
+        )
+
+    assert all(isinstance(result, ConnectionError) for result in asyncio.run(scenario()))
+
+
+def test_settings_validate_bounds() -> None:
+    with pytest.raises(ValueError):
+        BatchingSettings(max_batch_size=0)
+    with pytest.raises(ValueError):
+        BatchingSettings(window=-1)
@@ -0,0 +1,56 @@
+"""Tests for the offline benchmark suite."""
+
+from __future__ import annotations
+
+from pathlib import Path
+
+from benchmarks.__main__ import main
+from benchmarks.suite import BenchmarkSettings, compare, percentile, run
+
+
+def test_compare_flags_regressions_in_the_right_direction() -> None:
+    baseline = {"overhead.handler_ns": 100.0, "concurrency.8.throughput_rps": 1000.0}
+    within = {"overhead.handler_ns": 110.0, "concurrency.8.throughput_rps": 950.0}
+    assert compare(within, baseline, 0.2) == []
+
+    regressions = compare(
+        {"overhead.handler_ns": 150.0, "concurrency.8.throughput_rps": 500.0, "new.metric": 1.0},
+        baseline,
+        0.2,
+    )
+    assert [line.split(":")[0] for line in regressions] == [
+        "concurrency.8.throughput_rps",
+        "overhead.handler_ns",
+    ]
+
+
+def test_percentile_uses_nearest_rank() -> None:
+    values = [float(value) for value in range(1, 101)]
+    assert percentile(values, 0.5) == 50.0
+    assert percentile(values, 0.99) == 99.0
+    assert percentile([], 0.5) == 0.0
+
+
+def test_quick_run_reports_every_metric() -> None:
+    settings = BenchmarkSettings(
+        iterations=50, latency=0.0, concurrency=(1, 4), requests=8, startup=False
+    )
+    results = run(settings)
+    assert results["overhead.handler_ns"] > 0
+    assert results["concurrency.4.throughput_rps"] > 0
+    assert set(results) >= {f"concurrency.{level}.p99_ms" for level in (1, 4)}
+
+
+def test_cli_round_trips_baseline(tmp_path: Path) -> None:
+    baseline = tmp_path / "baseline.json"
+    args = ["--iterations", "20", "--latency", "0", "--concurrency", "2", "--requests", "4"]
+    args.append("--skip-startup")
+    assert main([*args, "--baseline", str(baseline), "--save-baseline"]) == 0
+    assert baseline.exists()
+    assert main([*args, "--baseline", str(baseline), "--threshold", "1000"]) == 0
+
+
+def test_warmup_removes_cold_start_from_first_request() -> None:
+    from benchmarks.startup import measure_first_request
+
+    assert measure_first_request(warmup=True) < measure_first_request(warmup=False)
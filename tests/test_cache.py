@@ -0,0 +1,58 @@
+"""Tests for the response cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from fastmcp_template import ResponseCache, ResponseCacheSettings
+from fastmcp_template.cache import agent_signature, normalize_query
+
+SIGNATURE = ("model", 0.0, "prompt {question}")
+
+
+def test_normalize_query_collapses_whitespace() -> None:
+    assert normalize_query("  What   is\nMCP? ") == "What is MCP?"
+    assert ResponseCache.key("a  b", SIGNATURE) == ResponseCache.key("a b", SIGNATURE)
+
+
+def test_lru_eviction_keeps_recently_used_entries() -> None:
+    cache = ResponseCache(ResponseCacheSettings(max_entries=2))
+    cache.put(("a",), "1")
+    cache.put(("b",), "2")
+    assert cache.get(("a",)) == "1"
+    cache.put(("c",), "3")
+
+    assert cache.get(("b",)) is None
+    assert cache.get(("a",)) == "1"
+    assert cache.snapshot() == {
+        "hits": 2,
+        "misses": 1,
+        "evictions": 1,
+        "expirations": 0,
+        "size": 2,
+    }
+
+
+def test_entries_expire_after_ttl() -> None:
+    now = [0.0]
+    cache = ResponseCache(ResponseCacheSettings(ttl=5.0), clock=lambda: now[0])
+    cache.put(("a",), "1")
+    now[0] = 4.0
+    assert cache.get(("a",)) == "1"
+    now[0] = 6.0
+    assert cache.get(("a",)) is None
+    assert cache.stats.expirations == 1
+    assert len(cache) == 0
+
+
+def test_temperature_threshold() -> None:
+    cache = ResponseCache(ResponseCacheSettings(max_temperature=0.5))
+    assert cache.accepts(("m", 0.2, "p"))
+    assert not cache.accepts(("m", 0.9, "p"))
+    assert cache.accepts(agent_signature(object()))
+    assert ResponseCache(ResponseCacheSettings(max_temperature=None)).accepts(("m", 2.0, "p"))
+
+
+def test_settings_validate_size() -> None:
+    with pytest.raises(ValueError):
+        ResponseCacheSettings(max_entries=0)
@@ -0,0 +1,163 @@
+"""Tests for traffic capture and replay."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+from pathlib import Path
+
+import pytest
+
+from benchmarks.fakes import DummyAgent, server_module
+from benchmarks.replay import ReplaySettings, main, replay
+from fastmcp_template import (
+    CapturedRequest,
+    CaptureSettings,
+    MCPServerBuilder,
+    ServerSettings,
+    TrafficRecorder,
+    read_capture,
+)
+
+
+def test_recorder_writes_compact_lines_and_samples(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.jsonl"
+    recorder = TrafficRecorder(
+        CaptureSettings(path=str(path), sample_rate=0.5), rng=random.Random(3)
+    )
+
+    sampled = [recorder.sample() for _ in range(200)]
+    recorder.record("prompt", {"question": "hi"}, 10.0, 0.25, 12)
+    recorder.record("prompt", {"question": "boom"}, 11.0, 0.5, None, RuntimeError("x"), [0.4])
+    recorder.close()
+
+    assert 60 < sum(sampled) < 140
+    assert recorder.snapshot()["skipped"] == 200 - sum(sampled)
+    assert path.read_text().splitlines()[0] == (
+        '{"t":10.0,"tool":"prompt","p":{"question":"hi"},"l":0.25,"s":12}'
+    )
+    assert list(read_capture(path)) == [
+        CapturedRequest(10.0, "prompt", {"question": "hi"}, 0.25, 12),
+        CapturedRequest(11.0, "prompt", {"question": "boom"}, 0.5, None, "RuntimeError", (0.4,)),
+    ]
+
+
+def test_recorder_rotates_and_reads_backups_oldest_first(tmp_path: Path) -> None:
+    path = tmp_path / "logs" / "traffic.jsonl"
+    recorder = TrafficRecorder(CaptureSettings(path=str(path), max_bytes=200, backups=2))
+
+    for index in range(12):
+        recorder.record("prompt", {"question": f"q{index}"}, float(index), 0.1, 2)
+    recorder.close()
+
+    assert recorder.rotations >= 3
+    assert sorted(file.name for file in path.parent.iterdir()) == [
+        "traffic.jsonl",
+        "traffic.jsonl.1",
+        "traffic.jsonl.2",
+    ]
+    assert all(file.stat().st_size <= 200 for file in path.parent.iterdir())
+    arrivals = [request.arrived for request in read_capture(path)]
+    assert arrivals == sorted(arrivals)
+    assert arrivals[-1] == 11.0
+    assert len(arrivals) < 12
+
+
+def test_capture_settings_validate() -> None:
+    with pytest.raises(ValueError):
+        CaptureSettings(sample_rate=1.5)
+    with pytest.raises(ValueError):
+        CaptureSettings(max_bytes=0)
+
+
+def test_server_captures_invocations(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.jsonl"
+    times = iter([100.0, 100.5])
+    settings = ServerSettings(capture=CaptureSettings(path=str(path)))
+    builder = MCPServerBuilder(lambda: DummyAgent(latency=0.01), settings, server_module())
+    builder._recorder = TrafficRecorder(settings.capture, clock=lambda: next(times))
+    app = builder.build()
+    handler = app.tools[settings.tool_name].handler
+
+    asyncio.run(handler(question="hello", temperature=0.5))
+    asyncio.run(handler(question="bye"))
+    builder._recorder.flush()
+
+    captured = list(read_capture(path))
+    assert [request.arrived for request in captured] == [100.0, 100.5]
+    assert captured[0].payload == {"question": "hello", "temperature": 0.5}
+    assert captured[0].size == len("hello")
+    assert all(len(request.agent_latencies) == 1 for request in captured)
+    assert all(
+        request.latency >= request.agent_latencies[0] >= 0.01 for request in captured
+    )
+    assert builder.stats()["capture"]["recorded"] == 2
+
+
+def test_replay_keeps_recorded_pace_and_latency(tmp_path: Path) -> None:
+    requests = [
+        CapturedRequest(1000.0 + index * 0.2, "prompt", {"question": f"q{index}"}, 0.02, 2)
+        for index in range(10)
+    ]
+
+    results = replay(requests, ReplaySettings(speedup=4.0))
+
+    assert results["replay.requests"] == 10
+    assert results["replay.errors"] == 0
+    assert results["replay.offered_rps"] == pytest.approx(10 / 0.45)
+    assert 15 <= results["replay.p50_ms"] < 200
+    assert results["replay.throughput_rps"] > 0
+
+    path = tmp_path / "traffic.jsonl"
+    path.write_text(
+        "".join(
+            json.dumps({"t": request.arrived, "tool": "prompt", "p": request.payload, "l": 0.0})
+            + "\n"
+            for request in requests
+        )
+    )
+    assert main([str(path), "--speedup", "100"]) == 0
+
+
+def test_replay_invokes_recorded_tools_with_their_arguments() -> None:
+    # End-to-end latencies are far above the agent calls', which drive the fake agent.
+    requests = [
+        CapturedRequest(
+            float(index) * 0.01,
+            "prompt" if index % 2 else "summarise",
+            {"question": f"q{index}", "stream": index % 3 == 0, "traceparent": "00-x"},
+            5.0,
+            2,
+            agent_latencies=(0.01,),
+        )
+        for index in range(8)
+    ]
+
+    results = replay(requests, ReplaySettings(speedup=10.0))
+
+    assert results["replay.errors"] == 0
+    assert results["replay.p99_ms"] < 1000
+
+
+def test_recorder_writes_from_a_background_thread(tmp_path: Path) -> None:
+    path = tmp_path / "traffic.jsonl"
+    recorder = TrafficRecorder(CaptureSettings(path=str(path)))
+    writers: list[str] = []
+    append = recorder._append
+
+    def tracking(line: str) -> None:
+        writers.append(threading.current_thread().name)
+        append(line)
+
+    recorder._append = tracking  # type: ignore[method-assign]
+    recorder.record("prompt", {"question": "hi"}, 1.0, 0.1, 2)
+    recorder.flush()
+
+    assert writers == ["fastmcp-capture-writer"]
+    assert [request.payload for request in read_capture(path)] == [{"question": "hi"}]
+    recorder.close()
+    recorder.record("prompt", {"question": "again"}, 2.0, 0.1, 5)
+    recorder.close()
+    assert len(list(read_capture(path))) == 2
@@ -9,8 +9,10 @@ from typing import Any
 
 import pytest
 
-from fastmcp_template import ClientSettings
+from benchmarks.fakes import client_module, server_module
+from fastmcp_template import ClientSettings, MCPServerBuilder, ServerSettings, TracingSettings
 from fastmcp_template.client import MCPClient
+from fastmcp_template.tracing import parse_traceparent
 
 
 class FakeClient:
@@ -74,3 +76,235 @@ def test_extract_response_text_handles_variations() -> None:
 
     with pytest.raises(TypeError):
         MCPClient._extract_response_text(123)
+
+
+class FlakyClient(FakeClient):
+    """Fake client that fails for prompts starting with ``fail`` and records concurrency."""
+
+    active = 0
+    peak = 0
+    opened = 0
+
+    async def __aenter__(self) -> "FlakyClient":
+        FlakyClient.opened += 1
+        return self
+
+    async def invoke_tool(self, tool_name: str, **payload: Any) -> Any:
+        FlakyClient.active += 1
+        FlakyClient.peak = max(FlakyClient.peak, FlakyClient.active)
+        try:
+            await asyncio.sleep(0.001 * (len(payload["question"]) % 3))
+            if payload["question"].startswith("fail"):
+                raise RuntimeError(payload["question"])
+            return {"result": payload["question"].upper()}
+        finally:
+            FlakyClient.active -= 1
+
+
+@pytest.fixture()
+def flaky_module() -> SimpleNamespace:
+    FlakyClient.active = FlakyClient.peak = FlakyClient.opened = 0
+    return SimpleNamespace(Client=FlakyClient)
+
+
+def test_invoke_many_preserves_order_and_captures_errors(flaky_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=flaky_module)
+    prompts = ["a", "fail-1", "ccc", "bb", "fail-2"] * 4
+
+    results = asyncio.run(client.invoke_many(prompts, concurrency=3))
+
+    assert len(results) == len(prompts)
+    for prompt, result in zip(prompts, results):
+        if prompt.startswith("fail"):
+            assert isinstance(result, RuntimeError)
+        else:
+            assert result == prompt.upper()
+    assert FlakyClient.peak <= 3
+    assert FlakyClient.opened <= 3
+    stats = client.last_batch_stats
+    assert stats is not None
+    assert (stats.total, stats.succeeded, stats.failed) == (20, 12, 8)
+    assert stats.throughput > 0
+
+
+def test_iter_completed_yields_every_index(flaky_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=flaky_module)
+
+    async def scenario() -> list[int]:
+        async with client:
+            seen = [index async for index, _ in client.iter_completed(map(str, range(50)))]
+            assert client.sessions is not None
+            return seen
+
+    assert sorted(asyncio.run(scenario())) == list(range(50))
+
+
+def test_concurrent_batches_share_the_sessions_they_open(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=fastmcp_module)
+
+    async def scenario() -> None:
+        first = client.iter_completed(["a", "b"], concurrency=1)
+        second = client.iter_completed(["c", "d"], concurrency=1)
+        assert (await anext(first))[1] == "A"
+        pool = client.sessions
+        assert (await anext(second))[1] == "C"
+        assert [outcome async for _, outcome in first] == ["B"]
+        assert pool is not None and client.sessions is pool
+        assert [outcome async for _, outcome in second] == ["D"]
+        assert client.sessions is None
+
+        await client.invoke_many(["d"])
+        async with client:
+            await client.invoke_many(["e"])
+            assert client.sessions is not None
+
+    asyncio.run(scenario())
+
+
+def test_invoke_many_reraises_errors_of_the_prompts_iterator(
+    flaky_module: SimpleNamespace,
+) -> None:
+    client = MCPClient(fastmcp_module=flaky_module)
+
+    def prompts() -> Any:
+        yield from ("a", "bb", "ccc")
+        raise KeyError("broken source")
+
+    async def scenario() -> None:
+        await asyncio.wait_for(client.invoke_many(prompts(), concurrency=2), timeout=2)
+
+    with pytest.raises(KeyError, match="broken source"):
+        asyncio.run(scenario())
+    assert FlakyClient.active == 0
+    assert client.sessions is None
+
+
+def test_iter_completed_rejects_invalid_concurrency(flaky_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=flaky_module)
+
+    async def scenario() -> None:
+        async for _ in client.iter_completed(["x"], concurrency=0):
+            pass
+
+    with pytest.raises(ValueError):
+        asyncio.run(scenario())
+
+
+class StreamingClient(FakeClient):
+    """Fake client notifying every word as progress when streaming is requested."""
+
+    async def invoke_tool(self, tool_name: str, *, progress_handler=None, **payload: Any) -> Any:
+        if not payload.get("stream"):
+            return await super().invoke_tool(tool_name, **payload)
+        words = payload["question"].split()
+        for index, word in enumerate(words, start=1):
+            await asyncio.sleep(0)
+            await progress_handler(index, None, word)
+        return {"content": " ".join(words)}
+
+
+def test_stream_yields_chunks_and_records_stats() -> None:
+    client = MCPClient(fastmcp_module=SimpleNamespace(Client=StreamingClient))
+
+    async def collect() -> list[str]:
+        async with client:
+            return [chunk async for chunk in client.stream("a b c")]
+
+    assert asyncio.run(collect()) == ["a", "b", "c"]
+    stats = client.last_stream_stats
+    assert stats is not None
+    assert stats.chunks == 3
+    assert stats.time_to_first_token is not None
+    assert stats.tokens_per_second > 0
+
+
+def test_stream_handles_non_streaming_servers(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=fastmcp_module)
+
+    async def collect() -> list[str]:
+        return [chunk async for chunk in client.stream("whole")]
+
+    assert asyncio.run(collect()) == ["WHOLE"]
+    assert FakeClient.calls[-1][1]["stream"] is True
+
+
+def test_stream_receives_chunks_from_a_streaming_server() -> None:
+    class WordAgent:
+        model_id = "words"
+        temperature = 0.0
+        system_prompt = "{question}"
+
+        async def chat(self, query: str) -> dict[str, str]:
+            return {"result": query}
+
+        async def astream(self, query: str):
+            for word in query.split():
+                yield word + " "
+
+    builder = MCPServerBuilder(WordAgent, ServerSettings(), server_module())
+    client = MCPClient(
+        fastmcp_module=client_module(builder.build()), tool_name=builder.settings.tool_name
+    )
+
+    async def collect() -> list[str]:
+        async with client:
+            return [chunk async for chunk in client.stream("one two")]
+
+    assert asyncio.run(collect()) == ["one ", "two "]
+    assert builder.recent_stream_stats[-1].chunks == 2
+
+
+def test_sync_calls_reuse_persistent_sessions(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=fastmcp_module)
+    client.connect_sync()
+    try:
+        assert client.invoke_sync("one") == "ONE"
+        assert client.invoke_many_sync(["two", "three"], concurrency=2) == ["TWO", "THREE"]
+        assert client.sessions is not None
+        assert client.sessions.stats.opened == 1
+    finally:
+        client.close_sync()
+
+
+def test_deadline_is_sent_when_enabled(fastmcp_module: SimpleNamespace) -> None:
+    settings = ClientSettings(request_timeout=12.0, send_deadline=True)
+    client = MCPClient(settings, fastmcp_module)
+
+    asyncio.run(client.invoke("default"))
+    asyncio.run(client.invoke("explicit", timeout=2.0))
+
+    assert [payload["timeout"] for _, payload in FakeClient.calls] == [12.0, 2.0]
+    asyncio.run(MCPClient(fastmcp_module=fastmcp_module).invoke("off"))
+    assert "timeout" not in FakeClient.calls[-1][1]
+
+
+def test_stream_sends_the_deadline_and_trace_context(fastmcp_module: SimpleNamespace) -> None:
+    settings = ClientSettings(
+        request_timeout=12.0, send_deadline=True, tracing=TracingSettings(sample_rate=1.0)
+    )
+    exported: list[Any] = []
+    client = MCPClient(
+        settings, fastmcp_module, span_exporter=SimpleNamespace(export=exported.append)
+    )
+
+    async def collect() -> list[str]:
+        return [chunk async for chunk in client.stream("streamed")]
+
+    assert asyncio.run(collect()) == ["STREAMED"]
+    _, payload = FakeClient.calls[-1]
+    assert payload["timeout"] == 12.0
+    parent = parse_traceparent(payload["traceparent"])
+    assert parent is not None and parent[1] == exported[0][0].span_id
+
+
+def test_conversation_sends_only_the_new_turn(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=fastmcp_module)
+    conversation = client.conversation()
+
+    asyncio.run(conversation.ask("first"))
+    assert conversation.ask_sync("second") == "SECOND"
+
+    payloads = [payload for _, payload in FakeClient.calls]
+    assert [payload["question"] for payload in payloads] == ["first", "second"]
+    assert {payload["session_id"] for payload in payloads} == {conversation.session_id}
+    assert client.conversation("known").session_id == "known"
@@ -0,0 +1,91 @@
+"""Tests for single-flight request coalescing."""
+
+from __future__ import annotations
+
+import asyncio
+from typing import Any
+
+import pytest
+
+from fastmcp_template import SingleFlight
+
+
+def test_concurrent_callers_share_one_call() -> None:
+    flight = SingleFlight()
+    calls = 0
+
+    async def expensive() -> str:
+        nonlocal calls
+        calls += 1
+        await asyncio.sleep(0.01)
+        return "shared"
+
+    async def scenario() -> list[str]:
+        return await asyncio.gather(*(flight.run("k", expensive) for _ in range(5)))
+
+    assert asyncio.run(scenario()) == ["shared"] * 5
+    assert calls == 1
+    assert flight.snapshot() == {"executed": 1, "coalesced": 4, "cancelled": 0, "in_flight": 0}
+
+
+def test_errors_propagate_to_every_waiter() -> None:
+    flight = SingleFlight()
+
+    async def failing() -> str:
+        await asyncio.sleep(0)
+        raise RuntimeError("backend down")
+
+    async def scenario() -> list[Any]:
+        return await asyncio.gather(
+            *(flight.run("k", failing) for _ in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert all(isinstance(result, RuntimeError) for result in results)
+    assert flight.in_flight() == 0
+
+
+def test_cancelling_one_waiter_keeps_shared_call_running() -> None:
+    flight = SingleFlight()
+
+    async def slow() -> str:
+        await asyncio.sleep(0.01)
+        return "done"
+
+    async def scenario() -> str:
+        first = asyncio.create_task(flight.run("k", slow))
+        second = asyncio.create_task(flight.run("k", slow))
+        await asyncio.sleep(0)
+        first.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await first
+        return await second
+
+    assert asyncio.run(scenario()) == "done"
+    assert flight.stats.cancelled == 0
+
+
+def test_last_waiter_cancellation_cancels_shared_call() -> None:
+    flight = SingleFlight()
+    state: dict[str, bool] = {"cancelled": False}
+
+    async def slow() -> str:
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            state["cancelled"] = True
+            raise
+        return "never"
+
+    async def scenario() -> None:
+        waiters = [asyncio.create_task(flight.run("k", slow)) for _ in range(2)]
+        await asyncio.sleep(0)
+        for waiter in waiters:
+            waiter.cancel()
+        await asyncio.gather(*waiters, return_exceptions=True)
+        await asyncio.sleep(0)
+
+    asyncio.run(scenario())
+    assert state["cancelled"]
+    assert flight.stats.cancelled == 1
+    assert flight.in_flight() == 0
@@ -0,0 +1,95 @@
+"""Tests for the bounded conversation history store."""
+
+from __future__ import annotations
+
+from fastmcp_template import ConversationSettings, ConversationStore
+from fastmcp_template.conversations import format_history
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_history_keeps_turns_in_order() -> None:
+    store = ConversationStore()
+    store.append("s", "hi", "hello")
+    store.append("s", "how are you?", "fine")
+
+    history = store.history("s")
+
+    assert [(turn.question, turn.answer) for turn in history] == [
+        ("hi", "hello"),
+        ("how are you?", "fine"),
+    ]
+    assert store.history("unknown") == []
+    assert store.snapshot()["turns"] == 2
+
+
+def test_turn_and_token_limits_trim_oldest_turns() -> None:
+    store = ConversationStore(ConversationSettings(max_turns=2, max_tokens=10))
+    for index in range(3):
+        store.append("s", f"q{index}", f"a{index}")
+    assert [turn.question for turn in store.history("s")] == ["q1", "q2"]
+
+    store.append("s", "x" * 40, "y")
+    assert [turn.question for turn in store.history("s")] == []
+    assert store.stats.trimmed_turns == 4
+    assert store.memory_bytes == 0
+
+
+def test_least_recently_used_sessions_are_evicted() -> None:
+    store = ConversationStore(ConversationSettings(max_sessions=2))
+    store.append("a", "q", "a")
+    store.append("b", "q", "a")
+    store.history("a")
+    store.append("c", "q", "a")
+
+    assert store.history("b") == []
+    assert len(store) == 2
+    assert store.stats.evictions == 1
+
+
+def test_memory_cap_evicts_sessions() -> None:
+    store = ConversationStore(ConversationSettings(max_bytes=10))
+    store.append("a", "12345", "")
+    store.append("b", "123456", "")
+
+    assert len(store) == 1
+    assert store.memory_bytes == 6
+    assert store.snapshot()["evictions"] == 1
+
+
+def test_idle_sessions_expire() -> None:
+    clock = FakeClock()
+    store = ConversationStore(ConversationSettings(ttl=10.0), clock=clock)
+    store.append("a", "q", "a")
+    clock.now = 5.0
+    store.append("b", "q", "a")
+    clock.now = 12.0
+    store.append("c", "q", "a")
+
+    assert len(store) == 2
+    assert store.history("b") != []
+    clock.now = 30.0
+    assert store.history("b") == []
+    assert store.stats.expirations == 2
+
+
+def test_format_history_renders_turns_before_the_question() -> None:
+    store = ConversationStore()
+    store.append("s", "Who wrote Hamlet?", "Shakespeare.")
+
+    prompt = format_history(store.history("s"), "When?")
+
+    assert prompt.splitlines() == [
+        "Conversation so far:",
+        "User: Who wrote Hamlet?",
+        "Assistant: Shakespeare.",
+        "",
+        "Current question: When?",
+    ]
+    assert format_history([], "alone") == "alone"
@@ -0,0 +1,86 @@
+"""Tests for deadline enforcement and abandoned-call accounting."""
+
+from __future__ import annotations
+
+import asyncio
+
+import pytest
+
+from fastmcp_template import DeadlineExceededError, DeadlineTracker
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_budget_reads_the_timeout_argument() -> None:
+    tracker = DeadlineTracker()
+
+    assert tracker.budget({"question": "q"}) is None
+    assert tracker.budget({"timeout": "2.5"}) == 2.5
+    with pytest.raises(DeadlineExceededError):
+        tracker.budget({"timeout": 0})
+    assert tracker.stats.rejected == 1
+
+
+@pytest.mark.parametrize("value", ["soon", [1], "nan"])
+def test_budget_rejects_timeouts_that_are_not_numbers(value: object) -> None:
+    with pytest.raises(ValueError, match="number of seconds"):
+        DeadlineTracker().budget({"timeout": value})
+
+
+def test_enforce_converts_expiry_into_deadline_error() -> None:
+    tracker = DeadlineTracker()
+
+    async def scenario() -> None:
+        async with tracker.enforce(0.01):
+            await asyncio.sleep(1)
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(scenario())
+    assert tracker.stats.expired == 1
+
+
+def test_enforce_leaves_unrelated_timeouts_alone() -> None:
+    tracker = DeadlineTracker()
+
+    async def scenario() -> None:
+        async with tracker.enforce(10):
+            raise TimeoutError("backend timed out")
+
+    with pytest.raises(TimeoutError, match="backend"):
+        asyncio.run(scenario())
+    assert tracker.stats.expired == 0
+
+
+def test_cancelled_calls_count_the_time_they_would_have_taken() -> None:
+    clock = FakeClock()
+    tracker = DeadlineTracker(alpha=0.5, clock=clock)
+
+    async def call(duration: float) -> None:
+        async with tracker.track_call():
+            clock.now += duration
+            await asyncio.sleep(0)
+
+    async def abandoned() -> None:
+        async with tracker.track_call():
+            clock.now += 1.0
+            await asyncio.sleep(1)
+
+    async def scenario() -> None:
+        await call(4.0)
+        await call(2.0)
+        task = asyncio.create_task(abandoned())
+        await asyncio.sleep(0)
+        task.cancel()
+        with pytest.raises(asyncio.CancelledError):
+            await task
+
+    asyncio.run(scenario())
+
+    assert tracker.stats.cancelled == 1
+    assert tracker.stats.saved_seconds == pytest.approx(2.0)
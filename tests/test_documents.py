@@ -0,0 +1,122 @@
+"""Tests for map-reduce answering of large documents."""
+
+from __future__ import annotations
+
+import asyncio
+from pathlib import Path
+
+import pytest
+
+from fastmcp_template import DocumentProcessor, DocumentSettings
+from fastmcp_template.documents import DocumentProgress, iter_file, split_chunks
+
+
+def test_split_chunks_bounds_size_and_overlaps_neighbours() -> None:
+    text = " ".join(f"word{i}" for i in range(500))
+    blocks = [text[i : i + 97] for i in range(0, len(text), 97)]
+
+    chunks = list(split_chunks(blocks, chunk_chars=200, overlap_chars=20))
+
+    assert all(len(chunk) <= 200 for chunk in chunks)
+    assert all(chunk.endswith(" ") for chunk in chunks[:-1])
+    for previous, current in zip(chunks, chunks[1:]):
+        assert current.startswith(previous[-20:])
+    assert "word0 " in chunks[0] and chunks[-1].endswith("word499")
+
+
+def test_split_chunks_keeps_short_text_whole() -> None:
+    assert list(split_chunks(["short"], chunk_chars=200, overlap_chars=20)) == ["short"]
+    assert list(split_chunks([], chunk_chars=200, overlap_chars=20)) == []
+
+
+def test_iter_file_decodes_characters_split_across_blocks(tmp_path: Path) -> None:
+    path = tmp_path / "doc.txt"
+    path.write_text("héllo wörld" * 10, encoding="utf-8")
+
+    assert "".join(iter_file(path, block_size=3)) == "héllo wörld" * 10
+    (tmp_path / "empty.txt").touch()
+    assert list(iter_file(tmp_path / "empty.txt")) == []
+
+
+def test_map_reduce_answers_every_chunk_and_reduces_in_a_tree() -> None:
+    settings = DocumentSettings(
+        concurrency=3,
+        fan_in=3,
+        map_prompt="map:{chunk}",
+        reduce_prompt="reduce:{answers}",
+    )
+    processor = DocumentProcessor(settings)
+    in_flight = peak = 0
+    reports: list[DocumentProgress] = []
+
+    async def ask(prompt: str) -> str:
+        nonlocal in_flight, peak
+        in_flight += 1
+        peak = max(peak, in_flight)
+        await asyncio.sleep(0.001)
+        in_flight -= 1
+        return prompt.removeprefix("map:") if prompt.startswith("map:") else "R"
+
+    async def progress(state: DocumentProgress) -> None:
+        reports.append(DocumentProgress(state.chunks, state.total, state.mapped, state.reduced))
+
+    chunks = [f"c{i}" for i in range(10)]
+    result = asyncio.run(processor.run("q", chunks, ask, progress))
+
+    assert result == "R"
+    assert peak == 3
+    # 10 chunks -> 4 groups -> 2 groups -> 1 answer; the single tail chunk is promoted.
+    assert processor.snapshot() == {
+        "documents": 1,
+        "active": 0,
+        "chunks": 10,
+        "map_calls": 10,
+        "reduce_calls": 5,
+    }
+    assert reports[-1].mapped == 10 and reports[-1].total == 10
+
+
+def test_single_chunk_is_answered_without_reduce() -> None:
+    processor = DocumentProcessor(DocumentSettings(map_prompt="{chunk}"))
+
+    async def ask(prompt: str) -> str:
+        return prompt.upper()
+
+    assert asyncio.run(processor.run("q", processor.chunks_of("tiny"), ask)) == "TINY"
+    assert asyncio.run(processor.run("q", processor.chunks_of(""), ask)) == ""
+    assert processor.reduce_calls == 0
+
+
+def test_failed_calls_wait_for_the_cancelled_ones() -> None:
+    processor = DocumentProcessor(DocumentSettings(concurrency=3, map_prompt="{chunk}"))
+    cancelled: list[str] = []
+
+    async def ask(prompt: str) -> str:
+        if prompt == "bad":
+            raise RuntimeError(prompt)
+        try:
+            await asyncio.sleep(1)
+        except asyncio.CancelledError:
+            cancelled.append(prompt)
+            raise
+        return prompt
+
+    async def scenario() -> None:
+        with pytest.raises(RuntimeError):
+            await processor.run("q", ["a", "b", "bad"], ask)
+        assert sorted(cancelled) == ["a", "b"]
+
+    asyncio.run(scenario())
+
+
+def test_paths_outside_allowed_directories_are_refused(tmp_path: Path) -> None:
+    allowed = tmp_path / "docs"
+    allowed.mkdir()
+    (allowed / "a.txt").write_text("inside", encoding="utf-8")
+    processor = DocumentProcessor(DocumentSettings(allowed_paths=[str(allowed)]))
+
+    assert list(processor.chunks_of(path=str(allowed / "a.txt"))) == ["inside"]
+    with pytest.raises(PermissionError):
+        processor.chunks_of(path=str(allowed / ".." / "secret.txt"))
+    with pytest.raises(PermissionError):
+        DocumentProcessor().chunks_of(path=str(allowed / "a.txt"))
@@ -0,0 +1,221 @@
+"""Tests for multi-server selection, circuit breaking and retries."""
+
+from __future__ import annotations
+
+import asyncio
+import random
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from fastmcp_template import (
+    CircuitBreaker,
+    CircuitOpenError,
+    ClientSettings,
+    FailoverSettings,
+    MCPClient,
+    ServerSelector,
+)
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+def test_breaker_opens_fails_fast_and_probes_when_half_open() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(FailoverSettings(failure_threshold=2, reset_timeout=5.0), clock=clock)
+    for _ in range(2):
+        assert breaker.acquire()
+        breaker.record_failure()
+    assert breaker.state == "open"
+    assert not breaker.acquire()
+
+    clock.now = 5.0
+    assert breaker.state == "half_open"
+    assert breaker.acquire()
+    assert not breaker.acquire()
+    breaker.record_failure()
+    assert breaker.state == "open"
+
+    clock.now = 10.0
+    probe = breaker.acquire()
+    assert probe
+    breaker.record_success(probe)
+    assert breaker.state == "closed"
+    assert breaker.stats.opened == 2
+    assert breaker.stats.rejected == 2
+    assert breaker.stats.probes == 2
+
+
+def test_only_probes_free_half_open_probe_slots() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(FailoverSettings(failure_threshold=1, reset_timeout=5.0), clock=clock)
+    slow = breaker.acquire()
+    failing = breaker.acquire()
+    assert slow is not None and slow.probe is None
+    breaker.record_failure(failing)
+
+    clock.now = 5.0
+    probe = breaker.acquire()
+    assert probe is not None and probe.probe is not None
+    # The call reserved while closed ends without an outcome, e.g. cancelled.
+    breaker.release(slow)
+    assert breaker.acquire() is None
+    breaker.release(probe)
+    assert breaker.acquire() is not None
+
+
+def test_calls_reserved_before_the_circuit_opened_do_not_close_it() -> None:
+    clock = FakeClock()
+    breaker = CircuitBreaker(FailoverSettings(failure_threshold=1, reset_timeout=5.0), clock=clock)
+    slow = breaker.acquire()
+    breaker.record_failure(breaker.acquire())
+
+    breaker.record_success(slow)
+    assert breaker.state == "open"
+    clock.now = 5.0
+    probe = breaker.acquire()
+    breaker.record_success(slow)
+    assert breaker.state == "half_open"
+    breaker.record_success(probe)
+    assert breaker.state == "closed"
+
+
+def test_round_robin_rotates_and_skips_open_circuits() -> None:
+    selector = ServerSelector(["a", "b", "c"])
+    assert [selector.select() for _ in range(3)] == ["a", "b", "c"]
+
+    for _ in range(selector.settings.failure_threshold):
+        selector.breakers["b"].acquire()
+        selector.breakers["b"].record_failure()
+    assert [selector.select() for _ in range(4)] == ["a", "c", "c", "a"]
+
+
+def test_lowest_latency_prefers_the_fastest_server() -> None:
+    selector = ServerSelector(["a", "b"], FailoverSettings(policy="lowest_latency"))
+    selector.latency.update({"a": 0.5, "b": 0.1})
+
+    assert {selector.select() for _ in range(4)} == {"b"}
+
+
+def test_failed_invocation_is_retried_on_another_server() -> None:
+    settings = FailoverSettings(max_attempts=3, backoff=0.001)
+    selector = ServerSelector(["a", "b"], settings, rng=random.Random(0))
+    seen: list[str] = []
+
+    async def call(url: str) -> str:
+        seen.append(url)
+        if url == "a":
+            raise ConnectionError("a is down")
+        return url
+
+    assert asyncio.run(selector.invoke(call)) == "b"
+    assert seen == ["a", "b"]
+    assert selector.snapshot()["retries"] == 1
+    assert selector.snapshot()["servers"]["a"]["failures"] == 1
+
+
+def test_application_errors_are_not_retried() -> None:
+    selector = ServerSelector(["a", "b"])
+    calls = 0
+
+    async def call(url: str) -> str:
+        nonlocal calls
+        calls += 1
+        raise ValueError("bad prompt")
+
+    with pytest.raises(ValueError):
+        asyncio.run(selector.invoke(call))
+    assert calls == 1
+    assert selector.breakers["a"].state == "closed"
+
+
+def test_open_circuits_fail_fast() -> None:
+    selector = ServerSelector(["a"], FailoverSettings(failure_threshold=1, max_attempts=1))
+
+    async def failing(url: str) -> str:
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(selector.invoke(failing))
+    with pytest.raises(CircuitOpenError):
+        asyncio.run(selector.invoke(failing))
+    assert selector.rejected == 1
+
+
+def test_client_keeps_serving_during_a_partial_outage() -> None:
+    down = {"http://b"}
+    answered: list[str] = []
+
+    class FakeServerClient:
+        def __init__(self, *, server_url: str, **options: Any) -> None:
+            self.server_url = server_url
+
+        async def __aenter__(self) -> FakeServerClient:
+            if self.server_url in down:
+                raise ConnectionRefusedError(self.server_url)
+            return self
+
+        async def __aexit__(self, *exc_info: object) -> None:
+            return None
+
+        async def invoke_tool(self, tool_name: str, **payload: Any) -> Any:
+            answered.append(self.server_url)
+            return {"result": payload["question"]}
+
+    settings = ClientSettings(
+        server_urls=["http://a", "http://b", "http://c"],
+        failover=FailoverSettings(failure_threshold=2, backoff=0.001),
+    )
+    client = MCPClient(settings, SimpleNamespace(Client=FakeServerClient))
+
+    async def scenario() -> list[str]:
+        return [await client.invoke(f"q{index}") for index in range(12)]
+
+    assert asyncio.run(scenario()) == [f"q{index}" for index in range(12)]
+    assert set(answered) == {"http://a", "http://c"}
+    assert client.servers is not None
+    snapshot = client.servers.snapshot()
+    assert snapshot["servers"]["http://b"]["state"] == "open"
+    assert snapshot["servers"]["http://b"]["failures"] == 2
+
+
+def test_client_streams_feed_the_circuit_breakers() -> None:
+    class FakeServerClient:
+        def __init__(self, *, server_url: str, **options: Any) -> None:
+            self.server_url = server_url
+
+        async def __aenter__(self) -> FakeServerClient:
+            if self.server_url == "http://b":
+                raise ConnectionRefusedError(self.server_url)
+            return self
+
+        async def __aexit__(self, *exc_info: object) -> None:
+            return None
+
+        async def invoke_tool(self, tool_name: str, **payload: Any) -> Any:
+            return {"result": payload["question"]}
+
+    settings = ClientSettings(
+        server_urls=["http://a", "http://b"], failover=FailoverSettings(failure_threshold=1)
+    )
+    client = MCPClient(settings, SimpleNamespace(Client=FakeServerClient))
+
+    async def collect() -> list[str]:
+        return [chunk async for chunk in client.stream("hello")]
+
+    assert asyncio.run(collect()) == ["hello"]
+    with pytest.raises(ConnectionRefusedError):
+        asyncio.run(collect())
+    assert asyncio.run(collect()) == ["hello"]
+    assert client.servers is not None
+    servers = client.servers.snapshot()["servers"]
+    assert servers["http://a"]["requests"] == 2
+    assert servers["http://b"]["state"] == "open"
+    assert servers["http://b"]["failures"] == 1
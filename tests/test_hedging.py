@@ -0,0 +1,163 @@
+"""Tests for hedged invocations."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from fastmcp_template import (
+    ClientSettings,
+    FailoverSettings,
+    Hedger,
+    HedgingSettings,
+    MCPClient,
+)
+
+
+def warmed_hedger(**overrides: Any) -> Hedger:
+    settings = HedgingSettings(**{"percentile": 0.5, "window": 10, "min_samples": 4, **overrides})
+    hedger = Hedger(settings)
+    for latency in (0.01, 0.01, 0.01, 0.01):
+        hedger.observe(latency)
+    return hedger
+
+
+class SlowThenFast:
+    """Call whose first invocation hangs until cancelled and later ones answer."""
+
+    def __init__(self) -> None:
+        self.calls = 0
+        self.cancelled = 0
+
+    async def __call__(self) -> str:
+        self.calls += 1
+        attempt = self.calls
+        if attempt == 1:
+            try:
+                await asyncio.sleep(10)
+            except asyncio.CancelledError:
+                self.cancelled += 1
+                raise
+        return f"attempt {attempt}"
+
+
+def test_delay_follows_the_configured_percentile() -> None:
+    hedger = Hedger(HedgingSettings(percentile=0.9, window=10, min_samples=10))
+    for latency in range(1, 10):
+        hedger.observe(latency / 100)
+    assert hedger.delay() is None
+
+    hedger.observe(0.10)
+    assert hedger.delay() == 0.10
+
+
+def test_slow_call_is_hedged_and_loser_cancelled() -> None:
+    hedger = warmed_hedger()
+    call = SlowThenFast()
+
+    async def scenario() -> tuple[str, int]:
+        result = await hedger.run(call)
+        # The loser has finished cancelling by the time run returns.
+        return result, call.cancelled
+
+    assert asyncio.run(scenario()) == ("attempt 2", 1)
+    assert hedger.snapshot()["hedged"] == 1
+    assert hedger.stats.won == 1
+
+
+def test_budget_caps_hedges() -> None:
+    hedger = warmed_hedger(budget_ratio=0.0, budget_burst=1.0)
+
+    async def slow() -> str:
+        await asyncio.sleep(0.03)
+        return "done"
+
+    async def scenario() -> list[str]:
+        return [await hedger.run(slow) for _ in range(3)]
+
+    assert asyncio.run(scenario()) == ["done"] * 3
+    assert hedger.stats.hedged == 1
+    assert hedger.stats.throttled == 2
+
+
+def test_error_is_raised_when_every_call_fails() -> None:
+    hedger = warmed_hedger()
+
+    async def failing() -> str:
+        await asyncio.sleep(0.02)
+        raise ConnectionError("down")
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(hedger.run(failing))
+    assert hedger.stats.hedged == 1
+
+
+def test_client_hedges_slow_invocations_but_not_conversations() -> None:
+    calls: list[dict[str, Any]] = []
+
+    class FlakyClient:
+        def __init__(self, **options: Any) -> None:
+            pass
+
+        async def __aenter__(self) -> FlakyClient:
+            return self
+
+        async def __aexit__(self, *exc_info: object) -> None:
+            return None
+
+        async def invoke_tool(self, tool_name: str, **payload: Any) -> Any:
+            calls.append(payload)
+            if len(calls) % 2:
+                await asyncio.sleep(0.2)
+            return {"result": payload["question"]}
+
+    settings = ClientSettings(hedging=HedgingSettings(min_samples=1, window=1))
+    client = MCPClient(settings, SimpleNamespace(Client=FlakyClient))
+    assert client.hedger is not None
+    client.hedger.observe(0.01)
+
+    async def scenario() -> tuple[str, str]:
+        hedged = await client.invoke("hedge me")
+        turn = await client.invoke("turn", session_id="s")
+        return hedged, turn
+
+    assert asyncio.run(scenario()) == ("hedge me", "turn")
+    assert [payload["question"] for payload in calls] == ["hedge me", "hedge me", "turn"]
+    assert client.hedger.snapshot()["won"] == 1
+
+
+def test_client_hedges_on_another_server() -> None:
+    answered: list[str] = []
+
+    class ServerClient:
+        def __init__(self, *, server_url: str, **options: Any) -> None:
+            self.server_url = server_url
+
+        async def __aenter__(self) -> ServerClient:
+            return self
+
+        async def __aexit__(self, *exc_info: object) -> None:
+            return None
+
+        async def invoke_tool(self, tool_name: str, **payload: Any) -> Any:
+            if self.server_url == "http://slow":
+                await asyncio.sleep(0.2)
+            answered.append(self.server_url)
+            return {"result": self.server_url}
+
+    settings = ClientSettings(
+        server_urls=["http://slow", "http://fast"],
+        failover=FailoverSettings(policy="lowest_latency"),
+        hedging=HedgingSettings(min_samples=1, window=1),
+    )
+    client = MCPClient(settings, SimpleNamespace(Client=ServerClient))
+    assert client.hedger is not None and client.servers is not None
+    client.hedger.observe(0.01)
+    # The slow server looks fastest, so only exclusion sends the hedge elsewhere.
+    client.servers.latency.update({"http://slow": 0.001, "http://fast": 0.5})
+
+    assert asyncio.run(client.invoke("q")) == "http://fast"
+    assert answered == ["http://fast"]
@@ -8,6 +8,7 @@ import types
 
 import pytest
 
+from fastmcp_template.conversations import Turn
 from fastmcp_template.llm import Agent
 
 
@@ -26,9 +27,10 @@ class FakePromptTemplate:
 
 
 class FakeModel:
-    def __init__(self, *, model: str, temperature: float):
+    def __init__(self, *, model: str, temperature: float, base_url: str | None = None):
         self.model = model
         self.temperature = temperature
+        self.base_url = base_url
 
     async def ainvoke(self, payload: dict[str, str]) -> str:
         return f"{self.model}:{payload['question']}@{self.temperature}"
@@ -41,6 +43,19 @@ class FakeChain:
     async def ainvoke(self, payload: dict[str, str]) -> str:
         return await self.model.ainvoke(payload)
 
+    async def abatch(self, inputs: list[dict[str, str]], *, return_exceptions: bool = False):
+        results: list[object] = []
+        for payload in inputs:
+            if payload["question"] == "boom":
+                results.append(RuntimeError("boom"))
+            else:
+                results.append(await self.model.ainvoke(payload))
+        return results
+
+    async def astream(self, payload: dict[str, str]):
+        for token in (await self.model.ainvoke(payload)).split(":"):
+            yield token
+
 
 @pytest.fixture(autouse=True)
 def patch_langchain(monkeypatch: pytest.MonkeyPatch) -> None:
@@ -60,3 +75,35 @@ def test_chat_sync_reuses_async() -> None:
     agent = Agent(model_id="another-model")
     result = agent.chat_sync("ping")
     assert result["result"].startswith("another-model:ping")
+
+
+def test_astream_yields_chunks() -> None:
+    agent = Agent(model_id="stream-model", temperature=0.0)
+
+    async def collect() -> list[str]:
+        return [chunk async for chunk in agent.astream("hi")]
+
+    assert asyncio.run(collect()) == ["stream-model", "hi@0.0"]
+
+
+def test_chat_batch_isolates_failures() -> None:
+    agent = Agent(model_id="batch-model", temperature=0.0)
+    ok, failed = asyncio.run(agent.chat_batch(["hi", "boom"]))
+    assert ok == {"result": "batch-model:hi@0.0"}
+    assert isinstance(failed, RuntimeError)
+
+
+def test_base_url_is_forwarded_only_when_set() -> None:
+    assert Agent()._model.base_url is None
+    agent = Agent(base_url="http://gpu-1:11434")
+    assert agent._model.base_url == "http://gpu-1:11434"
+
+
+def test_chat_with_history_formats_previous_turns() -> None:
+    agent = Agent(model_id="m", temperature=0.0)
+    history = [Turn("hi", "hello", 2, 7)]
+
+    result = asyncio.run(agent.chat_with_history("next", history))
+
+    assert result["result"].startswith("m:Conversation so far:\nUser: hi\nAssistant: hello")
+    assert result["result"].endswith("Current question: next@0.0")
@@ -0,0 +1,162 @@
+"""Tests for the metrics primitives and their server/client integration."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+from fastmcp_template import (
+    ClientSettings,
+    Histogram,
+    MCPClient,
+    MCPServerBuilder,
+    MetricsRegistry,
+    ServerSettings,
+)
+from fastmcp_template.metrics import merge_snapshots
+
+
+def test_histogram_buckets_and_quantiles() -> None:
+    hist = Histogram((1, 5, 10))
+    for value in (0.5, 2, 3, 7, 50):
+        hist.observe(value)
+
+    snapshot = hist.snapshot()
+    assert snapshot["buckets"] == {"1": 1, "5": 3, "10": 4, "+Inf": 5}
+    assert snapshot["count"] == 5
+    assert snapshot["sum"] == 62.5
+    assert hist.quantile(0.5) == 5
+    assert hist.quantile(1.0) == float("inf")
+    assert Histogram().quantile(0.9) == 0.0
+
+
+def test_prometheus_rendering() -> None:
+    registry = MetricsRegistry("demo", ("llm",))
+    registry.observe("llm", 0.2)
+    registry.record_request(output_size=10)
+    registry.record_error(ValueError("bad"))
+
+    text = registry.render_prometheus()
+    assert "demo_requests_total 2" in text
+    assert 'demo_errors_total{type="ValueError"} 1' in text
+    assert 'demo_stage_seconds_bucket{stage="llm",le="0.25"} 1' in text
+    assert 'demo_stage_seconds_count{stage="llm"} 1' in text
+    assert 'demo_output_chars_bucket{le="16"} 1' in text
+    assert text.endswith("\n")
+
+
+class _Agent:
+    async def chat(self, query: str) -> dict[str, str]:
+        if query == "fail":
+            raise RuntimeError("boom")
+        return {"result": query * 3}
+
+
+class _Tool:
+    def __init__(self, name: str, description: str, handler: Any):
+        self.handler = handler
+
+
+class _App:
+    def __init__(self, **_: Any):
+        self.tools: list[_Tool] = []
+
+    def register_tool(self, tool: _Tool) -> None:
+        self.tools.append(tool)
+
+
+def test_merge_snapshots_sums_numbers_recursively() -> None:
+    first = MetricsRegistry("a", ("total",))
+    second = MetricsRegistry("a", ("total",))
+    first.observe("total", 0.002)
+    first.record_request(10)
+    second.observe("total", 0.2)
+    second.record_error(ValueError())
+
+    merged = merge_snapshots([first.snapshot(), second.snapshot(), {"latency": None}])
+
+    assert merged["requests"] == 2
+    assert merged["errors"] == {"ValueError": 1}
+    assert merged["stages"]["total"]["count"] == 2
+    assert merged["stages"]["total"]["buckets"]["+Inf"] == 2
+    assert merged["latency"] is None
+
+
+def test_merge_snapshots_keeps_gauges_and_recomputes_ratios() -> None:
+    workers = [
+        {"admission": {"limit": 8, "in_flight": 3, "admitted": 10}},
+        {"admission": {"limit": 6, "in_flight": 5, "admitted": 4}},
+        {"semantic_cache": {"hits": 8, "misses": 2, "hit_rate": 0.8}},
+        {"semantic_cache": {"hits": 0, "misses": 10, "hit_rate": 0.0}},
+    ]
+
+    merged = merge_snapshots(workers)
+
+    assert merged["admission"] == {"limit": 8, "in_flight": 5, "admitted": 14}
+    assert merged["semantic_cache"]["hit_rate"] == 0.4
+
+
+def test_server_metrics_are_disabled_by_default() -> None:
+    builder = MCPServerBuilder(_Agent, ServerSettings(), SimpleNamespace(FastMCP=_App, Tool=_Tool))
+    asyncio.run(builder.build().tools[0].handler(question="hi"))
+    assert builder.metrics is None
+    assert builder.stats() == {}
+
+
+def test_server_records_stage_latencies_and_errors() -> None:
+    fastmcp = SimpleNamespace(FastMCP=_App, Tool=_Tool)
+    builder = MCPServerBuilder(_Agent, ServerSettings(metrics=True), fastmcp)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> None:
+        await handler(question="abc")
+        try:
+            await handler(question="fail")
+        except RuntimeError:
+            pass
+
+    asyncio.run(scenario())
+    snapshot = builder.stats()["metrics"]
+    assert snapshot["requests"] == 2
+    assert snapshot["errors"] == {"RuntimeError": 1}
+    stages = snapshot["stages"]
+    assert stages["extract"]["count"] == 2
+    assert stages["acquire"]["count"] == 2
+    assert stages["llm"]["count"] == 1
+    assert stages["wrap"]["count"] == 1
+    assert stages["total"]["count"] == 2
+    assert snapshot["output_size"]["count"] == 1
+
+
+def test_client_records_stage_latencies() -> None:
+    class Client:
+        def __init__(self, **_: Any) -> None:
+            pass
+
+        async def __aenter__(self) -> "Client":
+            return self
+
+        async def __aexit__(self, *exc_info: object) -> None:
+            return None
+
+        async def invoke_tool(self, tool_name: str, **payload: Any) -> Any:
+            return {"result": payload["question"]}
+
+    client = MCPClient(ClientSettings(metrics=True), SimpleNamespace(Client=Client))
+
+    async def scenario() -> None:
+        await client.invoke("one-shot")
+        async with client:
+            await client.invoke("pooled")
+
+    asyncio.run(scenario())
+    assert client.metrics is not None
+    stages = client.metrics.snapshot()["stages"]
+    assert {stage: stages[stage]["count"] for stage in stages} == {
+        "connect": 2,
+        "call": 2,
+        "extract": 2,
+        "total": 2,
+    }
+    assert "fastmcp_client_requests_total 2" in client.metrics.render_prometheus()
@@ -0,0 +1,42 @@
+"""Tests for the package's lazy public interface."""
+
+from __future__ import annotations
+
+import subprocess
+import sys
+from pathlib import Path
+
+import pytest
+
+import fastmcp_template
+
+SRC = Path(__file__).resolve().parents[1] / "src"
+
+
+def test_client_import_does_not_load_server_side_modules() -> None:
+    code = (
+        f"import sys; sys.path.insert(0, {str(SRC)!r}); "
+        "from fastmcp_template import MCPClient, ClientSettings; "
+        "print(','.join(sorted(m for m in sys.modules "
+        "if m.startswith(('fastmcp_template', 'langchain')))))"
+    )
+    loaded = subprocess.run(
+        [sys.executable, "-c", code], capture_output=True, check=True, text=True
+    ).stdout.strip().split(",")
+
+    assert "fastmcp_template.client" in loaded
+    for module in ("fastmcp_template.server", "fastmcp_template.llm", "fastmcp_template.pool"):
+        assert module not in loaded
+    assert not any(module.startswith("langchain") for module in loaded)
+
+
+def test_every_public_name_resolves() -> None:
+    assert sorted(fastmcp_template.__all__) == sorted(fastmcp_template._EXPORTS)
+    for name in fastmcp_template.__all__:
+        assert getattr(fastmcp_template, name) is not None
+    assert set(fastmcp_template.__all__) <= set(dir(fastmcp_template))
+
+
+def test_unknown_attribute_raises_attribute_error() -> None:
+    with pytest.raises(AttributeError):
+        getattr(fastmcp_template, "DoesNotExist")
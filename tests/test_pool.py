@@ -0,0 +1,152 @@
+"""Tests for the reusable agent pool."""
+
+from __future__ import annotations
+
+import asyncio
+from dataclasses import dataclass
+from typing import Any
+
+import pytest
+
+from fastmcp_template import AgentPool, AgentPoolSettings
+
+
+@dataclass
+class CountingAgent:
+    """Agent recording the configuration it was built with."""
+
+    model_id: str = "default"
+
+    async def chat(self, query: str) -> dict[str, str]:
+        await asyncio.sleep(0)
+        return {"result": f"{self.model_id}:{query}"}
+
+
+class Factory:
+    def __init__(self) -> None:
+        self.built: list[CountingAgent] = []
+
+    def __call__(self, **overrides: Any) -> CountingAgent:
+        agent = CountingAgent(**overrides)
+        self.built.append(agent)
+        return agent
+
+
+def test_lease_reuses_released_agent() -> None:
+    factory = Factory()
+    pool = AgentPool(factory, AgentPoolSettings(max_size=2))
+
+    async def scenario() -> None:
+        async with pool.lease() as first:
+            pass
+        async with pool.lease() as second:
+            assert second is first
+
+    asyncio.run(scenario())
+    assert len(factory.built) == 1
+    assert pool.snapshot()["hits"] == 1
+    assert pool.snapshot()["creations"] == 1
+
+
+def test_pool_bounds_concurrent_leases() -> None:
+    factory = Factory()
+    pool = AgentPool(factory, AgentPoolSettings(max_size=2))
+    active = 0
+    peak = 0
+
+    async def use() -> None:
+        nonlocal active, peak
+        async with pool.lease() as agent:
+            active += 1
+            peak = max(peak, active)
+            await agent.chat("hi")
+            active -= 1
+
+    async def scenario() -> None:
+        await asyncio.gather(*(use() for _ in range(10)))
+
+    asyncio.run(scenario())
+    assert peak == 2
+    assert len(factory.built) == 2
+    stats = pool.snapshot()
+    assert stats["waits"] > 0
+    assert stats["in_use"] == 0
+    assert stats["idle"] == 2
+
+
+def test_keys_isolate_configurations() -> None:
+    factory = Factory()
+    pool = AgentPool(factory, AgentPoolSettings(max_size=1))
+
+    async def scenario() -> None:
+        async with pool.lease(model_id="small") as small:
+            async with pool.lease(model_id="large") as large:
+                assert (small.model_id, large.model_id) == ("small", "large")
+
+    asyncio.run(scenario())
+    assert pool.snapshot()["keys"] == 2
+    with pytest.raises(ValueError):
+        asyncio.run(pool.lease(api_key="secret").__aenter__())
+
+
+def test_idle_agents_are_evicted_above_min_size() -> None:
+    now = [0.0]
+    factory = Factory()
+    settings = AgentPoolSettings(min_size=1, max_size=3, idle_timeout=10.0)
+    pool = AgentPool(factory, settings, clock=lambda: now[0])
+
+    async def hold_three() -> None:
+        async with pool.lease(), pool.lease(), pool.lease():
+            pass
+
+    asyncio.run(hold_three())
+    assert pool.snapshot()["idle"] == 3
+
+    now[0] = 60.0
+
+    async def reuse() -> None:
+        async with pool.lease():
+            pass
+
+    asyncio.run(reuse())
+    stats = pool.snapshot()
+    assert stats["evictions"] == 2
+    assert stats["idle"] == 1
+
+
+def test_cancelled_waiter_does_not_leak_agent() -> None:
+    pool = AgentPool(Factory(), AgentPoolSettings(max_size=1))
+
+    async def scenario() -> None:
+        async with pool.lease():
+            waiter = asyncio.create_task(pool.lease().__aenter__())
+            await asyncio.sleep(0)
+            waiter.cancel()
+            with pytest.raises(asyncio.CancelledError):
+                await waiter
+        async with pool.lease():
+            pass
+
+    asyncio.run(scenario())
+    assert pool.snapshot()["waiting"] == 0
+    assert pool.snapshot()["idle"] == 1
+
+
+def test_prewarm_fills_up_to_the_requested_size() -> None:
+    factory = Factory()
+    pool = AgentPool(factory, AgentPoolSettings(min_size=1, max_size=3))
+
+    assert pool.prewarm() == 1
+    assert pool.prewarm(2) == 1
+    assert pool.prewarm(5) == 1
+    assert pool.prewarm(model_id="other") == 1
+    assert pool.snapshot()["idle"] == 4
+    assert [agent.model_id for agent in factory.built] == ["default"] * 3 + ["other"]
+
+
+def test_settings_validate_bounds() -> None:
+    with pytest.raises(ValueError):
+        AgentPoolSettings(max_size=0)
+    with pytest.raises(ValueError):
+        AgentPoolSettings(min_size=3, max_size=2)
+
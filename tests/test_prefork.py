@@ -0,0 +1,108 @@
+"""Tests for the pre-fork multi-process launcher."""
+
+from __future__ import annotations
+
+import asyncio
+import os
+import signal
+import socket
+import time
+from collections.abc import Callable, Iterator
+
+import pytest
+
+from benchmarks.fakes import DummyAgent, server_module
+from fastmcp_template import MCPServerBuilder, ServerSettings, WorkerSettings
+from fastmcp_template.prefork import PreforkServer
+
+pytestmark = [
+    pytest.mark.skipif(not hasattr(os, "fork"), reason="requires fork"),
+    # Other tests leave the shared sync runner thread alive; workers never touch it.
+    pytest.mark.filterwarnings("ignore:This process .* is multi-threaded:DeprecationWarning"),
+]
+
+
+def build_builder() -> MCPServerBuilder:
+    return MCPServerBuilder(
+        DummyAgent, ServerSettings(metrics=True), fastmcp_module=server_module()
+    )
+
+
+def serve_lines(app: object, sock: socket.socket) -> None:
+    """Answer one prompt per connection with ``<pid>:<answer>``."""
+
+    handler = app.tools["prompt"].handler  # type: ignore[attr-defined]
+    while True:
+        conn, _ = sock.accept()
+        with conn:
+            question = conn.recv(1024).decode()
+            response = asyncio.run(handler(question=question))
+            conn.sendall(f"{os.getpid()}:{response.content}".encode())
+
+
+def ask(address: tuple[str, int], question: str) -> tuple[int, str]:
+    with socket.create_connection(address, timeout=5) as conn:
+        conn.sendall(question.encode())
+        pid, _, answer = conn.recv(1024).decode().partition(":")
+    return int(pid), answer
+
+
+def wait_for(condition: Callable[[], bool], timeout: float = 5.0) -> None:
+    deadline = time.monotonic() + timeout
+    while not condition():
+        assert time.monotonic() < deadline, "condition not met in time"
+        time.sleep(0.02)
+
+
+@pytest.fixture()
+def server() -> Iterator[PreforkServer]:
+    settings = WorkerSettings(
+        workers=2, port=0, graceful_timeout=2.0, restart_delay=0.0, metrics_interval=0.05
+    )
+    server = PreforkServer(build_builder, settings, serve=serve_lines)
+    server.start()
+    yield server
+    server.stop()
+
+
+def test_workers_share_the_socket_and_metrics_are_merged(server: PreforkServer) -> None:
+    answers = [ask(server.address, f"q{index}") for index in range(20)]
+
+    assert [answer for _, answer in answers] == [f"q{index}" for index in range(20)]
+    assert {pid for pid, _ in answers} <= set(server.pids)
+    wait_for(lambda: server.metrics().get("metrics", {}).get("requests") == 20)
+    assert server.metrics()["workers"] == 2
+
+
+def test_crashed_worker_is_replaced(server: PreforkServer) -> None:
+    victim = server.pids[0]
+    os.kill(victim, signal.SIGKILL)
+
+    def replaced() -> bool:
+        server.poll()
+        return victim not in server.pids and len(server.pids) == 2
+
+    wait_for(replaced)
+    assert server.restarts == 1
+    assert ask(server.address, "still up")[1] == "still up"
+
+
+def test_reload_replaces_every_worker(server: PreforkServer) -> None:
+    old = set(server.pids)
+    server.reload()
+
+    assert len(server.pids) == 2
+    assert not old & set(server.pids)
+    assert ask(server.address, "after reload")[1] == "after reload"
+
+
+def test_stop_terminates_workers_and_closes_the_socket() -> None:
+    settings = WorkerSettings(workers=1, port=0, graceful_timeout=2.0)
+    server = PreforkServer(build_builder, settings, serve=serve_lines)
+    server.start()
+    pid = server.pids[0]
+    server.stop()
+
+    assert server.socket is None
+    with pytest.raises(ProcessLookupError):
+        os.kill(pid, 0)
@@ -0,0 +1,146 @@
+"""Tests for the multi-backend routing agent."""
+
+from __future__ import annotations
+
+import asyncio
+import sys
+import types
+
+import pytest
+
+from fastmcp_template import RoutingSettings
+from fastmcp_template.routing import RoutingAgent
+
+
+class FakeClock:
+    def __init__(self) -> None:
+        self.now = 0.0
+
+    def __call__(self) -> float:
+        return self.now
+
+
+class FakeBackend:
+    """Backend answering after ``latency`` seconds, or failing while ``broken``."""
+
+    def __init__(self, name: str, latency: float = 0.0, broken: bool = False) -> None:
+        self.name = name
+        self.latency = latency
+        self.broken = broken
+        self.calls = 0
+
+    async def chat(self, query: str) -> dict[str, str]:
+        self.calls += 1
+        await asyncio.sleep(self.latency)
+        if self.broken:
+            raise ConnectionError(f"{self.name} is down")
+        return {"result": f"{self.name}:{query}"}
+
+
+def test_least_outstanding_spreads_concurrent_calls() -> None:
+    backends = [FakeBackend("a", 0.01), FakeBackend("b", 0.01), FakeBackend("c", 0.01)]
+    router = RoutingAgent(backends)
+
+    async def scenario() -> None:
+        await asyncio.gather(*(router.chat(f"q{index}") for index in range(9)))
+
+    asyncio.run(scenario())
+
+    assert [backend.calls for backend in backends] == [3, 3, 3]
+    assert all(stats["outstanding"] == 0 for stats in router.snapshot().values())
+
+
+def test_ewma_prefers_the_faster_backend() -> None:
+    clock = FakeClock()
+    fast, slow = FakeBackend("fast"), FakeBackend("slow")
+    router = RoutingAgent(
+        {"fast": fast, "slow": slow}, RoutingSettings(strategy="ewma"), clock=clock
+    )
+    router.stats["fast"].latency = 0.1
+    router.stats["slow"].latency = 1.0
+
+    for index in range(5):
+        asyncio.run(router.chat(f"q{index}"))
+
+    assert fast.calls == 5
+    assert slow.calls == 0
+
+
+def test_failing_backend_is_ejected_and_readmitted() -> None:
+    clock = FakeClock()
+    good, bad = FakeBackend("good"), FakeBackend("bad", broken=True)
+    settings = RoutingSettings(failure_threshold=2, ejection_time=30.0, max_attempts=1)
+    router = RoutingAgent({"good": good, "bad": bad}, settings, clock=clock)
+
+    async def scenario(count: int) -> None:
+        await asyncio.gather(
+            *(router.chat(f"q{index}") for index in range(count)), return_exceptions=True
+        )
+
+    asyncio.run(scenario(4))
+    assert router.snapshot()["bad"]["healthy"] is False
+    assert router.stats["bad"].ejections == 1
+
+    bad_calls = bad.calls
+    asyncio.run(scenario(4))
+    assert bad.calls == bad_calls
+
+    bad.broken = False
+    clock.now = 31.0
+    asyncio.run(scenario(4))
+    assert bad.calls > bad_calls
+    assert router.snapshot()["bad"]["healthy"] is True
+    assert router.stats["bad"].consecutive_failures == 0
+
+
+def test_failed_call_fails_over_to_another_backend() -> None:
+    bad, good = FakeBackend("bad", broken=True), FakeBackend("good")
+    router = RoutingAgent({"bad": bad, "good": good})
+
+    response = asyncio.run(router.chat("hello"))
+
+    assert response == {"result": "good:hello"}
+    assert router.stats["bad"].failures == 1
+
+
+def test_error_is_raised_when_every_attempt_fails() -> None:
+    router = RoutingAgent([FakeBackend("a", broken=True), FakeBackend("b", broken=True)])
+
+    with pytest.raises(ConnectionError):
+        asyncio.run(router.chat("hello"))
+
+
+def test_chat_batch_returns_failures_per_item() -> None:
+    router = RoutingAgent([FakeBackend("a")], RoutingSettings(max_attempts=1))
+
+    results = asyncio.run(router.chat_batch(["x", "y"]))
+
+    assert results == [{"result": "a:x"}, {"result": "a:y"}]
+
+
+def test_from_endpoints_builds_one_agent_per_url(monkeypatch: pytest.MonkeyPatch) -> None:
+    class FakeModel:
+        def __init__(self, **options: object) -> None:
+            self.options = options
+
+    class FakePrompt:
+        def __or__(self, model: FakeModel) -> FakeModel:
+            return model
+
+    prompts = types.SimpleNamespace(
+        ChatPromptTemplate=types.SimpleNamespace(from_template=lambda template: FakePrompt())
+    )
+    monkeypatch.setitem(sys.modules, "langchain_core.prompts", prompts)
+    llms = types.SimpleNamespace(OllamaLLM=FakeModel)
+    monkeypatch.setitem(sys.modules, "langchain_ollama.llms", llms)
+
+    router = RoutingAgent.from_endpoints(["http://a:11434", "http://b:11434"], temperature=0.2)
+
+    assert list(router.backends) == ["http://a:11434", "http://b:11434"]
+    assert router.backends["http://b:11434"]._model.options["base_url"] == "http://b:11434"
+    assert router.temperature == 0.2
+
+
+def test_routing_agent_requires_backends() -> None:
+    with pytest.raises(ValueError):
+        RoutingAgent([])
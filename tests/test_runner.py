@@ -0,0 +1,126 @@
+"""Tests for the background event loop runner."""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from collections.abc import Iterator
+from concurrent.futures import ThreadPoolExecutor
+
+import pytest
+
+from fastmcp_template.runner import LoopRunner, get_runner
+
+
+@pytest.fixture()
+def runner() -> Iterator[LoopRunner]:
+    runner = LoopRunner(name="test-loop")
+    yield runner
+    runner.stop()
+
+
+def test_run_reuses_one_loop_across_calls(runner: LoopRunner) -> None:
+    async def current_loop() -> asyncio.AbstractEventLoop:
+        return asyncio.get_running_loop()
+
+    first = runner.run(current_loop())
+    assert runner.run(current_loop()) is first
+    assert runner.running
+
+
+def test_loop_bound_state_survives_between_calls(runner: LoopRunner) -> None:
+    async def make_lock() -> asyncio.Lock:
+        lock = asyncio.Lock()
+        await lock.acquire()
+        return lock
+
+    lock = runner.run(make_lock())
+
+    async def release() -> bool:
+        lock.release()
+        async with lock:
+            return True
+
+    assert runner.run(release())
+
+
+def test_run_is_thread_safe(runner: LoopRunner) -> None:
+    async def double(value: int) -> int:
+        await asyncio.sleep(0.001)
+        return value * 2
+
+    with ThreadPoolExecutor(max_workers=8) as executor:
+        results = list(executor.map(lambda value: runner.run(double(value)), range(32)))
+
+    assert results == [value * 2 for value in range(32)]
+
+
+def test_run_all_returns_outcomes_in_order(runner: LoopRunner) -> None:
+    async def succeed() -> str:
+        return "ok"
+
+    async def fail() -> str:
+        raise ValueError("boom")
+
+    outcomes = runner.run_all([succeed(), fail(), succeed()])
+
+    assert outcomes[0] == outcomes[2] == "ok"
+    assert isinstance(outcomes[1], ValueError)
+
+
+def test_run_from_the_runner_loop_is_rejected(runner: LoopRunner) -> None:
+    async def nested() -> None:
+        async def noop() -> None:
+            return None
+
+        runner.run(noop())
+
+    with pytest.raises(RuntimeError):
+        runner.run(nested())
+
+
+def test_timeout_cancels_the_coroutine(runner: LoopRunner) -> None:
+    cancelled = threading.Event()
+
+    async def slow() -> None:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    with pytest.raises(TimeoutError):
+        runner.run(slow(), timeout=0.01)
+    assert cancelled.wait(1)
+
+
+def test_stop_cancels_pending_tasks_and_allows_restart(runner: LoopRunner) -> None:
+    started = threading.Event()
+    cancelled = threading.Event()
+
+    async def forever() -> None:
+        started.set()
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            cancelled.set()
+            raise
+
+    async def spawn() -> None:
+        asyncio.get_running_loop().create_task(forever())
+
+    runner.run(spawn())
+    assert started.wait(1)
+    runner.stop()
+
+    assert cancelled.is_set()
+    assert not runner.running
+
+    async def answer() -> int:
+        return 42
+
+    assert runner.run(answer()) == 42
+
+
+def test_get_runner_returns_a_shared_instance() -> None:
+    assert get_runner() is get_runner()
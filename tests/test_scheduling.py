@@ -0,0 +1,170 @@
+"""Tests for weighted fair scheduling across tenants."""
+
+from __future__ import annotations
+
+import asyncio
+from contextlib import suppress
+
+import pytest
+
+from fastmcp_template import (
+    FairScheduler,
+    OverloadedError,
+    RateLimitedError,
+    SchedulerSettings,
+    TenantPolicy,
+)
+
+
+async def _run_backlog(scheduler: FairScheduler, calls: dict[str, int]) -> list[str]:
+    """Queue ``calls`` per tenant behind a blocker and return the order they ran in."""
+
+    order: list[str] = []
+    gate = asyncio.Event()
+
+    async def blocker() -> None:
+        async with scheduler.slot("blocker"):
+            await gate.wait()
+
+    async def call(tenant: str) -> None:
+        async with scheduler.slot(tenant):
+            order.append(tenant)
+            await asyncio.sleep(0)
+
+    blocking = asyncio.create_task(blocker())
+    await asyncio.sleep(0)
+    tasks = [
+        asyncio.create_task(call(tenant)) for tenant, count in calls.items() for _ in range(count)
+    ]
+    await asyncio.sleep(0)
+    gate.set()
+    await asyncio.gather(blocking, *tasks)
+    return order
+
+
+def test_backlogged_tenants_share_slots_by_weight() -> None:
+    settings = SchedulerSettings(
+        concurrency=1, tenants={"gold": TenantPolicy(weight=3.0)}, max_queue=100
+    )
+    scheduler = FairScheduler(settings)
+
+    order = asyncio.run(_run_backlog(scheduler, {"bronze": 20, "gold": 20}))
+
+    assert order[:8].count("gold") == 6
+    assert order[:8].count("bronze") == 2
+    snapshot = scheduler.snapshot()
+    assert snapshot["tenants"]["gold"]["admitted"] == 20
+    assert snapshot["tenants"]["bronze"]["wait"]["count"] == 20
+    assert snapshot["queued"] == 0
+
+
+def test_higher_priority_tenants_are_served_first() -> None:
+    settings = SchedulerSettings(
+        concurrency=1, tenants={"interactive": TenantPolicy(priority=1)}, max_queue=10
+    )
+    scheduler = FairScheduler(settings)
+
+    order = asyncio.run(_run_backlog(scheduler, {"batch": 3, "interactive": 3}))
+
+    assert order == ["interactive"] * 3 + ["batch"] * 3
+
+
+def test_rate_limit_refuses_calls_beyond_the_burst() -> None:
+    now = [0.0]
+    settings = SchedulerSettings(tenants={"a": TenantPolicy(rate=2.0)})
+    scheduler = FairScheduler(settings, clock=lambda: now[0])
+
+    async def call(tenant: str) -> None:
+        async with scheduler.slot(tenant):
+            pass
+
+    async def scenario() -> None:
+        await call("a")
+        await call("a")
+        with pytest.raises(RateLimitedError):
+            await call("a")
+        await call("b")
+        now[0] = 0.5
+        await call("a")
+
+    asyncio.run(scenario())
+    assert scheduler.stats("a").rate_limited == 1
+    assert scheduler.stats("a").admitted == 3
+
+
+def test_full_tenant_queue_sheds_only_that_tenant() -> None:
+    scheduler = FairScheduler(SchedulerSettings(concurrency=1, max_queue=1))
+
+    async def call(tenant: str) -> None:
+        async with scheduler.slot(tenant):
+            await asyncio.sleep(0.01)
+
+    async def scenario() -> list[object]:
+        return await asyncio.gather(
+            call("a"), call("a"), call("a"), call("b"), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results] == [
+        type(None), type(None), OverloadedError, type(None)
+    ]
+    assert scheduler.snapshot()["tenants"]["a"]["rejected"] == 1
+
+
+def test_queue_time_limit_sheds_waiting_calls() -> None:
+    scheduler = FairScheduler(SchedulerSettings(concurrency=1, max_queue_time=0.01))
+
+    async def scenario() -> None:
+        async with scheduler.slot("a"):
+            with pytest.raises(OverloadedError):
+                async with scheduler.slot("b"):
+                    pass
+        async with scheduler.slot("b"):
+            pass
+
+    asyncio.run(scenario())
+    assert scheduler.stats("b").timed_out == 1
+    assert scheduler.in_flight == 0
+    assert scheduler.queued == 0
+
+
+def test_idle_tenants_are_forgotten_beyond_max_tenants() -> None:
+    now = [0.0]
+    settings = SchedulerSettings(default_policy=TenantPolicy(rate=1.0), max_tenants=3)
+    scheduler = FairScheduler(settings, clock=lambda: now[0])
+
+    async def call(tenant: str) -> None:
+        async with scheduler.slot(tenant):
+            pass
+
+    async def scenario() -> None:
+        await call("a")
+        await call("b")
+        # Both buckets are empty, so neither tenant may be forgotten yet.
+        await call("c")
+        with pytest.raises(RateLimitedError):
+            await call("d")
+        now[0] = 1.0
+        await call("e")
+
+    asyncio.run(scenario())
+    snapshot = scheduler.snapshot()
+    assert snapshot["evictions"] == 1
+    assert sorted(snapshot["tenants"]) == ["b", "default", "e"]
+    assert snapshot["tenants"]["default"]["admitted"] == 1
+    assert snapshot["tenants"]["default"]["rate_limited"] == 1
+
+
+def test_tenant_count_never_exceeds_max_tenants() -> None:
+    settings = SchedulerSettings(default_policy=TenantPolicy(rate=1.0), max_tenants=4)
+    scheduler = FairScheduler(settings, clock=lambda: 0.0)
+
+    async def scenario() -> None:
+        for index in range(50):
+            with suppress(RateLimitedError):
+                async with scheduler.slot(f"tenant-{index}"):
+                    pass
+
+    asyncio.run(scenario())
+    tenants = scheduler.snapshot()["tenants"]
+    assert len(tenants) == 4 and "default" in tenants
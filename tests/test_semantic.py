@@ -0,0 +1,180 @@
+"""Tests for the semantic response cache."""
+
+from __future__ import annotations
+
+import pytest
+
+from fastmcp_template import HashingEmbedder, SemanticCache, SemanticCacheSettings
+
+np = pytest.importorskip("numpy")
+
+SIGNATURE = ("llama3", 0.0, "Be helpful.")
+
+
+def test_hashing_embedder_scores_rewordings_above_unrelated_prompts() -> None:
+    embed = HashingEmbedder(512)
+
+    vectors = embed(
+        [
+            "What is the capital of France?",
+            "what is the capital   of France",
+            "How do I bake sourdough bread?",
+        ]
+    )
+
+    assert vectors.shape == (3, 512)
+    assert np.allclose(np.linalg.norm(vectors, axis=1), 1.0)
+    assert vectors[0] @ vectors[1] > 0.9
+    assert vectors[0] @ vectors[2] < 0.3
+
+
+def test_similar_prompts_hit_and_different_agents_miss() -> None:
+    cache = SemanticCache(SemanticCacheSettings(threshold=0.8))
+    cache.put("What is the capital of France?", SIGNATURE, "Paris")
+
+    assert cache.get("what's the capital of France?", SIGNATURE) == "Paris"
+    assert cache.get("How do I bake sourdough bread?", SIGNATURE) is None
+    assert cache.get("What is the capital of France?", ("other", 0.0, None)) is None
+    snapshot = cache.snapshot()
+    assert snapshot["hits"] == 1
+    assert snapshot["misses"] == 2
+    assert snapshot["hit_rate"] == pytest.approx(1 / 3)
+    assert snapshot["lookup_seconds"]["count"] == 3
+
+
+def test_batched_lookup_matches_each_prompt() -> None:
+    cache = SemanticCache(SemanticCacheSettings(threshold=0.8))
+    cache.put("capital of France", SIGNATURE, "Paris")
+    cache.put("capital of Italy", SIGNATURE, "Rome")
+
+    results = cache.get_many(
+        ["the capital of Italy", "the capital of France", "best pizza topping"], SIGNATURE
+    )
+
+    assert results == ["Rome", "Paris", None]
+
+
+def test_full_cache_evicts_least_recently_used_and_compacts() -> None:
+    settings = SemanticCacheSettings(threshold=0.99, max_entries=4, evict_fraction=0.5)
+    cache = SemanticCache(settings)
+    for index in range(4):
+        cache.put(f"prompt number {index} about topic {index}", SIGNATURE, str(index))
+    assert cache.get("prompt number 0 about topic 0", SIGNATURE) == "0"
+
+    cache.put("a brand new prompt", SIGNATURE, "new")
+
+    assert len(cache) == 3
+    assert cache.stats.evictions == 2
+    assert cache.compactions == 1
+    assert cache.get("prompt number 0 about topic 0", SIGNATURE) == "0"
+    assert cache.get("prompt number 1 about topic 1", SIGNATURE) is None
+    assert cache.get("a brand new prompt", SIGNATURE) == "new"
+
+
+def test_expired_entries_are_dropped_and_compacted() -> None:
+    now = [0.0]
+    settings = SemanticCacheSettings(ttl=10.0)
+    cache = SemanticCache(settings, clock=lambda: now[0])
+    cache.put("first prompt", SIGNATURE, "one")
+    cache.put("second prompt", SIGNATURE, "two")
+
+    now[0] = 11.0
+
+    assert cache.get("first prompt", SIGNATURE) is None
+    assert cache.stats.expirations == 2
+    assert len(cache) == 0
+    assert cache.compactions == 1
+
+
+def test_identical_prompts_replace_their_entry() -> None:
+    cache = SemanticCache()
+    cache.put("Hello   world", SIGNATURE, "old")
+    cache.put("Hello world", SIGNATURE, "new")
+
+    assert len(cache) == 1
+    assert cache.get("Hello world", SIGNATURE) == "new"
+
+
+def test_prompts_with_different_numbers_never_match() -> None:
+    cache = SemanticCache()
+    cache.put("What is the status of client id 1234?", SIGNATURE, "active")
+
+    assert cache.get("What is the status of client id 1235?", SIGNATURE) is None
+    assert cache.get("what is the status of client id 1234", SIGNATURE) == "active"
+    loose = SemanticCache(SemanticCacheSettings(threshold=0.9, match_numbers=False))
+    loose.put("What is the status of client id 1234?", SIGNATURE, "active")
+    assert loose.get("What is the status of client id 1235?", SIGNATURE) == "active"
+
+
+def test_scopes_keep_entries_apart_and_vectors_are_reused() -> None:
+    embedder = HashingEmbedder(256)
+    calls: list[int] = []
+
+    def counting(texts: list[str]) -> object:
+        calls.append(len(texts))
+        return embedder(texts)
+
+    cache = SemanticCache(embedder=counting)
+    vector = cache.embed(["capital of France"])[0]
+    assert cache.get("capital of France", SIGNATURE, scope="acme", vector=vector) is None
+    cache.put("capital of France", SIGNATURE, "Paris", scope="acme", vector=vector)
+
+    assert calls == [1]
+    assert cache.get("capital of France", SIGNATURE, scope="acme") == "Paris"
+    assert cache.get("capital of France", SIGNATURE, scope="globex") is None
+    assert cache.get("capital of France", SIGNATURE) is None
+
+
+@pytest.mark.parametrize(
+    ("cached", "asked"),
+    [
+        (
+            "Explain how public key cryptography works to a beginner in three short "
+            "paragraphs, avoiding jargon",
+            "Explain how public key cryptography works to a beginner in three short "
+            "paragraphs, using jargon",
+        ),
+        (
+            "Rewrite the following customer support reply so that the tone is neutral "
+            "and professional throughout",
+            "Rewrite the following customer support reply so that the tone is sarcastic "
+            "and professional throughout",
+        ),
+        (
+            "Translate into French the following paragraph about the history of the "
+            "railway in the nineteenth century",
+            "Translate into German the following paragraph about the history of the "
+            "railway in the nineteenth century",
+        ),
+        (
+            "Please read the attached quarterly report carefully and write a concise "
+            "executive summary for the board that highlights revenue trends, customer "
+            "churn, operating costs, hiring plans and the main risks for next year, "
+            "keeping the tone neutral and the length under one page",
+            "Please read the attached quarterly report carefully and write a concise "
+            "executive summary for the board that highlights revenue trends, customer "
+            "churn, operating costs, hiring plans and the main risks for next year, "
+            "keeping the tone sarcastic and the length under one page",
+        ),
+    ],
+)
+def test_default_threshold_misses_prompts_differing_by_a_meaningful_word(
+    cached: str, asked: str
+) -> None:
+    cache = SemanticCache()
+    cache.put(cached, SIGNATURE, "answer")
+
+    assert cache.get(asked, SIGNATURE) is None
+    assert cache.get(cached.upper() + "  ", SIGNATURE) == "answer"
+
+
+def test_partitions_of_evicted_scopes_are_forgotten() -> None:
+    cache = SemanticCache(SemanticCacheSettings(max_entries=4, evict_fraction=0.5))
+    for index in range(100):
+        cache.put("capital of France", SIGNATURE, "Paris", scope=f"tenant-{index}")
+
+    assert len(cache) <= 4
+    assert len(cache._signature_ids) == len(cache)
+    assert cache.get("capital of France", SIGNATURE, scope="tenant-99") == "Paris"
+    cache.clear()
+    assert cache._signature_ids == {}
@@ -3,13 +3,28 @@
 from __future__ import annotations
 
 import asyncio
+import threading
 from dataclasses import dataclass
+from pathlib import Path
 from types import SimpleNamespace
 from typing import Any
 
 import pytest
 
-from fastmcp_template import MCPServerBuilder, ServerSettings
+from fastmcp_template import (
+    AdmissionSettings,
+    AgentPoolSettings,
+    BatchingSettings,
+    ConversationSettings,
+    DeadlineExceededError,
+    DocumentSettings,
+    MCPServerBuilder,
+    OverloadedError,
+    ResponseCacheSettings,
+    SchedulerSettings,
+    SemanticCacheSettings,
+    ServerSettings,
+)
 
 
 @dataclass
@@ -93,3 +108,517 @@ def test_extract_query_missing_value_raises_value_error() -> None:
     payload = {}
     with pytest.raises(ValueError):
         MCPServerBuilder._extract_query(payload)
+
+
+def test_pooled_handler_prewarms_and_reuses_agents(fastmcp_module: SimpleNamespace) -> None:
+    built: list[DummyAgent] = []
+
+    def factory() -> DummyAgent:
+        agent = DummyAgent({str(i): str(i * 2) for i in range(6)})
+        built.append(agent)
+        return agent
+
+    pool_settings = AgentPoolSettings(min_size=2, max_size=2, prewarm=True)
+    builder = MCPServerBuilder(factory, ServerSettings(agent_pool=pool_settings), fastmcp_module)
+    app = builder.build()
+    assert len(built) == 2
+
+    handler = app.tools[0].handler
+
+    async def scenario() -> list[Any]:
+        return await asyncio.gather(*(handler(question=str(i)) for i in range(6)))
+
+    responses = asyncio.run(scenario())
+    assert [response.content for response in responses] == [str(i * 2) for i in range(6)]
+    assert len(built) == 2
+    assert builder.agent_pool is not None
+    assert builder.agent_pool.snapshot()["hits"] == 6
+
+
+@dataclass
+class CountingAgent:
+    """Agent that counts how often it reached the language model."""
+
+    temperature: float = 0.0
+    calls: int = 0
+
+    async def chat(self, query: str) -> dict[str, str]:
+        self.calls += 1
+        return {"result": f"answer:{query}"}
+
+
+def test_response_cache_skips_agent_on_repeat(fastmcp_module: SimpleNamespace) -> None:
+    agent = CountingAgent()
+    settings = ServerSettings(response_cache=ResponseCacheSettings())
+    builder = MCPServerBuilder(lambda: agent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    first = asyncio.run(handler(question="What  is MCP?"))
+    second = asyncio.run(handler(question="What is MCP?"))
+    bypassed = asyncio.run(handler(question="What is MCP?", no_cache=True))
+
+    assert first.content == second.content == "answer:What  is MCP?"
+    assert bypassed.content == "answer:What is MCP?"
+    assert agent.calls == 2
+    assert builder.response_cache is not None
+    assert builder.response_cache.snapshot()["hits"] == 1
+
+
+def test_response_cache_ignores_hot_agents(fastmcp_module: SimpleNamespace) -> None:
+    agent = CountingAgent(temperature=0.9)
+    settings = ServerSettings(response_cache=ResponseCacheSettings(max_temperature=0.5))
+    handler = MCPServerBuilder(lambda: agent, settings, fastmcp_module).build().tools[0].handler
+
+    for _ in range(3):
+        asyncio.run(handler(question="creative"))
+
+    assert agent.calls == 3
+
+
+def test_handler_coalesces_identical_prompts(fastmcp_module: SimpleNamespace) -> None:
+    calls: list[str] = []
+
+    class SlowAgent:
+        async def chat(self, query: str) -> dict[str, str]:
+            calls.append(query)
+            await asyncio.sleep(0.01)
+            return {"result": query.upper()}
+
+    builder = MCPServerBuilder(SlowAgent, ServerSettings(coalesce_requests=True), fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> list[Any]:
+        prompts = ["same", "same ", "  same", "other"]
+        return await asyncio.gather(*(handler(question=prompt) for prompt in prompts))
+
+    responses = asyncio.run(scenario())
+    assert [response.content for response in responses] == ["SAME"] * 3 + ["OTHER"]
+    assert sorted(calls) == ["other", "same"]
+    assert builder.single_flight is not None
+    assert builder.single_flight.stats.coalesced == 2
+
+
+@dataclass
+class StreamingAgent:
+    """Agent streaming its answer word by word."""
+
+    async def chat(self, query: str) -> dict[str, str]:
+        return {"result": query}
+
+    async def astream(self, query: str):
+        for word in query.split():
+            await asyncio.sleep(0)
+            yield word + " "
+
+
+def _progress_messages(fastmcp_module: SimpleNamespace) -> list[str | None]:
+    """Route the handler's progress notifications into the returned list."""
+
+    messages: list[str | None] = []
+
+    async def report_progress(
+        progress: float, total: float | None = None, message: str | None = None
+    ) -> None:
+        messages.append(message)
+
+    fastmcp_module.get_context = lambda: SimpleNamespace(report_progress=report_progress)
+    return messages
+
+
+def test_streaming_handler_notifies_partial_messages(fastmcp_module: SimpleNamespace) -> None:
+    settings = ServerSettings(response_cache=ResponseCacheSettings(), metrics=True)
+    messages = _progress_messages(fastmcp_module)
+    builder = MCPServerBuilder(StreamingAgent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    response = asyncio.run(handler(question="one two three", stream=True))
+
+    assert response.content == "one two three "
+    assert messages == ["one ", "two ", "three "]
+    stats = builder.recent_stream_stats[-1]
+    assert stats.chunks == 3
+    assert stats.time_to_first_token is not None
+    assert builder.stats()["metrics"]["requests"] == 1
+    assert builder.metrics is not None
+    assert builder.metrics.output_size.count == 1
+    # The joined answer is cached and returned without notifications afterwards.
+    messages.clear()
+    assert asyncio.run(handler(question="one two three", stream=True)).content == "one two three "
+    assert messages == []
+
+
+def test_streamed_conversation_turns_use_and_extend_the_history(
+    fastmcp_module: SimpleNamespace,
+) -> None:
+    prompts: list[str] = []
+
+    class RecordingAgent(StreamingAgent):
+        async def astream(self, query: str):  # type: ignore[override]
+            prompts.append(query)
+            async for chunk in super().astream(query.splitlines()[-1]):
+                yield chunk
+
+    settings = ServerSettings(conversations=ConversationSettings())
+    messages = _progress_messages(fastmcp_module)
+    builder = MCPServerBuilder(RecordingAgent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    asyncio.run(handler(question="hello", stream=True, session_id="s1"))
+    assert messages == ["hello "]
+    asyncio.run(handler(question="again", stream=True, session_id="s1"))
+
+    assert prompts[0] == "hello"
+    assert "User: hello" in prompts[1] and "Assistant: hello " in prompts[1]
+    assert builder.stats()["conversations"]["turns"] == 2
+
+
+def test_streaming_handler_falls_back_to_chat(fastmcp_module: SimpleNamespace) -> None:
+    agent = DummyAgent({"hello": "world"})
+    handler = MCPServerBuilder(lambda: agent, ServerSettings(), fastmcp_module).build()
+    response = asyncio.run(handler.tools[0].handler(question="hello", stream=True))
+
+    assert response.content == "world"
+
+
+def test_batching_handler_groups_concurrent_prompts(fastmcp_module: SimpleNamespace) -> None:
+    batches: list[list[str]] = []
+
+    class BatchAgent:
+        async def chat(self, query: str) -> dict[str, str]:
+            raise AssertionError("chat_batch should be used")
+
+        async def chat_batch(self, queries: list[str]) -> list[dict[str, str] | Exception]:
+            batches.append(list(queries))
+            return [ValueError(q) if q == "bad" else {"result": q[::-1]} for q in queries]
+
+    settings = ServerSettings(batching=BatchingSettings(max_batch_size=4, window=0.01))
+    builder = MCPServerBuilder(BatchAgent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> list[Any]:
+        prompts = ["abc", "bad", "xyz", "123"]
+        return await asyncio.gather(
+            *(handler(question=prompt) for prompt in prompts), return_exceptions=True
+        )
+
+    first, failed, *rest = asyncio.run(scenario())
+    assert first.content == "cba"
+    assert isinstance(failed, ValueError)
+    assert [response.content for response in rest] == ["zyx", "321"]
+    assert batches == [["abc", "bad", "xyz", "123"]]
+    assert builder.batcher is not None
+    assert builder.batcher.batch_sizes.count == 1
+
+
+def test_admission_control_sheds_excess_invocations(fastmcp_module: SimpleNamespace) -> None:
+    class SlowAgent:
+        async def chat(self, query: str) -> dict[str, str]:
+            await asyncio.sleep(0.01)
+            return {"result": query}
+
+    admission = AdmissionSettings(initial_limit=1, max_queue=1, target_latency=None)
+    builder = MCPServerBuilder(SlowAgent, ServerSettings(admission=admission), fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> list[Any]:
+        return await asyncio.gather(
+            *(handler(question=str(i)) for i in range(3)), return_exceptions=True
+        )
+
+    results = asyncio.run(scenario())
+    assert [type(result) for result in results].count(OverloadedError) == 1
+    assert builder.admission is not None
+    assert builder.admission.snapshot()["shed"] == 1
+
+
+def test_warmup_builds_agent_and_probes_before_ready(fastmcp_module: SimpleNamespace) -> None:
+    built: list[CountingAgent] = []
+
+    def factory() -> CountingAgent:
+        built.append(CountingAgent())
+        return built[-1]
+
+    settings = ServerSettings(agent_pool=AgentPoolSettings(max_size=1), warmup=True)
+    builder = MCPServerBuilder(factory, settings, fastmcp_module)
+    app = builder.build()
+
+    # The probed agent is discarded; a fresh one waits in the pool.
+    assert len(built) == 2
+    assert [agent.calls for agent in built] == [1, 0]
+    assert set(builder.warmup_timings) == {"agent", "probe", "total"}
+    assert builder.agent_pool is not None
+    assert builder.agent_pool.snapshot()["idle"] == 1
+
+    asyncio.run(app.tools[0].handler(question="real"))
+    assert len(built) == 2
+    assert [agent.calls for agent in built] == [1, 1]
+
+
+class SlowAgent:
+    """Agent that blocks until cancelled, recording the cancellation."""
+
+    def __init__(self) -> None:
+        self.cancelled = asyncio.Event()
+
+    async def chat(self, query: str) -> dict[str, str]:
+        try:
+            await asyncio.sleep(10)
+        except asyncio.CancelledError:
+            self.cancelled.set()
+            raise
+        return {"result": query}
+
+
+def test_deadlines_reject_expired_and_cancel_running_calls(
+    fastmcp_module: SimpleNamespace,
+) -> None:
+    agent = SlowAgent()
+    settings = ServerSettings(enforce_deadlines=True)
+    builder = MCPServerBuilder(lambda: agent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(handler(question="late", timeout=0))
+    with pytest.raises(DeadlineExceededError):
+        asyncio.run(handler(question="slow", timeout=0.01))
+
+    assert agent.cancelled.is_set()
+    assert builder.stats()["deadlines"] == {
+        "rejected": 1,
+        "expired": 1,
+        "cancelled": 1,
+        "saved_seconds": 0.0,
+    }
+
+
+def test_disconnected_caller_cancels_the_agent_call(fastmcp_module: SimpleNamespace) -> None:
+    agent = SlowAgent()
+    settings = ServerSettings(enforce_deadlines=True)
+    builder = MCPServerBuilder(lambda: agent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> None:
+        task = asyncio.create_task(handler(question="gone"))
+        await asyncio.sleep(0.01)
+        task.cancel()
+        await asyncio.gather(task, return_exceptions=True)
+
+    asyncio.run(scenario())
+
+    assert agent.cancelled.is_set()
+    assert builder.deadlines is not None
+    assert builder.deadlines.stats.cancelled == 1
+    assert builder.deadlines.stats.expired == 0
+
+
+def test_added_tools_are_isolated_by_their_bulkheads(fastmcp_module: SimpleNamespace) -> None:
+    slow = SlowAgent()
+    builder = MCPServerBuilder(
+        lambda: DummyAgent({"hi": "fast"}), ServerSettings(tool_name="classify"), fastmcp_module
+    )
+    builder.add_tool(
+        lambda: slow,
+        ServerSettings(
+            tool_name="answer",
+            admission=AdmissionSettings(
+                initial_limit=1, max_queue=1, max_queue_time=5.0, target_latency=None
+            ),
+            tool_timeout=0.05,
+        ),
+    )
+    app = builder.build()
+    handlers = {tool.name: tool.handler for tool in app.tools}
+
+    async def scenario() -> tuple[list[Any], Any]:
+        slow_calls = [asyncio.create_task(handlers["answer"](question="long")) for _ in range(3)]
+        await asyncio.sleep(0)
+        fast = await handlers["classify"](question="hi")
+        return await asyncio.gather(*slow_calls, return_exceptions=True), fast
+
+    slow_results, fast = asyncio.run(scenario())
+
+    assert fast.content == "fast"
+    assert sorted(type(result).__name__ for result in slow_results) == [
+        "DeadlineExceededError",
+        "DeadlineExceededError",
+        "OverloadedError",
+    ]
+    answer_stats = builder.stats()["tools"]["answer"]
+    assert answer_stats["admission"]["rejected"] == 1
+    assert answer_stats["deadlines"]["expired"] == 2
+    assert "admission" not in builder.stats()
+
+
+def test_add_tool_rejects_duplicate_names(fastmcp_module: SimpleNamespace) -> None:
+    builder = MCPServerBuilder(lambda: DummyAgent({}), ServerSettings(), fastmcp_module)
+    builder.add_tool(lambda: DummyAgent({}), ServerSettings(tool_name="other"))
+
+    with pytest.raises(ValueError):
+        builder.add_tool(lambda: DummyAgent({}), ServerSettings(tool_name="prompt"))
+    with pytest.raises(ValueError):
+        builder.add_tool(lambda: DummyAgent({}), ServerSettings(tool_name="other"))
+
+
+class EchoAgent:
+    """Agent returning the prompt it received."""
+
+    async def chat(self, query: str) -> dict[str, str]:
+        return {"result": query}
+
+
+def test_sessions_add_history_to_the_prompt(fastmcp_module: SimpleNamespace) -> None:
+    settings = ServerSettings(conversations=ConversationSettings(max_turns=1))
+    builder = MCPServerBuilder(EchoAgent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> list[str]:
+        first = await handler(question="one", session_id="s")
+        second = await handler(question="two", session_id="s")
+        other = await handler(question="three", session_id="t")
+        stateless = await handler(question="four")
+        return [first.content, second.content, other.content, stateless.content]
+
+    first, second, other, stateless = asyncio.run(scenario())
+
+    assert first == "one"
+    assert second.endswith("User: one\nAssistant: one\n\nCurrent question: two")
+    assert other == "three"
+    assert stateless == "four"
+    stats = builder.stats()["conversations"]
+    assert stats["sessions"] == 2
+    assert stats["turns"] == 2
+    assert stats["trimmed_turns"] == 1
+
+
+def test_scheduler_reads_the_tenant_from_arguments_and_headers(
+    fastmcp_module: SimpleNamespace,
+) -> None:
+    fastmcp_module.get_http_headers = lambda: {"X-Tenant-Id": "acme"}
+    settings = ServerSettings(scheduler=SchedulerSettings(concurrency=2))
+    builder = MCPServerBuilder(EchoAgent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> None:
+        await handler(question="one", tenant="globex")
+        await handler(question="two")
+        await handler(question="three")
+
+    asyncio.run(scenario())
+
+    tenants = builder.stats()["scheduler"]["tenants"]
+    assert tenants["globex"]["admitted"] == 1
+    assert tenants["acme"]["admitted"] == 2
+
+
+def test_documents_are_answered_by_map_reduce(
+    fastmcp_module: SimpleNamespace, tmp_path: Path
+) -> None:
+    path = tmp_path / "report.txt"
+    path.write_text("alpha " * 2000, encoding="utf-8")
+    settings = ServerSettings(
+        documents=DocumentSettings(
+            chunk_tokens=256, overlap_tokens=16, allowed_paths=[str(tmp_path)]
+        ),
+        metrics=True,
+    )
+    reported: list[float] = []
+
+    async def report_progress(progress: float, total: float | None) -> None:
+        reported.append(progress)
+
+    fastmcp_module.get_context = lambda: SimpleNamespace(report_progress=report_progress)
+    builder = MCPServerBuilder(EchoAgent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    response = asyncio.run(handler(question="How many alphas?", path=str(path)))
+
+    assert response.content.startswith("Combine these partial answers")
+    assert reported == sorted(reported) and reported[-1] == 17
+    stats = builder.stats()
+    assert stats["documents"]["chunks"] == 13
+    assert stats["documents"]["map_calls"] == 13
+    assert stats["documents"]["reduce_calls"] == 4
+    assert stats["metrics"]["requests"] == 1
+
+
+def test_semantic_cache_answers_reworded_prompts(fastmcp_module: SimpleNamespace) -> None:
+    pytest.importorskip("numpy")
+    agent = CountingAgent()
+    settings = ServerSettings(semantic_cache=SemanticCacheSettings(threshold=0.8))
+    builder = MCPServerBuilder(lambda: agent, settings, fastmcp_module)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> list[str]:
+        first = await handler(question="What is the capital of France?")
+        second = await handler(question="what's the capital of france")
+        return [first.content, second.content]
+
+    first, second = asyncio.run(scenario())
+
+    assert first == second
+    assert agent.calls == 1
+    assert builder.stats()["semantic_cache"]["hits"] == 1
+
+
+def test_semantic_cache_uses_the_given_embedder_and_separates_tenants(
+    fastmcp_module: SimpleNamespace,
+) -> None:
+    pytest.importorskip("numpy")
+    from fastmcp_template import HashingEmbedder
+
+    agent = CountingAgent()
+    embedded: list[str] = []
+    hashing = HashingEmbedder(256)
+
+    def embedder(texts: Any) -> Any:
+        embedded.extend(texts)
+        return hashing(texts)
+
+    settings = ServerSettings(
+        semantic_cache=SemanticCacheSettings(), scheduler=SchedulerSettings()
+    )
+    builder = MCPServerBuilder(lambda: agent, settings, fastmcp_module, embedder=embedder)
+    handler = builder.build().tools[0].handler
+
+    async def scenario() -> None:
+        await handler(question="Warm up the agent", tenant="acme")
+        await handler(question="What is the capital of France?", tenant="acme")
+        await handler(question="What is the capital of France?", tenant="acme")
+        await handler(question="What is the capital of France?", tenant="globex")
+
+    asyncio.run(scenario())
+
+    assert agent.calls == 3
+    assert embedded.count("What is the capital of France?") == 3
+    assert builder.stats()["semantic_cache"]["hits"] == 1
+
+
+def test_stats_threadsafe_reads_components_on_the_serving_loop(
+    fastmcp_module: SimpleNamespace,
+) -> None:
+    builder = MCPServerBuilder(CountingAgent, ServerSettings(metrics=True), fastmcp_module)
+    handler = builder.build().tools[0].handler
+    assert builder.stats_threadsafe() == builder.stats()
+    loop = asyncio.new_event_loop()
+    serving = threading.Thread(target=loop.run_forever)
+    serving.start()
+    try:
+        asyncio.run_coroutine_threadsafe(handler(question="hi"), loop).result(5)
+        metrics = builder.metrics
+        assert metrics is not None
+        readers: list[threading.Thread] = []
+        snapshot = metrics.snapshot
+
+        def recording_snapshot() -> dict[str, Any]:
+            readers.append(threading.current_thread())
+            return snapshot()
+
+        metrics.snapshot = recording_snapshot  # type: ignore[method-assign]
+        stats = builder.stats_threadsafe(timeout=5)
+    finally:
+        loop.call_soon_threadsafe(loop.stop)
+        serving.join()
+        loop.close()
+
+    assert stats["metrics"]["requests"] == 1
+    assert readers == [serving]
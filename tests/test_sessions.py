@@ -0,0 +1,146 @@
+"""Tests for persistent client sessions."""
+
+from __future__ import annotations
+
+import asyncio
+from types import SimpleNamespace
+from typing import Any
+
+import pytest
+
+from fastmcp_template import ClientSettings, SessionPool, SessionPoolSettings
+from fastmcp_template.client import MCPClient
+
+
+class SessionClient:
+    """Fake FastMCP client that tracks how often sessions are opened and closed."""
+
+    opened: int = 0
+    closed: int = 0
+    fail_next: list[BaseException] = []
+    ping_ok: bool = True
+
+    def __init__(self, *, server_url: str, request_timeout: float, extra_headers: dict[str, str]):
+        self.server_url = server_url
+
+    async def __aenter__(self) -> "SessionClient":
+        self.__class__.opened += 1
+        return self
+
+    async def __aexit__(self, exc_type, exc, tb) -> None:  # type: ignore[override]
+        self.__class__.closed += 1
+
+    async def ping(self) -> None:
+        if not self.__class__.ping_ok:
+            raise ConnectionError("stale session")
+
+    async def invoke_tool(self, tool_name: str, **payload: Any) -> Any:
+        await asyncio.sleep(0)
+        if self.__class__.fail_next:
+            raise self.__class__.fail_next.pop()
+        return {"result": f"{self.server_url}:{payload['question']}"}
+
+
+@pytest.fixture()
+def fastmcp_module() -> SimpleNamespace:
+    SessionClient.opened = 0
+    SessionClient.closed = 0
+    SessionClient.fail_next = []
+    SessionClient.ping_ok = True
+    return SimpleNamespace(Client=SessionClient)
+
+
+def test_connected_client_reuses_sessions(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(ClientSettings(server_url="http://a"), fastmcp_module)
+
+    async def scenario() -> list[str]:
+        async with client:
+            return [await client.invoke(str(i)) for i in range(3)]
+
+    assert asyncio.run(scenario()) == ["http://a:0", "http://a:1", "http://a:2"]
+    assert SessionClient.opened == 1
+    assert SessionClient.closed == 1
+    assert client.sessions is None
+
+
+def test_one_shot_mode_opens_session_per_call(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=fastmcp_module)
+
+    async def scenario() -> None:
+        for prompt in ("a", "b"):
+            await client.invoke(prompt)
+
+    asyncio.run(scenario())
+    assert SessionClient.opened == 2
+
+
+def test_pool_size_bounds_open_sessions(fastmcp_module: SimpleNamespace) -> None:
+    settings = ClientSettings(session_pool=SessionPoolSettings(max_size=2))
+    client = MCPClient(settings, fastmcp_module)
+
+    async def scenario() -> dict[str, int]:
+        await client.connect()
+        await asyncio.gather(*(client.invoke(str(i)) for i in range(10)))
+        assert client.sessions is not None
+        stats = client.sessions.snapshot()
+        await client.aclose()
+        return stats
+
+    stats = asyncio.run(scenario())
+    assert SessionClient.opened == 2
+    assert stats["reused"] == 8
+    assert stats["idle"] == 2
+
+
+def test_connection_error_reconnects_on_fresh_session(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=fastmcp_module)
+
+    async def scenario() -> str:
+        async with client:
+            await client.invoke("warm")
+            SessionClient.fail_next = [ConnectionError("reset")]
+            result = await client.invoke("retry")
+            assert client.sessions is not None
+            assert client.sessions.snapshot()["reconnects"] == 1
+            return result
+
+    assert asyncio.run(scenario()).endswith(":retry")
+    assert SessionClient.opened == 2
+
+
+def test_application_errors_keep_session(fastmcp_module: SimpleNamespace) -> None:
+    client = MCPClient(fastmcp_module=fastmcp_module)
+
+    async def scenario() -> None:
+        async with client:
+            SessionClient.fail_next = [ValueError("bad prompt")]
+            with pytest.raises(ValueError):
+                await client.invoke("oops")
+            await client.invoke("ok")
+
+    asyncio.run(scenario())
+    assert SessionClient.opened == 1
+
+
+def test_idle_timeout_and_health_checks(fastmcp_module: SimpleNamespace) -> None:
+    now = [0.0]
+    settings = SessionPoolSettings(idle_timeout=60.0, health_check_interval=10.0)
+    client = MCPClient(fastmcp_module=fastmcp_module)
+    pool = SessionPool(client._open_session, settings, clock=lambda: now[0])
+
+    async def scenario() -> None:
+        await pool.invoke("http://a", "prompt", {"question": "1"})
+        now[0] = 20.0
+        SessionClient.ping_ok = False
+        await pool.invoke("http://a", "prompt", {"question": "2"})
+        SessionClient.ping_ok = True
+        now[0] = 200.0
+        await pool.invoke("http://a", "prompt", {"question": "3"})
+        await pool.aclose()
+
+    asyncio.run(scenario())
+    stats = pool.snapshot()
+    assert stats["health_check_failures"] == 1
+    assert stats["expired"] == 1
+    assert SessionClient.opened == 3
+    assert SessionClient.closed == 3
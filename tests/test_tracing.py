@@ -0,0 +1,203 @@
+"""Tests for request tracing and sampled profiling."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import random
+import threading
+from collections.abc import Sequence
+from pathlib import Path
+
+from benchmarks.fakes import DummyAgent, client_module, server_module
+from fastmcp_template import (
+    ClientSettings,
+    JsonlExporter,
+    MCPClient,
+    MCPServerBuilder,
+    ServerSettings,
+    Span,
+    Tracer,
+    TracingSettings,
+)
+from fastmcp_template.tracing import parse_traceparent, record_span, span
+
+
+class MemoryExporter:
+    def __init__(self) -> None:
+        self.traces: list[list[Span]] = []
+
+    def export(self, spans: Sequence[Span]) -> None:
+        self.traces.append(list(spans))
+
+
+def test_traceparent_round_trips_and_rejects_garbage() -> None:
+    root = Span("root", "a" * 32, "b" * 16, None, 0.0)
+
+    assert parse_traceparent(root.traceparent) == ("a" * 32, "b" * 16, True)
+    assert parse_traceparent(f"00-{'a' * 32}-{'b' * 16}-00") == ("a" * 32, "b" * 16, False)
+    assert parse_traceparent("not-a-trace") is None
+    assert parse_traceparent(None) is None
+
+
+def test_child_spans_nest_under_the_running_span() -> None:
+    exporter = MemoryExporter()
+    tracer = Tracer(TracingSettings(sample_rate=1.0), exporter=exporter, rng=random.Random(1))
+
+    async def scenario() -> None:
+        with tracer.trace("request", user="u") as root:
+            assert root is not None
+            with span("outer") as outer:
+                await asyncio.sleep(0)
+                record_span("inner", 0.0)
+            record_span("sibling", 0.0)
+            assert outer is not None
+
+    asyncio.run(scenario())
+
+    (spans,) = exporter.traces
+    by_name = {item.name: item for item in spans}
+    root = by_name["request"]
+    assert {item.trace_id for item in spans} == {root.trace_id}
+    assert by_name["outer"].parent_id == root.span_id
+    assert by_name["inner"].parent_id == by_name["outer"].span_id
+    assert by_name["sibling"].parent_id == root.span_id
+    assert all(item.end is not None and item.end >= item.start for item in spans[1:])
+    assert root.attributes == {"user": "u"}
+
+
+def test_unsampled_traces_record_nothing_and_callers_decide() -> None:
+    exporter = MemoryExporter()
+    tracer = Tracer(TracingSettings(sample_rate=0.0), exporter=exporter)
+
+    with tracer.trace("dropped") as dropped:
+        record_span("stage", 0.0)
+    with tracer.trace("continued", f"00-{'c' * 32}-{'d' * 16}-01") as continued:
+        pass
+
+    assert dropped is None
+    assert continued is not None and continued.parent_id == "d" * 16
+    assert [[item.name for item in trace] for trace in exporter.traces] == [["continued"]]
+    assert tracer.snapshot() == {"traces": 1, "unsampled": 1, "spans": 1, "profiles": 0}
+
+
+def test_unsampled_decisions_are_passed_downstream() -> None:
+    exporter = MemoryExporter()
+    tracer = Tracer(TracingSettings(sample_rate=0.0), exporter=exporter)
+    server_tracer = Tracer(TracingSettings(sample_rate=1.0), exporter=exporter)
+    payload: dict[str, str] = {}
+
+    with tracer.trace("client"):
+        tracer.inject(payload)
+    with server_tracer.trace("server", payload["traceparent"]) as served:
+        pass
+
+    parsed = parse_traceparent(payload["traceparent"])
+    assert parsed is not None and parsed[2] is False
+    assert served is None and exporter.traces == []
+    assert server_tracer.snapshot()["unsampled"] == 1
+
+
+def test_failed_spans_record_the_error() -> None:
+    exporter = MemoryExporter()
+    tracer = Tracer(TracingSettings(sample_rate=1.0), exporter=exporter)
+
+    try:
+        with tracer.trace("request"), span("llm"):
+            raise TimeoutError
+    except TimeoutError:
+        pass
+
+    assert [item.status for item in exporter.traces[0]] == ["TimeoutError", "TimeoutError"]
+
+
+def test_profiled_requests_save_a_dump(tmp_path: Path) -> None:
+    settings = TracingSettings(
+        sample_rate=1.0, profile_rate=1.0, profile_dir=str(tmp_path / "profiles")
+    )
+    exporter = MemoryExporter()
+    tracer = Tracer(settings, exporter=exporter)
+
+    with tracer.trace("request") as root:
+        sum(range(1000))
+
+    assert root is not None
+    dump = Path(root.attributes["profile"])
+    assert dump.exists() and dump.parent == tmp_path / "profiles"
+    assert tracer.snapshot()["profiles"] == 1
+
+
+def test_profiles_are_dumped_off_the_event_loop(tmp_path: Path) -> None:
+    dumped: list[threading.Thread] = []
+
+    class Profile:
+        def enable(self) -> None:
+            pass
+
+        def disable(self) -> None:
+            pass
+
+        def dump_stats(self, path: str) -> None:
+            dumped.append(threading.current_thread())
+            Path(path).write_text("stats")
+
+    settings = TracingSettings(
+        sample_rate=1.0, profile_rate=1.0, profile_dir=str(tmp_path / "profiles")
+    )
+    tracer = Tracer(settings, exporter=MemoryExporter(), profiler=Profile)
+
+    async def scenario() -> str:
+        with tracer.trace("request") as root:
+            await asyncio.sleep(0)
+        assert root is not None
+        return str(root.attributes["profile"])
+
+    dump = Path(asyncio.run(scenario()))
+
+    assert dump.read_text() == "stats"
+    assert dumped and dumped[0] is not threading.main_thread()
+
+
+def test_client_trace_continues_on_the_server() -> None:
+    exporter = MemoryExporter()
+    settings = TracingSettings(sample_rate=1.0)
+    builder = MCPServerBuilder(
+        DummyAgent, ServerSettings(tracing=settings), server_module(), span_exporter=exporter
+    )
+    app = builder.build()
+    client = MCPClient(
+        ClientSettings(tracing=settings), client_module(app), span_exporter=exporter
+    )
+
+    assert asyncio.run(client.invoke("hello")) == "hello"
+
+    spans = [item.to_dict() for trace in exporter.traces for item in trace]
+    by_name = {item["name"]: item for item in spans}
+    assert {item["trace_id"] for item in spans} == {by_name["client.prompt"]["trace_id"]}
+    assert by_name["server.prompt"]["parent_id"] == by_name["client.prompt"]["span_id"]
+    server_stages = {
+        item["name"] for item in spans if item["parent_id"] == by_name["server.prompt"]["span_id"]
+    }
+    assert server_stages == {"extract", "acquire", "llm", "wrap"}
+    assert by_name["call"]["parent_id"] == by_name["client.prompt"]["span_id"]
+    assert builder.stats()["tracing"]["traces"] == 1
+
+
+def test_jsonl_exporter_writes_in_the_background(tmp_path: Path) -> None:
+    path = tmp_path / "traces" / "spans.jsonl"
+    exporter = JsonlExporter(path)
+    tracer = Tracer(TracingSettings(sample_rate=1.0), exporter=exporter)
+
+    for index in range(3):
+        with tracer.trace("request", index=index):
+            with span("llm"):
+                pass
+    exporter.flush()
+
+    spans = [json.loads(line) for line in path.read_text().splitlines()]
+    assert [item["name"] for item in spans] == ["request", "llm"] * 3
+    exporter.close()
+    with tracer.trace("after-close"):
+        pass
+    exporter.close()
+    assert json.loads(path.read_text().splitlines()[-1])["name"] == "after-close"